@@ -8,9 +8,7 @@ from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from bson import ObjectId
-import zipfile
-import io
-from nse_fiidii_collector import NSEDataCollector
+from nse_fiidii_collector import NSEDataCollector, MONGO_COLLECTION_NAME as FIIDII_COLLECTION_NAME
 from nse_all_indices_option_chain_collector import NSEAllIndicesOptionChainCollector, INDICES
 from scheduler_config import (
     get_all_config, get_config_for_scheduler, update_scheduler_config,
@@ -18,8 +16,24 @@ from scheduler_config import (
 )
 from nse_all_banks_option_chain_collector import NSEAllBanksOptionChainCollector, BANKS
 from nse_gainers_losers_collector import NSEGainersLosersCollector
-from nse_news_collector import NSENewsCollector
-from nse_livemint_news_collector import NSELiveMintNewsCollector
+from nse_news_collector import NSENewsCollector, MONGO_COLLECTION_NAME as NEWS_COLLECTION_NAME
+from nse_livemint_news_collector import NSELiveMintNewsCollector, MONGO_COLLECTION_NAME as LIVEMINT_NEWS_COLLECTION_NAME
+from nse_http_session import get_nse_session
+from option_chain_delta_store import get_delta_store
+from snapshot_dedup import get_snapshot_dedup
+from redis_expiry_cache import get_expiry_cache
+from mongo_pool import get_mongo_client, get_mongo_pool, get_mongo_db
+from schema_manager import start_schema_bootstrap_in_background
+from option_chain_timeseries import get_timeseries, LEG_FIELDS
+from option_chain_summary import get_summary_store, SUMMARY_FIELDS
+from option_chain_rollups import get_rollup_store, pick_resolution
+from timezone_utils import now_for_mongo
+from backup_incremental import plan_backup, iter_planned_backup, record_deletions
+from backup_stream import BACKUP_DIR, list_backup_collections
+from backup_jobs import get_backup_jobs, is_valid_job_id
+from pagination import paginate, InvalidCursorError
+from response_cache import bump_versions, get_response_cache, RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_STATUS_TTL_SECONDS
+from timeseries_store import get_snapshot_sources, is_timeseries_backend
 
 # Twitter collector removed - not needed
 import schedule
@@ -34,10 +48,10 @@ import sys
 import jwt
 from functools import wraps
 from werkzeug.security import check_password_hash, generate_password_hash
-from urllib.parse import quote_plus
 from validation_schemas import (
     LoginSchema, CombinedPaginationDateSchema, SchedulerConfigSchema,
-    ConfigUpdateSchema, HolidaySchema
+    ConfigUpdateSchema, HolidaySchema, StrikeSeriesSchema, SummarySeriesSchema,
+    RollupSeriesSchema, BackupSchema, RestoreSchema
 )
 from validation_utils import (
     validate_json_body, validate_query_params, validate_path_param
@@ -221,6 +235,24 @@ ALL_BANKS_STATUS_FILE = 'all_banks_option_chain_scheduler_status.json'
 NEWS_COLLECTOR_STATUS_FILE = 'news_collector_scheduler_status.json'
 LIVEMINT_NEWS_STATUS_FILE = 'livemint_news_scheduler_status.json'
 
+# List endpoints project summary fields only; full documents come from the detail endpoints
+# dataCount is written by the collectors; $size covers documents stored before that (MongoDB 4.4+ projection expressions)
+OPTION_CHAIN_LIST_PROJECTION = {
+    "records.timestamp": 1,
+    "records.underlyingValue": 1,
+    "dataCount": {"$ifNull": ["$dataCount", {"$cond": [{"$isArray": "$records.data"}, {"$size": "$records.data"}, 0]}]},
+    "insertedAt": 1,
+    "updatedAt": 1
+}
+MARKET_MOVERS_LIST_PROJECTION = {
+    "timestamp": 1,
+    "legends": 1,
+    "nifty_count": {"$cond": [{"$isArray": "$NIFTY.data"}, {"$size": "$NIFTY.data"}, 0]},
+    "banknifty_count": {"$cond": [{"$isArray": "$BANKNIFTY.data"}, {"$size": "$BANKNIFTY.data"}, 0]},
+    "insertedAt": 1,
+    "updatedAt": 1
+}
+
 
 def get_next_valid_date(start_date, max_days=30):
     """
@@ -342,6 +374,49 @@ def get_pagination_params():
     return page, limit
 
 
+def snapshot_cache_tag(symbol: str) -> str:
+    """Collection whose version tags a snapshot symbol's cached responses (the shared collection in time-series mode)"""
+    legacy_name, timeseries_name = get_snapshot_sources()[symbol]
+    return timeseries_name if is_timeseries_backend() else legacy_name
+
+
+def cached_response(tags, ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS):
+    """
+    Decorator serving a stats/status endpoint from the response cache until one of its collections is written
+    Only successful (200) responses are cached; the key is the endpoint and its query parameters
+    Args:
+        tags: Names of the collections the response is computed from
+        ttl_seconds: Maximum age of a cached response
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not RESPONSE_CACHE_ENABLED:
+                return f(*args, **kwargs)
+            
+            try:
+                _, db = get_mongo_db()
+                cache = get_response_cache(db)
+            except Exception as e:
+                logger.warning(f"Response cache unavailable: {str(e)}")
+                return f(*args, **kwargs)
+            key = f"{request.endpoint}?{'&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))}"
+            # Versions are read before computing, so a write landing meanwhile invalidates the stored entry
+            versions = cache.get_versions(tags)
+            if versions is not None:
+                body = cache.get(key, versions, ttl_seconds)
+                if body is not None:
+                    return app.response_class(body, mimetype='application/json', headers={'X-Cache': 'HIT'})
+            
+            response = f(*args, **kwargs)
+            if versions is not None and isinstance(response, Response) and response.status_code == 200:
+                cache.set(key, response.get_data(), versions, ttl_seconds)
+                response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated
+    return decorator
+
+
 def get_scheduler_status():
     """Get scheduler status from file or calculate"""
     status = {
@@ -408,6 +483,31 @@ def safe_error_response(error: Exception, default_message: str = "An error occur
         }), 500
 
 
+# Shared collector instances (one per class) borrowed by request handlers
+# Collectors hold no per-request state and sit on the shared MongoDB pool, so building
+# one per request only repeated the connection and index setup
+_shared_collectors = {}
+_shared_collectors_lock = threading.Lock()
+
+def get_shared_collector(collector_class):
+    """
+    Get the process-wide instance of a collector class for use in request handlers
+    Args:
+        collector_class: Collector class (e.g. NSEDataCollector)
+    Returns: Collector instance bound to the current shared MongoDB client
+    """
+    collector = _shared_collectors.get(collector_class)
+    if collector is None:
+        with _shared_collectors_lock:
+            collector = _shared_collectors.get(collector_class)
+            if collector is None:
+                collector = collector_class()
+                _shared_collectors[collector_class] = collector
+    # Rebind collections if the pool replaced its client after a failed health check
+    collector._ensure_connection()
+    return collector
+
+
 # ============================================================================
 # GLOBAL ERROR HANDLERS
 # ============================================================================
@@ -575,30 +675,13 @@ def home():
 def api_mongodb_health():
     """API endpoint to check MongoDB connection status"""
     try:
-        from pymongo import MongoClient
-        
         # Get MongoDB configuration from environment variables
         MONGO_HOST = os.getenv('MONGO_HOST', 'localhost')
         MONGO_PORT = int(os.getenv('MONGO_PORT', 27017))
         MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'nse_data')
-        MONGO_USERNAME = os.getenv('MONGO_USERNAME', None)
-        MONGO_PASSWORD = os.getenv('MONGO_PASSWORD', None)
-        
-        # Build MongoDB URI with URL-encoded credentials to handle special characters
-        if MONGO_USERNAME and MONGO_PASSWORD:
-            # URL-encode username and password to handle special characters like @, :, etc.
-            encoded_username = quote_plus(MONGO_USERNAME)
-            encoded_password = quote_plus(MONGO_PASSWORD)
-            # Get auth source (default to 'admin' for MongoDB) - REQUIRED for authentication
-            MONGO_AUTH_SOURCE = os.getenv('MONGO_AUTH_SOURCE', 'admin')
-            # Build connection string with authSource parameter (required for MongoDB auth)
-            mongo_uri = f"mongodb://{encoded_username}:{encoded_password}@{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB_NAME}?authSource={MONGO_AUTH_SOURCE}"
-        else:
-            mongo_uri = f"mongodb://{MONGO_HOST}:{MONGO_PORT}/"
         
-        # Test connection
-        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-        client.admin.command('ping')
+        # Borrow the shared pool (health-checked on checkout)
+        client = get_mongo_client()
         
         # Get database and check if it exists
         db = client[MONGO_DB_NAME]
@@ -609,8 +692,6 @@ def api_mongodb_health():
         # Get server info
         server_info = client.server_info()
         
-        client.close()
-        
         logger.debug(f"MongoDB health check successful: {MONGO_HOST}:{MONGO_PORT}/{MONGO_DB_NAME} ({len(collections)} collections)")
         
         return jsonify({
@@ -621,6 +702,7 @@ def api_mongodb_health():
             "database": MONGO_DB_NAME,
             "server_version": server_info.get('version', 'unknown'),
             "collections_count": len(collections),
+            "pool": get_mongo_pool().get_stats(),
             "message": "MongoDB connection successful"
         }), 200
         
@@ -636,162 +718,199 @@ def api_mongodb_health():
         }), 500
 
 
+@app.route('/api/nse-session/stats', methods=['GET'])
+@token_required
+def api_nse_session_stats():
+    """API endpoint to get shared NSE HTTP session statistics (connection reuse, cookie refreshes, skipped snapshots)"""
+    try:
+        return jsonify({
+            "success": True,
+            "stats": get_nse_session().get_stats(),
+            "snapshot_dedup": get_snapshot_dedup().get_stats(),
+            "expiry_cache": get_expiry_cache().get_stats()
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+def parse_series_bound(value, end_of_day=False):
+    """Parse a YYYY-MM-DD[ HH:MM[:SS]] query bound into a naive IST datetime"""
+    if not value:
+        return None
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M'):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    day = datetime.strptime(value, '%Y-%m-%d')
+    return day.replace(hour=23, minute=59, second=59) if end_of_day else day
+
+
+@app.route('/api/option-chain/strike-series', methods=['GET'])
+@token_required
+@validate_query_params(StrikeSeriesSchema)
+def api_option_chain_strike_series(validated_data):
+    """API endpoint to get the intraday series of a single option chain strike (any index or bank)"""
+    try:
+        fields = None
+        if validated_data.get('field_names'):
+            fields = [field for field in validated_data['field_names'].split(',') if field in LEG_FIELDS or field == 'underlyingValue']
+            if not fields:
+                return jsonify({
+                    "success": False,
+                    "error": f"fields must be any of: underlyingValue, {', '.join(LEG_FIELDS)}"
+                }), 400
+        
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
+        series = get_timeseries(collector.db).get_strike_series(
+            symbol=validated_data['symbol'],
+            strike=validated_data['strike'],
+            option_type=validated_data['option_type'],
+            expiry=validated_data.get('expiry'),
+            start=parse_series_bound(validated_data.get('start')),
+            end=parse_series_bound(validated_data.get('end'), end_of_day=True),
+            fields=fields,
+            limit=validated_data.get('limit', 0)
+        )
+        collector.close()
+        
+        for point in series["points"]:
+            point["ts"] = format_datetime_for_json(point.get("ts"))
+        
+        return jsonify({
+            "success": True,
+            "count": len(series["points"]),
+            **series
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/option-chain/summary-series', methods=['GET'])
+@token_required
+@validate_query_params(SummarySeriesSchema)
+def api_option_chain_summary_series(validated_data):
+    """API endpoint to get the PCR / max pain / OI totals series of any index or bank"""
+    try:
+        fields = None
+        if validated_data.get('field_names'):
+            fields = [field for field in validated_data['field_names'].split(',') if field in SUMMARY_FIELDS]
+            if not fields:
+                return jsonify({
+                    "success": False,
+                    "error": f"fields must be any of: {', '.join(SUMMARY_FIELDS)}"
+                }), 400
+        
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
+        series = get_summary_store(collector.db).get_summary_series(
+            symbol=validated_data['symbol'],
+            expiry=validated_data.get('expiry'),
+            start=parse_series_bound(validated_data.get('start')),
+            end=parse_series_bound(validated_data.get('end'), end_of_day=True),
+            fields=fields,
+            limit=validated_data.get('limit', 0)
+        )
+        collector.close()
+        
+        for point in series["points"]:
+            point["ts"] = format_datetime_for_json(point.get("ts"))
+        
+        return jsonify({
+            "success": True,
+            "count": len(series["points"]),
+            **series
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/option-chain/rollup-series', methods=['GET'])
+@token_required
+@validate_query_params(RollupSeriesSchema)
+def api_option_chain_rollup_series(validated_data):
+    """
+    API endpoint to get underlying OHLC, total OI and PCR of any index or bank over a range
+    With resolution=auto, the finest of raw / 5m / 15m / 1d that fits in max_points is used
+    """
+    try:
+        start = parse_series_bound(validated_data['start'])
+        end = parse_series_bound(validated_data.get('end'), end_of_day=True) or now_for_mongo()
+        if end < start:
+            return jsonify({
+                "success": False,
+                "error": "end must not be before start"
+            }), 400
+        
+        max_points = validated_data.get('max_points', 500)
+        resolution = validated_data.get('resolution', 'auto')
+        if resolution == 'auto':
+            resolution = pick_resolution(start, end, max_points)
+        
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
+        rollups = get_rollup_store(collector.db)
+        if resolution == 'raw':
+            points = rollups.get_raw_series(validated_data['symbol'], start, end, limit=max_points)
+        else:
+            points = rollups.get_series(validated_data['symbol'], resolution, start, end, limit=max_points)
+        collector.close()
+        
+        for point in points:
+            point["ts"] = format_datetime_for_json(point.get("ts"))
+        
+        return jsonify({
+            "success": True,
+            "symbol": validated_data['symbol'],
+            "resolution": resolution,
+            "count": len(points),
+            "points": points
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
 @app.route('/api/backup', methods=['GET'])
 @token_required
 @limiter.limit("2 per hour")  # Limit backup requests to prevent abuse
-def api_backup():
+@validate_query_params(BackupSchema)
+def api_backup(validated_data):
     """API endpoint to create and download a backup of all MongoDB collections
-    Uses batch processing to handle large databases without timeout issues
+    Streams the zip as it is written (one cursor per collection, NDJSON or BSON entries),
+    so memory use stays constant regardless of database size
+    mode=incremental only exports documents added or updated since the last completed backup
     """
     try:
-        from pymongo import MongoClient
-        
-        # Get MongoDB configuration from environment variables
-        MONGO_HOST = os.getenv('MONGO_HOST', 'localhost')
-        MONGO_PORT = int(os.getenv('MONGO_PORT', 27017))
         MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'nse_data')
-        MONGO_USERNAME = os.getenv('MONGO_USERNAME', None)
-        MONGO_PASSWORD = os.getenv('MONGO_PASSWORD', None)
-        
-        # Build MongoDB URI with increased timeouts for large databases
-        if MONGO_USERNAME and MONGO_PASSWORD:
-            encoded_username = quote_plus(MONGO_USERNAME)
-            encoded_password = quote_plus(MONGO_PASSWORD)
-            MONGO_AUTH_SOURCE = os.getenv('MONGO_AUTH_SOURCE', 'admin')
-            mongo_uri = f"mongodb://{encoded_username}:{encoded_password}@{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB_NAME}?authSource={MONGO_AUTH_SOURCE}"
-        else:
-            mongo_uri = f"mongodb://{MONGO_HOST}:{MONGO_PORT}/"
-        
-        # Connect to MongoDB with increased timeouts for large databases
-        # serverSelectionTimeoutMS: 30 seconds to connect
-        # socketTimeoutMS: 2 hours for large operations
-        # connectTimeoutMS: 30 seconds
-        client = MongoClient(
-            mongo_uri,
-            serverSelectionTimeoutMS=30000,
-            socketTimeoutMS=7200000,  # 2 hours for large backups
-            connectTimeoutMS=30000
-        )
-        client.admin.command('ping')
-        db = client[MONGO_DB_NAME]
+        backup_format = validated_data['format']
         
-        # Get all collections
-        collections = db.list_collection_names()
+        # Borrow the shared pool; its sockets have no timeout, so long cursors are safe
+        client = get_mongo_client()
+        db = client[MONGO_DB_NAME]
         
-        # Batch size for processing large collections
-        BATCH_SIZE = 1000
-        
-        def convert_objectids(obj):
-            """Recursively convert ObjectId to string"""
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    if isinstance(value, ObjectId):
-                        obj[key] = str(value)
-                    elif isinstance(value, dict):
-                        convert_objectids(value)
-                    elif isinstance(value, list):
-                        for item in value:
-                            convert_objectids(item)
-            elif isinstance(obj, list):
-                for item in obj:
-                    convert_objectids(item)
-        
-        def generate_backup():
-            """Generator function to stream backup data"""
-            # Create in-memory zip file
-            zip_buffer = io.BytesIO()
-            
-            try:
-                with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                    # Create metadata file
-                    metadata = {
-                        "backup_date": datetime.now().isoformat(),
-                        "database": MONGO_DB_NAME,
-                        "collections": collections,
-                        "total_collections": len(collections)
-                    }
-                    zip_file.writestr("backup_metadata.json", json.dumps(metadata, indent=2))
-                    
-                    # Export each collection in batches
-                    for collection_name in collections:
-                        try:
-                            collection = db[collection_name]
-                            
-                            # Get document count first
-                            doc_count = collection.count_documents({})
-                            logger.info(f"Exporting collection: {collection_name} ({doc_count} documents)")
-                            
-                            # Process documents in batches to avoid memory issues
-                            all_documents = []
-                            skip = 0
-                            
-                            while True:
-                                # Fetch batch of documents
-                                batch = list(collection.find({}).skip(skip).limit(BATCH_SIZE))
-                                
-                                if not batch:
-                                    break
-                                
-                                # Convert ObjectIds in batch
-                                for doc in batch:
-                                    if '_id' in doc:
-                                        doc['_id'] = str(doc['_id'])
-                                    convert_objectids(doc)
-                                
-                                all_documents.extend(batch)
-                                skip += BATCH_SIZE
-                                
-                                # Log progress for large collections
-                                if doc_count > BATCH_SIZE and skip % (BATCH_SIZE * 10) == 0:
-                                    logger.info(f"  Progress: {skip}/{doc_count} documents processed for {collection_name}")
-                            
-                            # Write collection data to zip
-                            collection_data = {
-                                "collection_name": collection_name,
-                                "document_count": len(all_documents),
-                                "documents": all_documents
-                            }
-                            
-                            # Write in chunks if very large
-                            json_str = json.dumps(collection_data, indent=2, default=str)
-                            zip_file.writestr(
-                                f"collections/{collection_name}.json",
-                                json_str
-                            )
-                            
-                            logger.info(f"Exported collection: {collection_name} ({len(all_documents)} documents)")
-                            
-                            # Clear memory
-                            del all_documents
-                            
-                        except Exception as e:
-                            logger.error(f"Error exporting collection {collection_name}: {str(e)}", exc_info=True)
-                            # Continue with other collections even if one fails
-                            error_info = {
-                                "collection_name": collection_name,
-                                "error": str(e)
-                            }
-                            zip_file.writestr(
-                                f"collections/{collection_name}_error.json",
-                                json.dumps(error_info, indent=2)
-                            )
-                
-                # Prepare file for download
-                zip_buffer.seek(0)
-                yield zip_buffer.read()
-                
-            finally:
-                client.close()
-                zip_buffer.close()
+        # Get all collections, time-series included (views are backed up through their source collections)
+        collections = list_backup_collections(db)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"nse_data_backup_{timestamp}.zip"
+        # mode=incremental exports only what changed since the last completed backup
+        plan = plan_backup(db, collections, validated_data['mode'], backup_format)
+        suffix = "" if plan.backup_type == "full" else "_incremental"
+        filename = f"nse_data_backup_{plan.backup_id}{suffix}.zip"
         
-        logger.info(f"Starting backup creation: {filename} ({len(collections)} collections)")
+        logger.info(f"Starting backup creation: {filename} ({len(collections)} collections, {backup_format})")
         
-        # Stream the response
+        # Stream the response; the checkpoint is recorded once the last chunk is sent
         return Response(
-            stream_with_context(generate_backup()),
+            stream_with_context(iter_planned_backup(db, plan)),
             mimetype='application/zip',
             headers={
                 'Content-Disposition': f'attachment; filename="{filename}"',
@@ -808,6 +927,180 @@ def api_backup():
         }), 500
 
 
+def format_backup_job(job):
+    """Format the dates of a backup job for JSON"""
+    for field in ('startedAt', 'heartbeatAt', 'completedAt'):
+        job[field] = format_datetime_for_json(job.get(field))
+    return job
+
+
+@app.route('/api/backup/jobs', methods=['POST'])
+@token_required
+@limiter.limit("2 per hour")
+@validate_query_params(BackupSchema)
+def api_start_backup_job(validated_data):
+    """API endpoint to start a backup job that writes the archive to BACKUP_DIR in the background
+    Poll /api/backup/jobs/<job_id> for progress, then download from /api/backup/jobs/<job_id>/download
+    """
+    try:
+        MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'nse_data')
+        db = get_mongo_client()[MONGO_DB_NAME]
+        
+        job = get_backup_jobs(db).start_job(validated_data['mode'], validated_data['format'])
+        if job.get('already_running'):
+            return jsonify({
+                "success": False,
+                "error": "A backup or restore job is already running",
+                "data": format_backup_job(job)
+            }), 409
+        
+        return jsonify({
+            "success": True,
+            "data": format_backup_job(job)
+        }), 202
+    except Exception as e:
+        logger.error(f"Error starting backup job: {str(e)}", exc_info=True)
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/backup/jobs', methods=['GET'])
+@token_required
+def api_list_backup_jobs():
+    """API endpoint to list recent backup and restore jobs"""
+    try:
+        MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'nse_data')
+        db = get_mongo_client()[MONGO_DB_NAME]
+        
+        return jsonify({
+            "success": True,
+            "data": [format_backup_job(job) for job in get_backup_jobs(db).list_jobs()]
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/backup/jobs/<job_id>', methods=['GET'])
+@token_required
+@validate_path_param('job_id', is_valid_job_id, 'Invalid job ID')
+def api_get_backup_job(job_id):
+    """API endpoint to get the progress of a backup or restore job (a finished restore includes its result)"""
+    try:
+        MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'nse_data')
+        db = get_mongo_client()[MONGO_DB_NAME]
+        
+        job = get_backup_jobs(db).get_job(job_id)
+        if not job:
+            return jsonify({
+                "success": False,
+                "error": "Job not found"
+            }), 404
+        
+        return jsonify({
+            "success": True,
+            "data": format_backup_job(job)
+        })
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/backup/jobs/<job_id>/download', methods=['GET'])
+@token_required
+@validate_path_param('job_id', is_valid_job_id, 'Invalid job ID')
+def api_download_backup_job(job_id):
+    """API endpoint to download a finished backup archive
+    Supports Range / If-Range requests, so an interrupted download can resume where it stopped
+    """
+    try:
+        MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'nse_data')
+        db = get_mongo_client()[MONGO_DB_NAME]
+        
+        backup_jobs = get_backup_jobs(db)
+        job = backup_jobs.get_job(job_id)
+        if not job:
+            return jsonify({
+                "success": False,
+                "error": "Backup job not found"
+            }), 404
+        
+        path = backup_jobs.get_artifact_path(job)
+        if path is None:
+            return jsonify({
+                "success": False,
+                "error": f"Backup is not available for download (status: {job.get('status')})"
+            }), 409
+        
+        # conditional=True answers Range requests with 206 Partial Content (ETag / Last-Modified for If-Range)
+        return send_file(
+            os.path.abspath(path),
+            mimetype='application/zip',
+            as_attachment=True,
+            download_name=job['filename'],
+            conditional=True,
+            etag=True
+        )
+    except Exception as e:
+        logger.error(f"Error downloading backup {job_id}: {str(e)}", exc_info=True)
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/api/restore', methods=['POST'])
+@token_required
+@limiter.limit("2 per hour")
+@validate_json_body(RestoreSchema)
+def api_restore(validated_data):
+    """API endpoint to start a restore job for backup archives stored in BACKUP_DIR
+    Loads collections in parallel in the background (base archive first, then increments), skips duplicates
+    and builds indexes once the data is in place; poll /api/backup/jobs/<job_id> for progress and the result
+    """
+    try:
+        MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'nse_data')
+        
+        for archive in validated_data['archives']:
+            if not os.path.isfile(os.path.join(BACKUP_DIR, os.path.basename(archive))):
+                return jsonify({
+                    "success": False,
+                    "error": f"Backup archive not found: {archive}"
+                }), 404
+        
+        db = get_mongo_client()[MONGO_DB_NAME]
+        job = get_backup_jobs(db).start_restore_job(
+            validated_data['archives'],
+            workers=validated_data['workers'],
+            drop=validated_data['drop'],
+            collections=validated_data.get('collections')
+        )
+        if job.get('already_running'):
+            return jsonify({
+                "success": False,
+                "error": "A backup or restore job is already running",
+                "data": format_backup_job(job)
+            }), 409
+        
+        logger.info(f"Started restore job {job['job_id']} of {len(validated_data['archives'])} archive(s) requested by {request.remote_addr}")
+        return jsonify({
+            "success": True,
+            "data": format_backup_job(job)
+        }), 202
+    except Exception as e:
+        logger.error(f"Error starting restore job: {str(e)}", exc_info=True)
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
 @app.route('/api/login', methods=['POST'])
 @limiter.limit("5 per 15 minutes")  # Allow 5 login attempts per 15 minutes per IP
 @validate_json_body(LoginSchema)
@@ -858,6 +1151,7 @@ def api_verify_token():
 
 @app.route('/api/status')
 @token_required
+@cached_response([FIIDII_COLLECTION_NAME], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_status():
     """API endpoint to get scheduler status"""
     logger.debug(f"Scheduler status requested by {request.remote_addr}")
@@ -871,10 +1165,10 @@ def api_status():
 def api_delete_data(record_id):
     """API endpoint to delete a specific FII/DII record"""
     try:
-        collector = NSEDataCollector()
+        collector = get_shared_collector(NSEDataCollector)
         
         # Delete the record
-        result = collector.collection.delete_one({"_id": ObjectId(record_id)})
+        result = delete_record(collector.collection, record_id)
         
         collector.close()
         
@@ -901,7 +1195,7 @@ def api_delete_data(record_id):
 def api_data(validated_data):
     """API endpoint to get collected data with pagination and date filtering"""
     try:
-        collector = NSEDataCollector()
+        collector = get_shared_collector(NSEDataCollector)
         
         # Get validated pagination parameters
         page = validated_data.get('page', 1)
@@ -921,14 +1215,11 @@ def api_data(validated_data):
             else:
                 query_filter["date"] = {"$lte": end_date}
         
-        # Calculate skip
-        skip = (page - 1) * limit
-        
-        # Get total count with filter
-        total_count = collector.collection.count_documents(query_filter)
-        
-        # Get paginated records sorted by date (newest first)
-        records = list(collector.collection.find(query_filter).sort("date", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by date (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collector.collection, query_filter, "date", page, limit,
+            cursor=validated_data.get('cursor'), total=validated_data.get('total')
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -945,20 +1236,17 @@ def api_data(validated_data):
         
         collector.close()
         
-        # Calculate pagination info
-        total_pages = (total_count + limit - 1) // limit  # Ceiling division
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -968,10 +1256,11 @@ def api_data(validated_data):
 
 @app.route('/api/stats')
 @token_required
+@cached_response([FIIDII_COLLECTION_NAME])
 def api_stats():
     """API endpoint to get statistics"""
     try:
-        collector = NSEDataCollector()
+        collector = get_shared_collector(NSEDataCollector)
         
         total_count = collector.collection.count_documents({})
         
@@ -1003,7 +1292,7 @@ def api_stats():
 def api_trigger():
     """API endpoint to manually trigger FII/DII data collection"""
     try:
-        collector = NSEDataCollector()
+        collector = get_shared_collector(NSEDataCollector)
         success = collector.collect_and_save()
         collector.close()
         
@@ -1190,6 +1479,7 @@ def get_option_chain_status():
 
 
 @app.route('/api/option-chain/status')
+@cached_response([snapshot_cache_tag("NIFTY")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_option_chain_status():
     """API endpoint to get option chain scheduler status"""
     status = get_option_chain_status()
@@ -1200,7 +1490,7 @@ def api_option_chain_status():
 def api_option_chain_expiry():
     """API endpoint to get current NIFTY expiry date"""
     try:
-        collector = NSEAllIndicesOptionChainCollector()
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("NIFTY")
         collector.close()
         
@@ -1255,14 +1545,12 @@ def api_option_chain_data():
             else:
                 query_filter["records.timestamp"] = {"$lte": end_date}
         
-        # Calculate skip
-        skip = (page - 1) * limit
-        
-        # Get total count with filter
-        total_count = collection.count_documents(query_filter)
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find(query_filter).sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, query_filter, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -1272,7 +1560,7 @@ def api_option_chain_data():
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": record.get("records", {}).get("underlyingValue") if isinstance(record.get("records"), dict) else None,
-                "dataCount": len(record.get("records", {}).get("data", [])) if isinstance(record.get("records"), dict) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt")),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"))
             }
@@ -1280,20 +1568,17 @@ def api_option_chain_data():
         
         collector.close()
         
-        # Calculate pagination info
-        total_pages = (total_count + limit - 1) // limit  # Ceiling division
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -1302,6 +1587,7 @@ def api_option_chain_data():
 
 
 @app.route('/api/option-chain/stats')
+@cached_response([snapshot_cache_tag("NIFTY")])
 def api_option_chain_stats():
     """API endpoint to get option chain statistics"""
     try:
@@ -1347,7 +1633,7 @@ def api_option_chain_stats():
 def api_option_chain_trigger():
     """API endpoint to manually trigger option chain data collection"""
     try:
-        collector = NSEAllIndicesOptionChainCollector()
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
         # Collect data for NIFTY only
         nifty_index = next((i for i in INDICES if i["symbol"] == "NIFTY"), None)
         if nifty_index:
@@ -1389,7 +1675,8 @@ def api_option_chain_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -1413,11 +1700,14 @@ def api_option_chain_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
             # Delete the record
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -1485,6 +1775,7 @@ def get_banknifty_option_chain_status():
 
 
 @app.route('/api/banknifty/status')
+@cached_response([snapshot_cache_tag("BANKNIFTY")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_banknifty_status():
     """API endpoint to get BankNifty option chain scheduler status"""
     status = get_banknifty_option_chain_status()
@@ -1520,14 +1811,12 @@ def api_banknifty_data():
             else:
                 query_filter["records.timestamp"] = {"$lte": end_date}
         
-        # Calculate skip
-        skip = (page - 1) * limit
-        
-        # Get total count with filter
-        total_count = collection.count_documents(query_filter)
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find(query_filter).sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, query_filter, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -1537,7 +1826,7 @@ def api_banknifty_data():
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": record.get("records", {}).get("underlyingValue") if isinstance(record.get("records"), dict) else None,
-                "dataCount": len(record.get("records", {}).get("data", [])) if isinstance(record.get("records"), dict) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt")),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"))
             }
@@ -1545,20 +1834,17 @@ def api_banknifty_data():
         
         collector.close()
         
-        # Calculate pagination info
-        total_pages = (total_count + limit - 1) // limit  # Ceiling division
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -1570,7 +1856,7 @@ def api_banknifty_data():
 def api_banknifty_expiry():
     """API endpoint to get current BankNifty expiry date"""
     try:
-        collector = NSEAllIndicesOptionChainCollector()
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("BANKNIFTY")
         collector.close()
         
@@ -1597,6 +1883,7 @@ def api_banknifty_expiry():
 
 
 @app.route('/api/banknifty/stats')
+@cached_response([snapshot_cache_tag("BANKNIFTY")])
 def api_banknifty_stats():
     """API endpoint to get BankNifty option chain statistics"""
     try:
@@ -1642,7 +1929,7 @@ def api_banknifty_stats():
 def api_banknifty_trigger():
     """API endpoint to manually trigger BankNifty option chain data collection"""
     try:
-        collector = NSEAllIndicesOptionChainCollector()
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
         # Collect data for BANKNIFTY only
         banknifty_index = next((i for i in INDICES if i["symbol"] == "BANKNIFTY"), None)
         if banknifty_index:
@@ -1683,7 +1970,8 @@ def api_get_banknifty_data(record_id):
             }), 400
         
         if request.method == 'GET':
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -1732,10 +2020,13 @@ def api_delete_banknifty_data(record_id):
             }), 400
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -1803,6 +2094,7 @@ def get_finnifty_option_chain_status():
 
 
 @app.route('/api/finnifty/status')
+@cached_response([snapshot_cache_tag("FINNIFTY")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_finnifty_status():
     """API endpoint to get Finnifty option chain scheduler status"""
     status = get_finnifty_option_chain_status()
@@ -1839,14 +2131,12 @@ def api_finnifty_data():
             else:
                 query_filter["records.timestamp"] = {"$lte": end_date}
         
-        # Calculate skip
-        skip = (page - 1) * limit
-        
-        # Get total count with filter
-        total_count = collection.count_documents(query_filter)
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find(query_filter).sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, query_filter, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -1856,7 +2146,7 @@ def api_finnifty_data():
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": record.get("records", {}).get("underlyingValue") if isinstance(record.get("records"), dict) else None,
-                "dataCount": len(record.get("records", {}).get("data", [])) if isinstance(record.get("records"), dict) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt")),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"))
             }
@@ -1864,20 +2154,17 @@ def api_finnifty_data():
         
         collector.close()
         
-        # Calculate pagination info
-        total_pages = (total_count + limit - 1) // limit  # Ceiling division
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -1889,7 +2176,7 @@ def api_finnifty_data():
 def api_finnifty_expiry():
     """API endpoint to get current Finnifty expiry date"""
     try:
-        collector = NSEAllIndicesOptionChainCollector()
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("FINNIFTY")
         collector.close()
         
@@ -1916,6 +2203,7 @@ def api_finnifty_expiry():
 
 
 @app.route('/api/finnifty/stats')
+@cached_response([snapshot_cache_tag("FINNIFTY")])
 def api_finnifty_stats():
     """API endpoint to get Finnifty option chain statistics"""
     try:
@@ -1961,7 +2249,7 @@ def api_finnifty_stats():
 def api_finnifty_trigger():
     """API endpoint to manually trigger Finnifty option chain data collection"""
     try:
-        collector = NSEAllIndicesOptionChainCollector()
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
         # Collect data for FINNIFTY only
         finnifty_index = next((i for i in INDICES if i["symbol"] == "FINNIFTY"), None)
         if finnifty_index:
@@ -2003,7 +2291,8 @@ def api_finnifty_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -2027,10 +2316,13 @@ def api_finnifty_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -2098,6 +2390,7 @@ def get_midcpnifty_option_chain_status():
 
 
 @app.route('/api/midcpnifty/status')
+@cached_response([snapshot_cache_tag("MIDCPNIFTY")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_midcpnifty_status():
     """API endpoint to get MidcapNifty option chain scheduler status"""
     status = get_midcpnifty_option_chain_status()
@@ -2125,7 +2418,6 @@ def api_midcpnifty_data():
             else:
                 query_filter["records.timestamp"] = {"$lte": end_date}
         
-        skip = (page - 1) * limit
         
         collector, collection = get_index_collection("MIDCPNIFTY")
         if collection is None:
@@ -2135,11 +2427,12 @@ def api_midcpnifty_data():
                 "error": "Collection not found for MIDCPNIFTY"
             }), 404
         
-        # Get total count with filter
-        total_count = collection.count_documents(query_filter)
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find(query_filter).sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, query_filter, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -2148,17 +2441,15 @@ def api_midcpnifty_data():
             if isinstance(records_data, dict):
                 timestamp = records_data.get("timestamp")
                 underlying_value = records_data.get("underlyingValue")
-                data_array = records_data.get("data", [])
             else:
                 timestamp = None
                 underlying_value = None
-                data_array = []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -2166,19 +2457,17 @@ def api_midcpnifty_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -2190,7 +2479,7 @@ def api_midcpnifty_data():
 def api_midcpnifty_expiry():
     """API endpoint to get current MidcapNifty expiry date"""
     try:
-        collector = NSEAllIndicesOptionChainCollector()
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("MIDCPNIFTY")
         collector.close()
         
@@ -2217,6 +2506,7 @@ def api_midcpnifty_expiry():
 
 
 @app.route('/api/midcpnifty/stats')
+@cached_response([snapshot_cache_tag("MIDCPNIFTY")])
 def api_midcpnifty_stats():
     """API endpoint to get MidcapNifty option chain statistics"""
     try:
@@ -2264,7 +2554,7 @@ def api_midcpnifty_stats():
 def api_midcpnifty_trigger():
     """API endpoint to manually trigger MidcapNifty option chain data collection"""
     try:
-        collector = NSEAllIndicesOptionChainCollector()
+        collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
         # Collect data for MIDCPNIFTY only
         midcpnifty_index = next((i for i in INDICES if i["symbol"] == "MIDCPNIFTY"), None)
         if midcpnifty_index:
@@ -2306,7 +2596,8 @@ def api_midcpnifty_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -2330,10 +2621,13 @@ def api_midcpnifty_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -2403,6 +2697,7 @@ def get_all_banks_option_chain_status():
 
 
 @app.route('/api/all-banks/status')
+@cached_response([snapshot_cache_tag(bank["symbol"]) for bank in BANKS], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_all_banks_status():
     """API endpoint to get All Banks option chain scheduler status"""
     status = get_all_banks_option_chain_status()
@@ -2412,7 +2707,7 @@ def api_all_banks_status():
 # Helper function to get collection for a specific bank
 def get_bank_collection(symbol: str):
     """Get MongoDB collection for a specific bank symbol"""
-    collector = NSEAllBanksOptionChainCollector()
+    collector = get_shared_collector(NSEAllBanksOptionChainCollector)
     collection = collector.get_collection(symbol)
     return collector, collection
 
@@ -2420,7 +2715,7 @@ def get_bank_collection(symbol: str):
 # Helper function to get collection for a specific index
 def get_index_collection(symbol: str):
     """Get MongoDB collection for a specific index symbol"""
-    collector = NSEAllIndicesOptionChainCollector()
+    collector = get_shared_collector(NSEAllIndicesOptionChainCollector)
     collection = collector.get_collection(symbol)
     return collector, collection
 
@@ -2428,17 +2723,38 @@ def get_index_collection(symbol: str):
 # Helper function to get collection for gainers or losers
 def get_gainers_collection():
     """Get MongoDB collection for gainers"""
-    collector = NSEGainersLosersCollector()
+    collector = get_shared_collector(NSEGainersLosersCollector)
     collection = collector.get_collection("gainers")
     return collector, collection
 
 def get_losers_collection():
     """Get MongoDB collection for losers"""
-    collector = NSEGainersLosersCollector()
+    collector = get_shared_collector(NSEGainersLosersCollector)
     collection = collector.get_collection("losers")
     return collector, collection
 
 
+def snapshot_delete_unsupported():
+    """Response for a snapshot DELETE in time-series mode (time-series snapshots are insert-only)"""
+    return jsonify({
+        "success": False,
+        "error": "Snapshots cannot be deleted with SNAPSHOT_STORAGE_BACKEND=timeseries (time-series storage is insert-only)"
+    }), 409
+
+
+def delete_record(collection, record_id: str):
+    """
+    Delete one record by _id, recording the delete for incremental backups and invalidating
+    the collection's cached stats/status responses
+    Returns: The DeleteResult
+    """
+    result = collection.delete_one({"_id": ObjectId(record_id)})
+    if result.deleted_count > 0:
+        record_deletions(collection.database, collection.name, [ObjectId(record_id)])
+        bump_versions(collection.database, [collection.name])
+    return result
+
+
 # Helper function to get bank symbol from endpoint path
 def get_bank_symbol_from_path(path: str) -> str:
     """Extract bank symbol from API path (e.g., /api/hdfcbank/data -> HDFCBANK)"""
@@ -2463,6 +2779,7 @@ def get_bank_symbol_from_path(path: str) -> str:
 
 
 @app.route('/api/hdfcbank/status')
+@cached_response([snapshot_cache_tag("HDFCBANK")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_hdfcbank_status():
     """API endpoint to get HDFC Bank option chain scheduler status (deprecated - use /api/all-banks/status)"""
     # Return status from unified scheduler
@@ -2479,7 +2796,6 @@ def api_hdfcbank_data():
     """API endpoint to get collected HDFC Bank option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("HDFCBANK")
         if collection is None:
@@ -2489,11 +2805,12 @@ def api_hdfcbank_data():
                 "error": "Collection not found for HDFCBANK"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -2501,13 +2818,12 @@ def api_hdfcbank_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -2515,19 +2831,17 @@ def api_hdfcbank_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -2539,7 +2853,7 @@ def api_hdfcbank_data():
 def api_hdfcbank_expiry():
     """API endpoint to get current HDFC Bank expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         # Get expiry for HDFCBANK
         expiry = collector._fetch_expiry_dates_with_retry("HDFCBANK")
         collector.close()
@@ -2567,6 +2881,7 @@ def api_hdfcbank_expiry():
 
 
 @app.route('/api/hdfcbank/stats')
+@cached_response([snapshot_cache_tag("HDFCBANK")])
 def api_hdfcbank_stats():
     """API endpoint to get HDFC Bank option chain statistics"""
     try:
@@ -2613,7 +2928,7 @@ def api_hdfcbank_stats():
 def api_hdfcbank_trigger():
     """API endpoint to manually trigger HDFC Bank option chain data collection"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         # Collect data for HDFCBANK only
         hdfc_bank = next((b for b in BANKS if b["symbol"] == "HDFCBANK"), None)
         if hdfc_bank:
@@ -2655,7 +2970,8 @@ def api_hdfcbank_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -2679,10 +2995,13 @@ def api_hdfcbank_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -2750,6 +3069,7 @@ def get_icicibank_option_chain_status():
 
 
 @app.route('/api/icicibank/status')
+@cached_response([snapshot_cache_tag("ICICIBANK")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_icicibank_status():
     """API endpoint to get ICICI Bank option chain scheduler status"""
     status = get_icicibank_option_chain_status()
@@ -2762,7 +3082,6 @@ def api_icicibank_data():
     """API endpoint to get collected ICICI Bank option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("ICICIBANK")
         if collection is None:
@@ -2772,11 +3091,12 @@ def api_icicibank_data():
                 "error": "Collection not found for ICICIBANK"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -2784,13 +3104,12 @@ def api_icicibank_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -2798,19 +3117,17 @@ def api_icicibank_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -2822,7 +3139,7 @@ def api_icicibank_data():
 def api_icicibank_expiry():
     """API endpoint to get current ICICI Bank expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("ICICIBANK")
         collector.close()
         
@@ -2849,6 +3166,7 @@ def api_icicibank_expiry():
 
 
 @app.route('/api/icicibank/stats')
+@cached_response([snapshot_cache_tag("ICICIBANK")])
 def api_icicibank_stats():
     """API endpoint to get ICICI Bank option chain statistics"""
     try:
@@ -2946,7 +3264,8 @@ def api_icicibank_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -2970,10 +3289,13 @@ def api_icicibank_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -3041,6 +3363,7 @@ def get_sbin_option_chain_status():
 
 
 @app.route('/api/sbin/status')
+@cached_response([snapshot_cache_tag("SBIN")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_sbin_status():
     """API endpoint to get SBIN option chain scheduler status"""
     status = get_sbin_option_chain_status()
@@ -3053,7 +3376,6 @@ def api_sbin_data():
     """API endpoint to get collected SBIN option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("SBIN")
         if collection is None:
@@ -3063,11 +3385,12 @@ def api_sbin_data():
                 "error": "Collection not found for SBIN"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -3075,13 +3398,12 @@ def api_sbin_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -3089,19 +3411,17 @@ def api_sbin_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -3113,7 +3433,7 @@ def api_sbin_data():
 def api_sbin_expiry():
     """API endpoint to get current SBIN expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("SBIN")
         collector.close()
         
@@ -3140,6 +3460,7 @@ def api_sbin_expiry():
 
 
 @app.route('/api/sbin/stats')
+@cached_response([snapshot_cache_tag("SBIN")])
 def api_sbin_stats():
     """API endpoint to get SBIN option chain statistics"""
     try:
@@ -3237,7 +3558,8 @@ def api_sbin_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -3261,10 +3583,13 @@ def api_sbin_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -3332,6 +3657,7 @@ def get_kotakbank_option_chain_status():
 
 
 @app.route('/api/kotakbank/status')
+@cached_response([snapshot_cache_tag("KOTAKBANK")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_kotakbank_status():
     """API endpoint to get Kotak Bank option chain scheduler status"""
     status = get_kotakbank_option_chain_status()
@@ -3344,7 +3670,6 @@ def api_kotakbank_data():
     """API endpoint to get collected Kotak Bank option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("KOTAKBANK")
         if collection is None:
@@ -3354,11 +3679,12 @@ def api_kotakbank_data():
                 "error": "Collection not found for KOTAKBANK"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -3366,13 +3692,12 @@ def api_kotakbank_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -3380,19 +3705,17 @@ def api_kotakbank_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -3404,7 +3727,7 @@ def api_kotakbank_data():
 def api_kotakbank_expiry():
     """API endpoint to get current Kotak Bank expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("KOTAKBANK")
         collector.close()
         
@@ -3431,6 +3754,7 @@ def api_kotakbank_expiry():
 
 
 @app.route('/api/kotakbank/stats')
+@cached_response([snapshot_cache_tag("KOTAKBANK")])
 def api_kotakbank_stats():
     """API endpoint to get Kotak Bank option chain statistics"""
     try:
@@ -3528,7 +3852,8 @@ def api_kotakbank_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -3552,10 +3877,13 @@ def api_kotakbank_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -3623,6 +3951,7 @@ def get_axisbank_option_chain_status():
 
 
 @app.route('/api/axisbank/status')
+@cached_response([snapshot_cache_tag("AXISBANK")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_axisbank_status():
     """API endpoint to get Axis Bank option chain scheduler status"""
     status = get_axisbank_option_chain_status()
@@ -3635,7 +3964,6 @@ def api_axisbank_data():
     """API endpoint to get collected Axis Bank option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("AXISBANK")
         if collection is None:
@@ -3645,11 +3973,12 @@ def api_axisbank_data():
                 "error": "Collection not found for AXISBANK"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -3657,13 +3986,12 @@ def api_axisbank_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -3671,19 +3999,17 @@ def api_axisbank_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -3695,7 +4021,7 @@ def api_axisbank_data():
 def api_axisbank_expiry():
     """API endpoint to get current Axis Bank expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("AXISBANK")
         collector.close()
         
@@ -3722,6 +4048,7 @@ def api_axisbank_expiry():
 
 
 @app.route('/api/axisbank/stats')
+@cached_response([snapshot_cache_tag("AXISBANK")])
 def api_axisbank_stats():
     """API endpoint to get Axis Bank option chain statistics"""
     try:
@@ -3819,7 +4146,8 @@ def api_axisbank_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -3843,10 +4171,13 @@ def api_axisbank_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -3914,6 +4245,7 @@ def get_bankbaroda_option_chain_status():
 
 
 @app.route('/api/bankbaroda/status')
+@cached_response([snapshot_cache_tag("BANKBARODA")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_bankbaroda_status():
     """API endpoint to get Bank of Baroda option chain scheduler status"""
     status = get_bankbaroda_option_chain_status()
@@ -3926,7 +4258,6 @@ def api_bankbaroda_data():
     """API endpoint to get collected Bank of Baroda option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("BANKBARODA")
         if collection is None:
@@ -3936,11 +4267,12 @@ def api_bankbaroda_data():
                 "error": "Collection not found for BANKBARODA"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -3948,13 +4280,12 @@ def api_bankbaroda_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -3962,19 +4293,17 @@ def api_bankbaroda_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -3986,7 +4315,7 @@ def api_bankbaroda_data():
 def api_bankbaroda_expiry():
     """API endpoint to get current Bank of Baroda expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("BANKBARODA")
         collector.close()
         
@@ -4013,6 +4342,7 @@ def api_bankbaroda_expiry():
 
 
 @app.route('/api/bankbaroda/stats')
+@cached_response([snapshot_cache_tag("BANKBARODA")])
 def api_bankbaroda_stats():
     """API endpoint to get Bank of Baroda option chain statistics"""
     try:
@@ -4110,7 +4440,8 @@ def api_bankbaroda_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -4134,10 +4465,13 @@ def api_bankbaroda_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -4205,6 +4539,7 @@ def get_pnb_option_chain_status():
 
 
 @app.route('/api/pnb/status')
+@cached_response([snapshot_cache_tag("PNB")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_pnb_status():
     """API endpoint to get PNB option chain scheduler status"""
     status = get_pnb_option_chain_status()
@@ -4217,7 +4552,6 @@ def api_pnb_data():
     """API endpoint to get collected PNB option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("PNB")
         if collection is None:
@@ -4227,11 +4561,12 @@ def api_pnb_data():
                 "error": "Collection not found for PNB"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -4239,13 +4574,12 @@ def api_pnb_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -4253,19 +4587,17 @@ def api_pnb_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -4277,7 +4609,7 @@ def api_pnb_data():
 def api_pnb_expiry():
     """API endpoint to get current PNB expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("PNB")
         collector.close()
         
@@ -4304,6 +4636,7 @@ def api_pnb_expiry():
 
 
 @app.route('/api/pnb/stats')
+@cached_response([snapshot_cache_tag("PNB")])
 def api_pnb_stats():
     """API endpoint to get PNB option chain statistics"""
     try:
@@ -4401,7 +4734,8 @@ def api_pnb_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -4425,10 +4759,13 @@ def api_pnb_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -4496,6 +4833,7 @@ def get_canbk_option_chain_status():
 
 
 @app.route('/api/canbk/status')
+@cached_response([snapshot_cache_tag("CANBK")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_canbk_status():
     """API endpoint to get CANBK option chain scheduler status"""
     status = get_canbk_option_chain_status()
@@ -4508,7 +4846,6 @@ def api_canbk_data():
     """API endpoint to get collected CANBK option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("CANBK")
         if collection is None:
@@ -4518,11 +4855,12 @@ def api_canbk_data():
                 "error": "Collection not found for CANBK"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -4530,13 +4868,12 @@ def api_canbk_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -4544,19 +4881,17 @@ def api_canbk_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -4568,7 +4903,7 @@ def api_canbk_data():
 def api_canbk_expiry():
     """API endpoint to get current CANBK expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("CANBK")
         collector.close()
         
@@ -4595,6 +4930,7 @@ def api_canbk_expiry():
 
 
 @app.route('/api/canbk/stats')
+@cached_response([snapshot_cache_tag("CANBK")])
 def api_canbk_stats():
     """API endpoint to get CANBK option chain statistics"""
     try:
@@ -4692,7 +5028,8 @@ def api_canbk_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -4716,10 +5053,13 @@ def api_canbk_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -4787,6 +5127,7 @@ def get_aubank_option_chain_status():
 
 
 @app.route('/api/aubank/status')
+@cached_response([snapshot_cache_tag("AUBANK")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_aubank_status():
     """API endpoint to get AUBANK option chain scheduler status"""
     status = get_aubank_option_chain_status()
@@ -4799,7 +5140,6 @@ def api_aubank_data():
     """API endpoint to get collected AUBANK option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("AUBANK")
         if collection is None:
@@ -4809,11 +5149,12 @@ def api_aubank_data():
                 "error": "Collection not found for AUBANK"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -4821,13 +5162,12 @@ def api_aubank_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -4835,19 +5175,17 @@ def api_aubank_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -4859,7 +5197,7 @@ def api_aubank_data():
 def api_aubank_expiry():
     """API endpoint to get current AUBANK expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("AUBANK")
         collector.close()
         
@@ -4886,6 +5224,7 @@ def api_aubank_expiry():
 
 
 @app.route('/api/aubank/stats')
+@cached_response([snapshot_cache_tag("AUBANK")])
 def api_aubank_stats():
     """API endpoint to get AUBANK option chain statistics"""
     try:
@@ -4983,7 +5322,8 @@ def api_aubank_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -5007,10 +5347,13 @@ def api_aubank_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -5078,6 +5421,7 @@ def get_indusindbk_option_chain_status():
 
 
 @app.route('/api/indusindbk/status')
+@cached_response([snapshot_cache_tag("INDUSINDBK")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_indusindbk_status():
     """API endpoint to get INDUSINDBK option chain scheduler status"""
     status = get_indusindbk_option_chain_status()
@@ -5090,7 +5434,6 @@ def api_indusindbk_data():
     """API endpoint to get collected INDUSINDBK option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("INDUSINDBK")
         if collection is None:
@@ -5100,11 +5443,12 @@ def api_indusindbk_data():
                 "error": "Collection not found for INDUSINDBK"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -5112,13 +5456,12 @@ def api_indusindbk_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -5126,19 +5469,17 @@ def api_indusindbk_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -5150,7 +5491,7 @@ def api_indusindbk_data():
 def api_indusindbk_expiry():
     """API endpoint to get current INDUSINDBK expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("INDUSINDBK")
         collector.close()
         
@@ -5177,6 +5518,7 @@ def api_indusindbk_expiry():
 
 
 @app.route('/api/indusindbk/stats')
+@cached_response([snapshot_cache_tag("INDUSINDBK")])
 def api_indusindbk_stats():
     """API endpoint to get INDUSINDBK option chain statistics"""
     try:
@@ -5274,7 +5616,8 @@ def api_indusindbk_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -5298,10 +5641,13 @@ def api_indusindbk_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -5369,6 +5715,7 @@ def get_idfcfirstb_option_chain_status():
 
 
 @app.route('/api/idfcfirstb/status')
+@cached_response([snapshot_cache_tag("IDFCFIRSTB")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_idfcfirstb_status():
     """API endpoint to get IDFCFIRSTB option chain scheduler status"""
     status = get_idfcfirstb_option_chain_status()
@@ -5381,7 +5728,6 @@ def api_idfcfirstb_data():
     """API endpoint to get collected IDFCFIRSTB option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("IDFCFIRSTB")
         if collection is None:
@@ -5391,11 +5737,12 @@ def api_idfcfirstb_data():
                 "error": "Collection not found for IDFCFIRSTB"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -5403,13 +5750,12 @@ def api_idfcfirstb_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -5417,19 +5763,17 @@ def api_idfcfirstb_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -5441,7 +5785,7 @@ def api_idfcfirstb_data():
 def api_idfcfirstb_expiry():
     """API endpoint to get current IDFCFIRSTB expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("IDFCFIRSTB")
         collector.close()
         
@@ -5468,6 +5812,7 @@ def api_idfcfirstb_expiry():
 
 
 @app.route('/api/idfcfirstb/stats')
+@cached_response([snapshot_cache_tag("IDFCFIRSTB")])
 def api_idfcfirstb_stats():
     """API endpoint to get IDFCFIRSTB option chain statistics"""
     try:
@@ -5565,7 +5910,8 @@ def api_idfcfirstb_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -5589,10 +5935,13 @@ def api_idfcfirstb_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -5660,6 +6009,7 @@ def get_federalbnk_option_chain_status():
 
 
 @app.route('/api/federalbnk/status')
+@cached_response([snapshot_cache_tag("FEDERALBNK")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_federalbnk_status():
     """API endpoint to get FEDERALBNK option chain scheduler status"""
     status = get_federalbnk_option_chain_status()
@@ -5672,7 +6022,6 @@ def api_federalbnk_data():
     """API endpoint to get collected FEDERALBNK option chain data with pagination"""
     try:
         page, limit = get_pagination_params()
-        skip = (page - 1) * limit
         
         collector, collection = get_bank_collection("FEDERALBNK")
         if collection is None:
@@ -5682,11 +6031,12 @@ def api_federalbnk_data():
                 "error": "Collection not found for FEDERALBNK"
             }), 404
         
-        # Get total count
-        total_count = collection.count_documents({})
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find().sort("records.timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, {}, "records.timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=OPTION_CHAIN_LIST_PROJECTION
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -5694,13 +6044,12 @@ def api_federalbnk_data():
             records_data = record.get("records", {})
             timestamp = records_data.get("timestamp") if isinstance(records_data, dict) else None
             underlying_value = records_data.get("underlyingValue") if isinstance(records_data, dict) else None
-            data_array = records_data.get("data", []) if isinstance(records_data, dict) else []
             
             record_dict = {
                 "_id": str(record.get("_id")),
                 "timestamp": timestamp,
                 "underlyingValue": underlying_value,
-                "dataCount": len(data_array) if isinstance(data_array, list) else 0,
+                "dataCount": record.get("dataCount", 0),
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -5708,19 +6057,17 @@ def api_federalbnk_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -5732,7 +6079,7 @@ def api_federalbnk_data():
 def api_federalbnk_expiry():
     """API endpoint to get current FEDERALBNK expiry date"""
     try:
-        collector = NSEAllBanksOptionChainCollector()
+        collector = get_shared_collector(NSEAllBanksOptionChainCollector)
         expiry = collector._fetch_expiry_dates_with_retry("FEDERALBNK")
         collector.close()
         
@@ -5759,6 +6106,7 @@ def api_federalbnk_expiry():
 
 
 @app.route('/api/federalbnk/stats')
+@cached_response([snapshot_cache_tag("FEDERALBNK")])
 def api_federalbnk_stats():
     """API endpoint to get FEDERALBNK option chain statistics"""
     try:
@@ -5856,7 +6204,8 @@ def api_federalbnk_data_by_id(record_id):
         
         if request.method == 'GET':
             # Get the full record
-            record = collection.find_one({"_id": ObjectId(record_id)})
+            # Rebuilds delta-encoded snapshots transparently
+            record = get_delta_store().find_snapshot(collection, {"_id": ObjectId(record_id)})
             collector.close()
             
             if not record:
@@ -5880,10 +6229,13 @@ def api_federalbnk_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            deleted_count = get_delta_store().delete_snapshot(collection, ObjectId(record_id))
             collector.close()
             
-            if result.deleted_count == 0:
+            if deleted_count == 0:
                 return jsonify({
                     "success": False,
                     "error": "Record not found"
@@ -5991,6 +6343,7 @@ def get_gainers_status():
 
 
 @app.route('/api/gainers/status')
+@cached_response([snapshot_cache_tag("gainers")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_gainers_status():
     """API endpoint to get gainers scheduler status"""
     status = get_gainers_status()
@@ -6018,7 +6371,6 @@ def api_gainers_data():
             else:
                 query_filter["timestamp"] = {"$lte": end_date}
         
-        skip = (page - 1) * limit
         
         collector, collection = get_gainers_collection()
         if collection is None:
@@ -6028,36 +6380,22 @@ def api_gainers_data():
                 "error": "Collection not found for gainers"
             }), 404
         
-        # Get total count with filter
-        total_count = collection.count_documents(query_filter)
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find(query_filter).sort("timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, query_filter, "timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=MARKET_MOVERS_LIST_PROJECTION
+        )
         
-        # Convert ObjectId to string and format dates
+        # Convert ObjectId to string and format dates (sections are counted by the projection)
         data = []
         for record in records:
-            timestamp = record.get("timestamp")
-            
-            # Calculate counts from sections
-            nifty_count = 0
-            banknifty_count = 0
-            legends_count = 0
-            
-            if isinstance(record.get("NIFTY"), dict) and isinstance(record.get("NIFTY").get("data"), list):
-                nifty_count = len(record.get("NIFTY", {}).get("data", []))
-            if isinstance(record.get("BANKNIFTY"), dict) and isinstance(record.get("BANKNIFTY").get("data"), list):
-                banknifty_count = len(record.get("BANKNIFTY", {}).get("data", []))
-            if isinstance(record.get("legends"), list):
-                legends_count = len(record.get("legends", []))
-            
             record_dict = {
                 "_id": str(record.get("_id")),
-                "timestamp": timestamp,
-                "nifty_count": nifty_count,
-                "banknifty_count": banknifty_count,
+                "timestamp": record.get("timestamp"),
+                "nifty_count": record.get("nifty_count", 0),
+                "banknifty_count": record.get("banknifty_count", 0),
                 "legends": record.get("legends", []),
-                "data": {k: (str(v) if isinstance(v, ObjectId) else v) for k, v in record.items()},  # Keep full data for detail view (with ObjectId converted)
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -6065,19 +6403,17 @@ def api_gainers_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -6086,6 +6422,7 @@ def api_gainers_data():
 
 
 @app.route('/api/gainers/stats')
+@cached_response([snapshot_cache_tag("gainers")])
 def api_gainers_stats():
     """API endpoint to get gainers statistics"""
     try:
@@ -6140,7 +6477,7 @@ def api_gainers_trigger():
     collector = None
     try:
         logger.info("Manual trigger for gainers data collection initiated")
-        collector = NSEGainersLosersCollector()
+        collector = get_shared_collector(NSEGainersLosersCollector)
         success = collector.collect_and_save_single("gainers")
         
         if success:
@@ -6224,7 +6561,10 @@ def api_gainers_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            result = delete_record(collection, record_id)
             collector.close()
             
             if result.deleted_count == 0:
@@ -6335,6 +6675,7 @@ def get_losers_status():
 
 
 @app.route('/api/losers/status')
+@cached_response([snapshot_cache_tag("losers")], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_losers_status():
     """API endpoint to get losers scheduler status"""
     status = get_losers_status()
@@ -6362,7 +6703,6 @@ def api_losers_data():
             else:
                 query_filter["timestamp"] = {"$lte": end_date}
         
-        skip = (page - 1) * limit
         
         collector, collection = get_losers_collection()
         if collection is None:
@@ -6372,36 +6712,22 @@ def api_losers_data():
                 "error": "Collection not found for losers"
             }), 404
         
-        # Get total count with filter
-        total_count = collection.count_documents(query_filter)
-        
-        # Get paginated records sorted by timestamp (newest first)
-        records = list(collection.find(query_filter).sort("timestamp", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by timestamp (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collection, query_filter, "timestamp", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'),
+            projection=MARKET_MOVERS_LIST_PROJECTION
+        )
         
-        # Convert ObjectId to string and format dates
+        # Convert ObjectId to string and format dates (sections are counted by the projection)
         data = []
         for record in records:
-            timestamp = record.get("timestamp")
-            
-            # Calculate counts from sections
-            nifty_count = 0
-            banknifty_count = 0
-            legends_count = 0
-            
-            if isinstance(record.get("NIFTY"), dict) and isinstance(record.get("NIFTY").get("data"), list):
-                nifty_count = len(record.get("NIFTY", {}).get("data", []))
-            if isinstance(record.get("BANKNIFTY"), dict) and isinstance(record.get("BANKNIFTY").get("data"), list):
-                banknifty_count = len(record.get("BANKNIFTY", {}).get("data", []))
-            if isinstance(record.get("legends"), list):
-                legends_count = len(record.get("legends", []))
-            
             record_dict = {
                 "_id": str(record.get("_id")),
-                "timestamp": timestamp,
-                "nifty_count": nifty_count,
-                "banknifty_count": banknifty_count,
+                "timestamp": record.get("timestamp"),
+                "nifty_count": record.get("nifty_count", 0),
+                "banknifty_count": record.get("banknifty_count", 0),
                 "legends": record.get("legends", []),
-                "data": {k: (str(v) if isinstance(v, ObjectId) else v) for k, v in record.items()},  # Keep full data for detail view (with ObjectId converted)
                 "insertedAt": format_datetime_for_json(record.get("insertedAt"), is_utc=True),
                 "updatedAt": format_datetime_for_json(record.get("updatedAt"), is_utc=True)
             }
@@ -6409,19 +6735,17 @@ def api_losers_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -6430,6 +6754,7 @@ def api_losers_data():
 
 
 @app.route('/api/losers/stats')
+@cached_response([snapshot_cache_tag("losers")])
 def api_losers_stats():
     """API endpoint to get losers statistics"""
     try:
@@ -6484,7 +6809,7 @@ def api_losers_trigger():
     collector = None
     try:
         logger.info("Manual trigger for losers data collection initiated")
-        collector = NSEGainersLosersCollector()
+        collector = get_shared_collector(NSEGainersLosersCollector)
         success = collector.collect_and_save_single("losers")
         
         if success:
@@ -6563,7 +6888,10 @@ def api_losers_data_by_id(record_id):
             })
         
         elif request.method == 'DELETE':
-            result = collection.delete_one({"_id": ObjectId(record_id)})
+            if is_timeseries_backend():
+                collector.close()
+                return snapshot_delete_unsupported()
+            result = delete_record(collection, record_id)
             collector.close()
             
             if result.deleted_count == 0:
@@ -6630,6 +6958,7 @@ def get_news_collector_status():
 
 
 @app.route('/api/news/status')
+@cached_response([NEWS_COLLECTION_NAME], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_news_status():
     """API endpoint to get news collector scheduler status"""
     status = get_news_collector_status()
@@ -6657,15 +6986,14 @@ def api_news_data():
             else:
                 query_filter["date"] = {"$lte": end_date}
         
-        skip = (page - 1) * limit
         
-        collector = NSENewsCollector()
+        collector = get_shared_collector(NSENewsCollector)
         
-        # Get total count with filter
-        total_count = collector.collection.count_documents(query_filter)
-        
-        # Get paginated records sorted by pub_date (newest first)
-        records = list(collector.collection.find(query_filter).sort("pub_date", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by pub_date (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collector.collection, query_filter, "pub_date", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'), unique_sort=False
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -6685,19 +7013,17 @@ def api_news_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -6706,10 +7032,11 @@ def api_news_data():
 
 
 @app.route('/api/news/stats')
+@cached_response([NEWS_COLLECTION_NAME])
 def api_news_stats():
     """API endpoint to get news statistics"""
     try:
-        collector = NSENewsCollector()
+        collector = get_shared_collector(NSENewsCollector)
         
         total_count = collector.collection.count_documents({})
         
@@ -6760,7 +7087,7 @@ def api_news_trigger():
     """API endpoint to manually trigger news collection"""
     try:
         
-        collector = NSENewsCollector()
+        collector = get_shared_collector(NSENewsCollector)
         success = collector.collect_and_save()
         collector.close()
         
@@ -6789,7 +7116,7 @@ def api_news_trigger():
 def api_delete_news_data(record_id):
     """API endpoint to delete a specific news record"""
     try:
-        collector = NSENewsCollector()
+        collector = get_shared_collector(NSENewsCollector)
         
         if not ObjectId.is_valid(record_id):
             collector.close()
@@ -6799,7 +7126,7 @@ def api_delete_news_data(record_id):
             }), 400
         
         elif request.method == 'DELETE':
-            result = collector.collection.delete_one({"_id": ObjectId(record_id)})
+            result = delete_record(collector.collection, record_id)
             collector.close()
             
             if result.deleted_count == 0:
@@ -6870,6 +7197,7 @@ def get_livemint_news_collector_status():
 
 @app.route('/api/livemint-news/status')
 @token_required
+@cached_response([LIVEMINT_NEWS_COLLECTION_NAME], ttl_seconds=RESPONSE_CACHE_STATUS_TTL_SECONDS)
 def api_livemint_news_status():
     """API endpoint to get LiveMint news collector scheduler status"""
     status = get_livemint_news_collector_status()
@@ -6897,15 +7225,14 @@ def api_livemint_news_data():
             else:
                 query_filter["date"] = {"$lte": end_date}
         
-        skip = (page - 1) * limit
         
-        collector = NSELiveMintNewsCollector()
+        collector = get_shared_collector(NSELiveMintNewsCollector)
         
-        # Get total count with filter
-        total_count = collector.collection.count_documents(query_filter)
-        
-        # Get paginated records sorted by pub_date (newest first)
-        records = list(collector.collection.find(query_filter).sort("pub_date", -1).skip(skip).limit(limit))
+        # Get paginated records sorted by pub_date (newest first); ?cursor= switches to keyset pagination
+        records, page_info = paginate(
+            collector.collection, query_filter, "pub_date", page, limit,
+            cursor=request.args.get('cursor'), total=request.args.get('total'), unique_sort=False
+        )
         
         # Convert ObjectId to string and format dates
         data = []
@@ -6927,19 +7254,17 @@ def api_livemint_news_data():
         
         collector.close()
         
-        total_pages = (total_count + limit - 1) // limit
-        
         return jsonify({
             "success": True,
             "count": len(data),
-            "total": total_count,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+            **page_info,
             "data": data
         })
+    except InvalidCursorError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             "success": False,
@@ -6949,10 +7274,11 @@ def api_livemint_news_data():
 
 @app.route('/api/livemint-news/stats')
 @token_required
+@cached_response([LIVEMINT_NEWS_COLLECTION_NAME])
 def api_livemint_news_stats():
     """API endpoint to get LiveMint news statistics"""
     try:
-        collector = NSELiveMintNewsCollector()
+        collector = get_shared_collector(NSELiveMintNewsCollector)
         
         total_count = collector.collection.count_documents({})
         
@@ -6992,7 +7318,7 @@ def api_livemint_news_stats():
 def api_livemint_news_trigger():
     """API endpoint to manually trigger LiveMint news collection"""
     try:
-        collector = NSELiveMintNewsCollector()
+        collector = get_shared_collector(NSELiveMintNewsCollector)
         success = collector.collect_and_save()
         collector.close()
         
@@ -7021,7 +7347,7 @@ def api_livemint_news_trigger():
 def api_delete_livemint_news_data(record_id):
     """API endpoint to delete a specific LiveMint news record"""
     try:
-        collector = NSELiveMintNewsCollector()
+        collector = get_shared_collector(NSELiveMintNewsCollector)
         
         if not ObjectId.is_valid(record_id):
             collector.close()
@@ -7031,7 +7357,7 @@ def api_delete_livemint_news_data(record_id):
             }), 400
         
         elif request.method == 'DELETE':
-            result = collector.collection.delete_one({"_id": ObjectId(record_id)})
+            result = delete_record(collector.collection, record_id)
             collector.close()
             
             if result.deleted_count == 0:
@@ -7204,6 +7530,7 @@ def api_remove_holiday(validated_data):
 # Global variable to track scheduler threads
 _scheduler_threads = []
 _scheduler_watchdog_thread = None
+_schema_bootstrap_thread = None
 _scheduler_config = [
     ('cronjob_scheduler', 'FII/DII Data Collector'),
     ('all_indices_option_chain_scheduler', 'All Indices Option Chain Collector (4 indices)'),
@@ -7214,9 +7541,18 @@ _scheduler_config = [
     ('livemint_news_scheduler', 'LiveMint News Collector'),
 ]
 
+def wait_for_schema_bootstrap():
+    """Block until the startup schema bootstrap has finished (collectors must not write before the unique and TTL indexes exist)"""
+    thread = _schema_bootstrap_thread
+    if thread is not None and thread.is_alive():
+        get_logger(__name__).info("Waiting for the schema bootstrap to finish before collecting...")
+        thread.join()
+
 def run_scheduler_in_thread(module_name, scheduler_name, max_retries=3, retry_delay=30):
     """Run scheduler in a separate thread with auto-restart on failure"""
     def scheduler_worker():
+        # Requests are served meanwhile; only the collectors wait for the indexes
+        wait_for_schema_bootstrap()
         retry_count = 0
         while retry_count < max_retries:
             try:
@@ -7483,6 +7819,11 @@ def api_schedulers_status():
         }), 500
 
 
+# Create or verify MongoDB indexes once per startup (collectors never issue DDL themselves)
+# Runs in the background so a long index build does not delay serving requests;
+# scheduler threads wait for it before their first write (wait_for_schema_bootstrap)
+_schema_bootstrap_thread = start_schema_bootstrap_in_background()
+
 # Auto-start schedulers when module is imported (if enabled)
 # This allows schedulers to start even when using WSGI servers
 # Set AUTO_START_SCHEDULERS=false in .env to disable
@@ -12,6 +12,7 @@ from datetime import datetime, time as dt_time, timedelta, date, timezone
 from scheduler_config import get_config_for_scheduler, is_holiday
 from timezone_utils import get_ist_now, now_for_mongo
 from logger_config import get_logger
+from option_chain_rollups import update_rollups
 import json
 import os
 
@@ -29,7 +30,9 @@ def get_scheduler_config():
         "interval_minutes": 3,
         "start_time": "09:15",
         "end_time": "15:30",
-        "enabled": True
+        "enabled": True,
+        "max_workers": 6,
+        "expiry_count": 1
     }
 
 STATUS_FILE = 'all_banks_option_chain_scheduler_status.json'
@@ -84,6 +87,17 @@ def is_market_hours(now: datetime) -> bool:
     return True
 
 
+# Long-lived collector reused across cycles (backed by the shared MongoDB pool)
+_collector = None
+
+def get_collector() -> NSEAllBanksOptionChainCollector:
+    """Get the scheduler's collector, creating it on first use"""
+    global _collector
+    if _collector is None:
+        _collector = NSEAllBanksOptionChainCollector()
+    return _collector
+
+
 def run_collector():
     """Execute the collector for all banks"""
     global last_run_time
@@ -99,7 +113,6 @@ def run_collector():
     interval_minutes = config.get("interval_minutes", 3)
     min_interval_seconds = interval_minutes * 60 - 10  # Allow 10 seconds buffer
     
-    collector = None
     try:
         if last_run_time:
             time_since_last_run = (now_ist - last_run_time).total_seconds()
@@ -121,13 +134,20 @@ def run_collector():
         logger.debug("=" * 60)
         
         last_run_time = now_ist
-        collector = NSEAllBanksOptionChainCollector()
-        results = collector.collect_and_save_all_banks()
+        collector = get_collector()
+        results = collector.collect_and_save_all_banks(
+            max_workers=config.get("max_workers"),
+            expiry_count=config.get("expiry_count")
+        )
         
         # Count successes and failures
         successful = sum(1 for success in results.values() if success)
         failed = len(results) - successful
         
+        # Fold this cycle's summaries into the 5m / 15m / daily rollups
+        if successful > 0:
+            update_rollups(collector.db, [symbol for symbol, success in results.items() if success])
+        
         if successful == len(BANKS):
             logger.debug(f"All Banks Option Chain Cronjob completed successfully - All {len(BANKS)} banks collected")
             overall_status = "success"
@@ -173,8 +193,6 @@ def run_collector():
         except:
             pass
     finally:
-        if collector:
-            collector.close()
         # Always release the lock, even if we returned early or had an error
         # This ensures the scheduler can restart after crashes or errors
         execution_lock.release()
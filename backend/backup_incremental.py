@@ -0,0 +1,268 @@
+"""
+Incremental backups
+Records a per-collection high-water mark after every backup and exports only documents added or
+updated since the previous one; each backup names its parent, so a restore replays a chain:
+    full (base) -> incremental -> incremental -> ...
+
+High-water key per collection:
+    updatedAt  when the collection has an updatedAt index (collections updated in place: every write,
+               rewrites included, refreshes updatedAt)
+    _id        otherwise (ObjectIds grow with insertion time)
+    full       collections without ObjectId _id or updatedAt (small state collections, exported whole)
+Each increment re-reads BACKUP_CHECKPOINT_OVERLAP_SECONDS before the previous mark, so documents
+written by other processes with slightly older ids are never missed (a restore skips the duplicates)
+
+Deletes leave no document behind, so every delete path (delete_snapshot, the admin delete endpoints)
+records tombstones with record_deletions; the tombstone collection is backed up like any other and a
+restore replays the deletes of each archive. A delete that skips record_deletions survives a restore
+of the chain.
+Tombstones expire after BACKUP_TOMBSTONE_RETENTION_DAYS, longer than any restore chain should span.
+
+Tombstone layout:
+    {"_id": ObjectId, "collection": <name>, "docId": <deleted _id>, "deletedAt"}
+
+Checkpoint layout (one document per completed backup):
+    {"_id": <backup id>, "type": "full" | "incremental", "parent": <backup id>, "base": <backup id>,
+     "format", "createdAt", "completedAt", "status": "running" | "complete",
+     "collections": {<name>: {"key", "since", "high"}}}
+
+Usage:
+    python backup_incremental.py --mode incremental --output /backups/nse_data_<id>.zip [--format ndjson]
+"""
+
+import argparse
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import pymongo
+from bson import ObjectId
+from dotenv import load_dotenv
+from backup_stream import list_backup_collections, stream_backup
+from timezone_utils import now_for_mongo
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Checkpoint configuration
+BACKUP_CHECKPOINTS_COLLECTION_NAME = os.getenv('MONGO_BACKUP_CHECKPOINTS_COLLECTION_NAME', '_backup_checkpoints')
+BACKUP_CHECKPOINT_OVERLAP_SECONDS = int(os.getenv('BACKUP_CHECKPOINT_OVERLAP_SECONDS', 120))
+BACKUP_TOMBSTONES_COLLECTION_NAME = os.getenv('MONGO_BACKUP_TOMBSTONES_COLLECTION_NAME', '_backup_tombstones')
+BACKUP_TOMBSTONE_RETENTION_DAYS = int(os.getenv('BACKUP_TOMBSTONE_RETENTION_DAYS', 90))
+
+BACKUP_MODES = ("full", "incremental")
+
+KEY_UPDATED_AT = "updatedAt"
+KEY_ID = "_id"
+KEY_FULL = "full"
+
+
+@dataclass
+class BackupPlan:
+    """What a backup exports and the checkpoint it records once complete"""
+    backup_id: str
+    backup_type: str
+    parent: Optional[str]
+    base: str
+    backup_format: str
+    collections: List[str]
+    queries: Dict[str, Dict] = field(default_factory=dict)
+    checkpoints: Dict[str, Dict] = field(default_factory=dict)
+
+    @property
+    def metadata(self) -> Dict:
+        """Fields added to backup_metadata.json"""
+        return {
+            "backup_id": self.backup_id,
+            "backup_type": self.backup_type,
+            "parent": self.parent,
+            "base": self.base,
+            "checkpoints": self.checkpoints
+        }
+
+
+def _high_water_key(collection) -> str:
+    """Pick the high-water key of a collection"""
+    if any(spec["key"][0][0] == KEY_UPDATED_AT for spec in collection.index_information().values()):
+        return KEY_UPDATED_AT
+    latest = collection.find_one({}, {"_id": 1}, sort=[("_id", pymongo.DESCENDING)])
+    if latest is None or isinstance(latest["_id"], ObjectId):
+        return KEY_ID
+    return KEY_FULL
+
+
+def _high_water_value(collection, key: str):
+    """Current maximum of a collection's high-water key (None if empty or exported whole)"""
+    if key == KEY_FULL:
+        return None
+    latest = collection.find_one({key: {"$exists": True}}, {key: 1}, sort=[(key, pymongo.DESCENDING)])
+    return latest.get(key) if latest else None
+
+
+def _since_query(key: str, since) -> Optional[Dict]:
+    """Filter selecting documents newer than a previous mark, minus the overlap window"""
+    if since is None or key == KEY_FULL:
+        return None
+    overlap = timedelta(seconds=BACKUP_CHECKPOINT_OVERLAP_SECONDS)
+    if key == KEY_ID:
+        return {"_id": {"$gt": ObjectId.from_datetime(since.generation_time - overlap)}}
+    return {key: {"$gt": since - overlap}}
+
+
+def record_deletions(db, collection_name: str, ids: List):
+    """
+    Record deleted documents so the next incremental backup carries the deletes
+    Never raises: a missing tombstone only leaves the document in restores of later backups
+    Args:
+        db: pymongo Database the collection lives in
+        collection_name: Collection the documents were deleted from
+        ids: _id of each deleted document
+    """
+    if not ids:
+        return
+    try:
+        now = now_for_mongo()
+        db[BACKUP_TOMBSTONES_COLLECTION_NAME].insert_many([
+            {"collection": collection_name, "docId": doc_id, "deletedAt": now}
+            for doc_id in ids
+        ], ordered=False)
+    except Exception as e:
+        logger.warning(f"Failed to record {len(ids)} deletions from {collection_name}: {str(e)}")
+
+
+def get_last_checkpoint(db) -> Optional[Dict]:
+    """Get the most recent completed backup checkpoint"""
+    return db[BACKUP_CHECKPOINTS_COLLECTION_NAME].find_one({"status": "complete"}, sort=[("createdAt", pymongo.DESCENDING)])
+
+
+def plan_backup(db, collections: List[str], mode: str = "full", backup_format: str = "ndjson") -> BackupPlan:
+    """
+    Plan a full or incremental backup and register it as running
+    An incremental backup without a completed predecessor becomes a full one
+    Args:
+        db: pymongo Database
+        collections: Names of the collections to export
+        mode: 'full' or 'incremental'
+        backup_format: 'ndjson' or 'bson'
+    Returns: BackupPlan with per-collection queries and the marks to record
+    """
+    parent = get_last_checkpoint(db) if mode == "incremental" else None
+    backup_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    plan = BackupPlan(
+        backup_id=backup_id,
+        backup_type="incremental" if parent else "full",
+        parent=parent["_id"] if parent else None,
+        base=parent["base"] if parent else backup_id,
+        backup_format=backup_format,
+        collections=collections
+    )
+
+    previous = parent.get("collections", {}) if parent else {}
+    for collection_name in collections:
+        collection = db[collection_name]
+        key = _high_water_key(collection)
+        prior = previous.get(collection_name)
+        since = prior["high"] if prior and prior.get("key") == key else None
+        # Take the mark before exporting: anything written during the export is re-read next time
+        high = _high_water_value(collection, key)
+        plan.checkpoints[collection_name] = {"key": key, "since": since, "high": high if high is not None else since}
+        query = _since_query(key, since) if plan.backup_type == "incremental" else None
+        if query:
+            plan.queries[collection_name] = query
+
+    db[BACKUP_CHECKPOINTS_COLLECTION_NAME].insert_one({
+        "_id": plan.backup_id,
+        "type": plan.backup_type,
+        "parent": plan.parent,
+        "base": plan.base,
+        "format": backup_format,
+        "collections": plan.checkpoints,
+        "status": "running",
+        "createdAt": now_for_mongo()
+    })
+    logger.info(f"Planned {plan.backup_type} backup {plan.backup_id} (parent: {plan.parent}, base: {plan.base})")
+    return plan
+
+
+def complete_backup(db, plan: BackupPlan, manifest: Optional[Dict] = None):
+    """
+    Mark a backup complete, making it the parent of the next incremental backup
+    A collection whose export failed keeps its previous mark, so the next increment exports it again
+    (a full backup's failed collections are exported whole)
+    """
+    for collection_name in (manifest or {}).get("errors", {}):
+        checkpoint = plan.checkpoints.get(collection_name)
+        if checkpoint is not None:
+            checkpoint["high"] = checkpoint["since"]
+    db[BACKUP_CHECKPOINTS_COLLECTION_NAME].update_one(
+        {"_id": plan.backup_id},
+        {"$set": {
+            "status": "complete",
+            "completedAt": now_for_mongo(),
+            "manifest": manifest,
+            "collections": plan.checkpoints
+        }}
+    )
+
+
+def get_backup_chain(db, backup_id: Optional[str] = None) -> List[Dict]:
+    """
+    Get the checkpoints needed to restore a backup, base first
+    Args:
+        db: pymongo Database
+        backup_id: Last backup of the chain (None for the most recent completed one)
+    Returns: Checkpoints from the full base backup to backup_id
+    """
+    checkpoints = db[BACKUP_CHECKPOINTS_COLLECTION_NAME]
+    current = checkpoints.find_one({"_id": backup_id}) if backup_id else get_last_checkpoint(db)
+    chain = []
+    while current is not None:
+        chain.append(current)
+        if not current.get("parent"):
+            break
+        current = checkpoints.find_one({"_id": current["parent"]})
+    return list(reversed(chain))
+
+
+def iter_planned_backup(db, plan: BackupPlan):
+    """Stream a planned backup's zip bytes and record its checkpoint once the last byte is produced"""
+    manifest = yield from stream_backup(db, plan.collections, plan.backup_format, queries=plan.queries, metadata=plan.metadata)
+    complete_backup(db, plan, manifest)
+    logger.info(f"Completed {plan.backup_type} backup {plan.backup_id}")
+
+
+def main():
+    """Command line entry point (e.g. a nightly cron job)"""
+    from mongo_pool import get_mongo_db
+
+    parser = argparse.ArgumentParser(description="Write a full or incremental backup archive")
+    parser.add_argument("--mode", choices=BACKUP_MODES, default="incremental", help="Backup mode")
+    parser.add_argument("--format", choices=("ndjson", "bson"), default="ndjson", help="Collection entry format")
+    parser.add_argument("--output", required=True, help="Path of the zip file to write")
+    parser.add_argument("--chain", action="store_true", help="Print the restore chain of the latest backup and exit")
+    args = parser.parse_args()
+
+    _, db = get_mongo_db()
+    if args.chain:
+        for checkpoint in get_backup_chain(db):
+            print(f"{checkpoint['_id']}  {checkpoint['type']}")
+        sys.exit(0)
+
+    collections = list_backup_collections(db)
+    plan = plan_backup(db, collections, args.mode, args.format)
+    temp_path = f"{args.output}.tmp"
+    with open(temp_path, "wb") as output:
+        for chunk in iter_planned_backup(db, plan):
+            output.write(chunk)
+    os.replace(temp_path, args.output)
+    print(f"Wrote {plan.backup_type} backup {plan.backup_id} to {args.output}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Asynchronous backup and restore jobs
+Runs a backup in a background thread that writes the archive to BACKUP_DIR, with progress stored
+in MongoDB so any admin panel worker can report it; the finished file is downloaded separately
+(with HTTP Range support, so a broken download resumes instead of starting over)
+Restores of archives in BACKUP_DIR run the same way, their result stored on the job once done;
+one job, backup or restore, runs at a time
+
+Job layout:
+    backup:  {"_id": <backup id>, "kind": "backup", "status": "running" | "complete" | "failed", "mode",
+              "format", "backupType", "filename", "bytes", "documents", "currentCollection",
+              "collectionsDone", "totalCollections", "startedAt", "heartbeatAt", "completedAt", "error"}
+    restore: {"_id": "restore_<timestamp>", "kind": "restore", "status", "archives", "drop", "collections",
+              "documents", "archivesDone", "totalArchives", "collectionErrors", "result",
+              "startedAt", "heartbeatAt", "completedAt", "error"}
+"""
+
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+import pymongo
+from dotenv import load_dotenv
+from backup_stream import BACKUP_DIR, list_backup_collections, write_backup_file
+from backup_incremental import plan_backup, complete_backup
+from backup_restore import RESTORE_WORKERS, list_collection_entries, restore_chain
+from timezone_utils import now_for_mongo
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Job configuration
+BACKUP_JOBS_COLLECTION_NAME = os.getenv('MONGO_BACKUP_JOBS_COLLECTION_NAME', '_backup_jobs')
+BACKUP_JOB_PROGRESS_SECONDS = 2  # Minimum interval between progress writes
+BACKUP_JOB_STALE_SECONDS = 300  # A running job without a heartbeat for this long is considered dead
+BACKUP_JOB_HEARTBEAT_SECONDS = 30  # Heartbeat of restore jobs (progress is only known per archive)
+
+JOB_ID_PATTERN = re.compile(r'^(restore_)?\d{8}_\d{6}$')
+
+KIND_BACKUP = "backup"
+KIND_RESTORE = "restore"
+
+STATUS_RUNNING = "running"
+STATUS_COMPLETE = "complete"
+STATUS_FAILED = "failed"
+
+
+def is_valid_job_id(job_id: str) -> bool:
+    """Check if a string looks like a backup or restore job id"""
+    return bool(JOB_ID_PATTERN.match(job_id or ""))
+
+
+def _job_response(job: Dict) -> Dict:
+    """Job document as returned by the API"""
+    response = {key: value for key, value in job.items() if key != "_id"}
+    response["job_id"] = job["_id"]
+    return response
+
+
+class BackupJobs:
+    """Starts backup and restore jobs and tracks their progress"""
+
+    def __init__(self, db, backup_dir: str = BACKUP_DIR):
+        """
+        Args:
+            db: pymongo Database to back up and restore into (job documents are stored in it as well)
+            backup_dir: Directory the archives are written to and restored from
+        """
+        self.db = db
+        self.backup_dir = backup_dir
+        self.collection = db[BACKUP_JOBS_COLLECTION_NAME]
+        self._lock = threading.Lock()
+
+    def get_running_job(self) -> Optional[Dict]:
+        """Get the running job, if one is alive"""
+        job = self.collection.find_one({"status": STATUS_RUNNING}, sort=[("startedAt", pymongo.DESCENDING)])
+        if job is None:
+            return None
+        heartbeat = job.get("heartbeatAt") or job.get("startedAt")
+        if heartbeat is not None and (now_for_mongo() - heartbeat).total_seconds() > BACKUP_JOB_STALE_SECONDS:
+            # The process running it went away (restart, crash)
+            self.collection.update_one(
+                {"_id": job["_id"], "status": STATUS_RUNNING},
+                {"$set": {"status": STATUS_FAILED, "error": "Job stopped responding", "completedAt": now_for_mongo()}}
+            )
+            return None
+        return job
+
+    def start_job(self, mode: str = "full", backup_format: str = "ndjson") -> Dict:
+        """
+        Start a backup job in a background thread (one job at a time)
+        Args:
+            mode: 'full' or 'incremental'
+            backup_format: 'ndjson' or 'bson'
+        Returns: The new job, or the already running one with "already_running" set
+        """
+        with self._lock:
+            running = self.get_running_job()
+            if running is not None:
+                return {**_job_response(running), "already_running": True}
+
+            collections = list_backup_collections(self.db)
+            plan = plan_backup(self.db, collections, mode, backup_format)
+            suffix = "" if plan.backup_type == "full" else "_incremental"
+            job = {
+                "_id": plan.backup_id,
+                "kind": KIND_BACKUP,
+                "status": STATUS_RUNNING,
+                "mode": mode,
+                "format": backup_format,
+                "backupType": plan.backup_type,
+                "filename": f"nse_data_backup_{plan.backup_id}{suffix}.zip",
+                "bytes": 0,
+                "documents": 0,
+                "currentCollection": None,
+                "collectionsDone": 0,
+                "totalCollections": len(collections),
+                "startedAt": now_for_mongo(),
+                "heartbeatAt": now_for_mongo()
+            }
+            self.collection.insert_one(job)
+
+        thread = threading.Thread(target=self._run_job, args=(job, plan), daemon=True, name=f"BackupJob-{plan.backup_id}")
+        thread.start()
+        logger.info(f"Started backup job {plan.backup_id} ({plan.backup_type}, {backup_format})")
+        return _job_response(job)
+
+    def _run_job(self, job: Dict, plan):
+        """Write the archive to disk, updating progress as collections are exported"""
+        os.makedirs(self.backup_dir, exist_ok=True)
+        path = os.path.join(self.backup_dir, job["filename"])
+        temp_path = f"{path}.part"
+        progress = {"collection": None, "documents": 0, "done": 0, "base": 0, "written_at": 0.0}
+
+        def on_progress(collection_name: str, count: int):
+            if collection_name != progress["collection"]:
+                if progress["collection"] is not None:
+                    progress["done"] += 1
+                    progress["base"] = progress["documents"]
+                progress["collection"] = collection_name
+            progress["documents"] = progress["base"] + count
+            now = time.monotonic()
+            if now - progress["written_at"] >= BACKUP_JOB_PROGRESS_SECONDS:
+                progress["written_at"] = now
+                self.collection.update_one({"_id": job["_id"]}, {"$set": {
+                    "bytes": archive_file.tell(),
+                    "documents": progress["documents"],
+                    "currentCollection": collection_name,
+                    "collectionsDone": progress["done"],
+                    "heartbeatAt": now_for_mongo()
+                }})
+
+        try:
+            with open(temp_path, "wb") as archive_file:
+                manifest = write_backup_file(archive_file, self.db, plan.collections, plan.backup_format,
+                                             queries=plan.queries, metadata=plan.metadata, on_progress=on_progress)
+            os.replace(temp_path, path)
+            complete_backup(self.db, plan, manifest)
+            self.collection.update_one({"_id": job["_id"]}, {"$set": {
+                "status": STATUS_COMPLETE,
+                "bytes": os.path.getsize(path),
+                "documents": sum(manifest["collections"].values()) if manifest else progress["documents"],
+                "currentCollection": None,
+                "collectionsDone": len(plan.collections),
+                "collectionErrors": manifest["errors"] if manifest else {},
+                "completedAt": now_for_mongo(),
+                "heartbeatAt": now_for_mongo()
+            }})
+            logger.info(f"Backup job {job['_id']} complete: {path}")
+        except Exception as e:
+            logger.error(f"Backup job {job['_id']} failed: {str(e)}", exc_info=True)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.collection.update_one({"_id": job["_id"]}, {"$set": {
+                "status": STATUS_FAILED,
+                "error": str(e),
+                "completedAt": now_for_mongo()
+            }})
+
+    def start_restore_job(
+        self,
+        archives: List[str],
+        workers: int = RESTORE_WORKERS,
+        drop: bool = False,
+        collections: Optional[List[str]] = None,
+        build_indexes: bool = True
+    ) -> Dict:
+        """
+        Start a restore of archives in the backup directory in a background thread
+        Args:
+            archives: Archive file names, base first, then increments oldest first
+            workers: Collections loaded in parallel
+            drop: Drop the target collections before loading the base archive
+            collections: Only restore these collections (None for all)
+            build_indexes: Build the application's indexes after the load
+        Returns: The new job, or the already running one with "already_running" set
+        """
+        zip_paths = [os.path.join(self.backup_dir, os.path.basename(archive)) for archive in archives]
+        with self._lock:
+            running = self.get_running_job()
+            if running is not None:
+                return {**_job_response(running), "already_running": True}
+
+            job = {
+                "_id": f"restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                "kind": KIND_RESTORE,
+                "status": STATUS_RUNNING,
+                "archives": [os.path.basename(path) for path in zip_paths],
+                "drop": drop,
+                "collections": collections,
+                "documents": 0,
+                "archivesDone": 0,
+                "totalArchives": len(zip_paths),
+                "startedAt": now_for_mongo(),
+                "heartbeatAt": now_for_mongo()
+            }
+            self.collection.insert_one(job)
+
+        thread = threading.Thread(
+            target=self._run_restore_job,
+            args=(job, zip_paths, workers, drop, collections, build_indexes),
+            daemon=True,
+            name=f"RestoreJob-{job['_id']}"
+        )
+        thread.start()
+        logger.info(f"Started restore job {job['_id']} ({len(zip_paths)} archive(s))")
+        return _job_response(job)
+
+    def _run_restore_job(self, job: Dict, zip_paths: List[str], workers: int, drop: bool,
+                         collections: Optional[List[str]], build_indexes: bool):
+        """Restore the archives, recording progress after each one and the result at the end"""
+        stop = threading.Event()
+        progress = {"documents": 0}
+
+        def heartbeat():
+            # A large archive can take longer than BACKUP_JOB_STALE_SECONDS to load
+            while not stop.wait(BACKUP_JOB_HEARTBEAT_SECONDS):
+                self.collection.update_one({"_id": job["_id"], "status": STATUS_RUNNING}, {"$set": {"heartbeatAt": now_for_mongo()}})
+
+        def on_archive(index: int, report: Dict):
+            progress["documents"] += report["documents"]
+            self.collection.update_one({"_id": job["_id"]}, {"$set": {
+                "archivesDone": index + 1,
+                "documents": progress["documents"],
+                "heartbeatAt": now_for_mongo()
+            }})
+
+        threading.Thread(target=heartbeat, daemon=True, name=f"RestoreJob-{job['_id']}-heartbeat").start()
+        try:
+            if not collections:
+                # Never restore over the job documents themselves (a dropped collection would lose this job)
+                archived = set()
+                for path in zip_paths:
+                    archived.update(list_collection_entries(path))
+                collections = sorted(archived - {BACKUP_JOBS_COLLECTION_NAME})
+            result = restore_chain(self.db, zip_paths, workers=workers, drop=drop, collections=collections,
+                                   build_indexes=build_indexes, on_archive=on_archive)
+            self.collection.update_one({"_id": job["_id"]}, {"$set": {
+                "status": STATUS_COMPLETE,
+                "documents": progress["documents"],
+                "archivesDone": len(zip_paths),
+                "collectionErrors": {report["archive"]: report["errors"] for report in result["archives"] if report["errors"]},
+                "result": result,
+                "completedAt": now_for_mongo(),
+                "heartbeatAt": now_for_mongo()
+            }})
+            logger.info(f"Restore job {job['_id']} complete: {progress['documents']} documents")
+        except Exception as e:
+            logger.error(f"Restore job {job['_id']} failed: {str(e)}", exc_info=True)
+            self.collection.update_one({"_id": job["_id"]}, {"$set": {
+                "status": STATUS_FAILED,
+                "error": str(e),
+                "completedAt": now_for_mongo()
+            }})
+        finally:
+            stop.set()
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a job by id"""
+        job = self.collection.find_one({"_id": job_id})
+        return _job_response(job) if job else None
+
+    def list_jobs(self, limit: int = 20) -> List[Dict]:
+        """Get the most recent jobs, newest first"""
+        return [_job_response(job) for job in self.collection.find().sort("startedAt", pymongo.DESCENDING).limit(limit)]
+
+    def get_artifact_path(self, job: Dict) -> Optional[str]:
+        """Path of a completed backup job's archive (None for restores, if not complete or the file is gone)"""
+        if job.get("kind", KIND_BACKUP) != KIND_BACKUP or job.get("status") != STATUS_COMPLETE:
+            return None
+        path = os.path.join(self.backup_dir, os.path.basename(job["filename"]))
+        return path if os.path.isfile(path) else None
+
+
+# Global instances (one per database)
+_backup_jobs = {}
+
+def get_backup_jobs(db) -> BackupJobs:
+    """Get the backup and restore job manager for a database"""
+    key = db.name
+    jobs = _backup_jobs.get(key)
+    # Rebuild if the shared MongoDB client was replaced after a failed health check
+    if jobs is None or jobs.db.client is not db.client:
+        jobs = BackupJobs(db)
+        _backup_jobs[key] = jobs
+    return jobs
@@ -0,0 +1,428 @@
+"""
+Parallel restore of /api/backup archives
+Decodes each collections/<name> entry incrementally and loads collections in parallel with unordered
+insert_many batches; duplicates are skipped quietly and indexes are built once after the load
+
+Supported entries:
+    collections/<name>.ndjson   extended JSON lines (backup_stream, format_version 2)
+    collections/<name>.bson     concatenated BSON documents (inserted without decoding)
+    collections/<name>.json     legacy {"documents": [...]} export (ObjectIds and dates were stringified;
+                                _id, insertedAt and updatedAt are converted back)
+Incremental archives replace documents that already exist (they carry in-place updates).
+Time-series collections have no unique _id index to reject a document loaded twice (an increment's
+overlap window, a restore over existing data), so documents already stored in them are filtered out first.
+Deletes recorded in an archive's tombstones (backup_incremental.record_deletions) are replayed
+before its documents load and again after, so a document deleted after export stays deleted.
+A chain is restored by passing the base archive first, then each increment in order.
+
+Usage:
+    python backup_restore.py base.zip [incr1.zip ...] [--workers 4] [--drop] [--collections a,b]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+import pymongo
+from bson import ObjectId, decode_file_iter, json_util
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo.errors import BulkWriteError
+from dotenv import load_dotenv
+from backup_stream import METADATA_ENTRY
+from backup_incremental import BACKUP_TOMBSTONES_COLLECTION_NAME
+from timeseries_store import TIME_FIELD
+from response_cache import bump_versions
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Restore configuration
+RESTORE_WORKERS = int(os.getenv('RESTORE_WORKERS', 4))  # Collections loaded in parallel
+RESTORE_BATCH_SIZE = int(os.getenv('RESTORE_BATCH_SIZE', 1000))  # Documents per insert_many
+RESTORE_PROGRESS_INTERVAL = 50  # Batches between progress log lines
+
+DUPLICATE_KEY_ERROR = 11000
+COLLECTION_ENTRY_PREFIX = "collections/"
+ENTRY_FORMATS = ("ndjson", "bson", "json")
+LEGACY_DATE_FIELDS = ("insertedAt", "updatedAt")
+LEGACY_READ_SIZE = 1024 * 1024
+
+
+def read_backup_metadata(zip_path: str) -> Dict:
+    """Read backup_metadata.json of an archive (empty if missing)"""
+    with zipfile.ZipFile(zip_path) as zip_file:
+        if METADATA_ENTRY not in zip_file.namelist():
+            return {}
+        return json.loads(zip_file.read(METADATA_ENTRY))
+
+
+def list_collection_entries(zip_path: str) -> Dict[str, str]:
+    """Get collection name -> zip entry of every collection stored in an archive"""
+    entries = {}
+    with zipfile.ZipFile(zip_path) as zip_file:
+        for name in zip_file.namelist():
+            if not name.startswith(COLLECTION_ENTRY_PREFIX) or name.endswith("_error.json"):
+                continue
+            collection_name, _, extension = name[len(COLLECTION_ENTRY_PREFIX):].rpartition(".")
+            if extension in ENTRY_FORMATS and collection_name:
+                entries[collection_name] = name
+    return entries
+
+
+def _legacy_types(document: Dict) -> Dict:
+    """Restore the types a legacy JSON export stringified (top-level _id and insert/update dates)"""
+    if isinstance(document.get("_id"), str) and ObjectId.is_valid(document["_id"]):
+        document["_id"] = ObjectId(document["_id"])
+    for field in LEGACY_DATE_FIELDS:
+        if isinstance(document.get(field), str):
+            try:
+                document[field] = datetime.fromisoformat(document[field])
+            except ValueError:
+                pass
+    return document
+
+
+def _iter_legacy_documents(stream) -> Iterator[Dict]:
+    """Decode the "documents" array of a legacy export one document at a time"""
+    text = io.TextIOWrapper(stream, encoding="utf-8")
+    decoder = json.JSONDecoder()
+    buffer = ""
+
+    # Skip the header up to the opening bracket of the documents array
+    while True:
+        key = buffer.find('"documents"')
+        bracket = buffer.find("[", key) if key >= 0 else -1
+        if bracket >= 0:
+            buffer = buffer[bracket + 1:]
+            break
+        chunk = text.read(LEGACY_READ_SIZE)
+        if not chunk:
+            return
+        buffer += chunk
+
+    while True:
+        buffer = buffer.lstrip(" \t\r\n,")
+        if buffer.startswith("]"):
+            return
+        try:
+            document, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            # Document continues past the buffered text
+            chunk = text.read(LEGACY_READ_SIZE)
+            if not chunk:
+                raise
+            buffer += chunk
+            continue
+        yield _legacy_types(document)
+        buffer = buffer[end:]
+
+
+def iter_entry_documents(zip_file: zipfile.ZipFile, entry_name: str) -> Iterator:
+    """
+    Decode a collection entry incrementally
+    Yields: Documents (RawBSONDocument for .bson entries, dict otherwise)
+    """
+    with zip_file.open(entry_name) as stream:
+        if entry_name.endswith(".bson"):
+            yield from decode_file_iter(stream, codec_options=CodecOptions(document_class=RawBSONDocument))
+        elif entry_name.endswith(".ndjson"):
+            for line in stream:
+                if line.strip():
+                    yield json_util.loads(line)
+        else:
+            yield from _iter_legacy_documents(stream)
+
+
+def timeseries_collection_names(db) -> set:
+    """Names of the time-series collections of a database"""
+    return {info["name"] for info in db.list_collections(filter={"type": "timeseries"})}
+
+
+def _existing_ids(collection, batch: List) -> set:
+    """_ids of a batch that are already stored (bounded by the batch's time range so buckets are pruned)"""
+    query = {"_id": {"$in": [document["_id"] for document in batch]}}
+    times = [document.get(TIME_FIELD) for document in batch]
+    if all(isinstance(value, datetime) for value in times):
+        query[TIME_FIELD] = {"$gte": min(times), "$lte": max(times)}
+    return {document["_id"] for document in collection.find(query, {"_id": 1})}
+
+
+def _insert_batch(collection, batch: List, replace_existing: bool, skip_existing: bool = False) -> Dict[str, int]:
+    """
+    Insert a batch unordered; existing documents are skipped, or replaced for incremental archives
+    Args:
+        collection: Target collection
+        batch: Documents to insert
+        replace_existing: Replace documents whose _id already exists (incremental archives)
+        skip_existing: Look up and skip stored _ids first (time-series collections, which never report duplicates)
+    Returns: Dictionary with inserted, duplicates, replaced and errors counts
+    """
+    if skip_existing:
+        existing = _existing_ids(collection, batch)
+        if existing:
+            result = _insert_batch(collection, [document for document in batch if document["_id"] not in existing], False)
+            result["duplicates"] += len(existing)
+            return result
+    if not batch:
+        return {"inserted": 0, "duplicates": 0, "replaced": 0, "errors": 0}
+    try:
+        result = collection.insert_many(batch, ordered=False)
+        return {"inserted": len(result.inserted_ids), "duplicates": 0, "replaced": 0, "errors": 0}
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        duplicates = [error for error in write_errors if error.get("code") == DUPLICATE_KEY_ERROR]
+        replaced = 0
+        if replace_existing and duplicates:
+            result = collection.bulk_write([
+                pymongo.ReplaceOne({"_id": error["op"]["_id"]}, error["op"])
+                for error in duplicates
+            ], ordered=False)
+            replaced = result.matched_count
+        for error in write_errors:
+            if error.get("code") != DUPLICATE_KEY_ERROR:
+                logger.warning(f"Restore of {collection.name} rejected a document: {error.get('errmsg')}")
+        return {
+            "inserted": e.details.get("nInserted", 0),
+            "duplicates": len(duplicates) - replaced,
+            "replaced": replaced,
+            "errors": len(write_errors) - len(duplicates)
+        }
+
+
+def restore_collection(
+    db,
+    zip_path: str,
+    entry_name: str,
+    collection_name: str,
+    replace_existing: bool = False,
+    skip_existing: bool = False
+) -> Dict:
+    """
+    Load one collection entry (runs in a worker thread with its own zip handle)
+    Args:
+        db: pymongo Database to restore into
+        zip_path: Backup archive
+        entry_name: Zip entry of the collection
+        collection_name: Target collection
+        replace_existing: Replace documents whose _id already exists (incremental archives)
+        skip_existing: Skip documents whose _id is already stored (time-series collections)
+    Returns: Progress report with counts, seconds and documents per second
+    """
+    collection = db[collection_name]
+    report = {"documents": 0, "inserted": 0, "duplicates": 0, "replaced": 0, "errors": 0}
+    started = time.perf_counter()
+    batches = 0
+
+    def flush(batch):
+        nonlocal batches
+        for key, value in _insert_batch(collection, batch, replace_existing, skip_existing).items():
+            report[key] += value
+        batches += 1
+        if batches % RESTORE_PROGRESS_INTERVAL == 0:
+            elapsed = time.perf_counter() - started
+            logger.info(f"  Restoring {collection_name}: {report['documents']} documents ({report['documents'] / elapsed:.0f}/s)")
+
+    with zipfile.ZipFile(zip_path) as zip_file:
+        batch = []
+        for document in iter_entry_documents(zip_file, entry_name):
+            batch.append(document)
+            report["documents"] += 1
+            if len(batch) >= RESTORE_BATCH_SIZE:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    report["docs_per_second"] = round(report["documents"] / report["seconds"]) if report["seconds"] else report["documents"]
+    logger.info(
+        f"Restored {collection_name}: {report['inserted']} inserted, {report['duplicates']} duplicates skipped, "
+        f"{report['replaced']} replaced, {report['errors']} errors in {report['seconds']}s ({report['docs_per_second']}/s)"
+    )
+    return report
+
+
+def read_tombstones(zip_path: str, entry_name: str) -> Dict[str, List]:
+    """Get collection name -> deleted _ids from an archive's tombstone entry"""
+    tombstones = {}
+    with zipfile.ZipFile(zip_path) as zip_file:
+        for tombstone in iter_entry_documents(zip_file, entry_name):
+            tombstones.setdefault(tombstone["collection"], []).append(tombstone["docId"])
+    return tombstones
+
+
+def apply_tombstones(db, tombstones: Dict[str, List]) -> int:
+    """
+    Delete the documents named by tombstones
+    Returns: Number of deleted documents
+    """
+    deleted = 0
+    for collection_name, ids in tombstones.items():
+        for start in range(0, len(ids), RESTORE_BATCH_SIZE):
+            result = db[collection_name].delete_many({"_id": {"$in": ids[start:start + RESTORE_BATCH_SIZE]}})
+            deleted += result.deleted_count
+    return deleted
+
+
+def restore_backup(
+    db,
+    zip_path: str,
+    workers: int = RESTORE_WORKERS,
+    drop: bool = False,
+    collections: Optional[List[str]] = None
+) -> Dict:
+    """
+    Restore one archive, loading collections in parallel (indexes are not built here)
+    Args:
+        db: pymongo Database to restore into
+        zip_path: Backup archive
+        workers: Collections loaded in parallel
+        drop: Drop each target collection first (clean restore of a full archive)
+        collections: Only restore these collections (None for all)
+    Returns: Report with the archive's backup id and type, per-collection progress and tombstone deletes
+    """
+    metadata = read_backup_metadata(zip_path)
+    incremental = metadata.get("backup_type") == "incremental"
+    entries = list_collection_entries(zip_path)
+    tombstone_entry = entries.get(BACKUP_TOMBSTONES_COLLECTION_NAME)
+    tombstones = read_tombstones(zip_path, tombstone_entry) if tombstone_entry else {}
+    if collections:
+        entries = {name: entry for name, entry in entries.items() if name in collections}
+        tombstones = {name: ids for name, ids in tombstones.items() if name in collections}
+
+    if drop:
+        for collection_name in entries:
+            db.drop_collection(collection_name)
+
+    started = time.perf_counter()
+    report = {
+        "archive": os.path.basename(zip_path),
+        "backup_id": metadata.get("backup_id"),
+        "backup_type": metadata.get("backup_type", "full"),
+        "parent": metadata.get("parent"),
+        "collections": {},
+        "errors": {}
+    }
+    # Deletes of documents loaded from earlier archives (their replacements may reuse unique keys)
+    deleted = apply_tombstones(db, tombstones)
+    timeseries = timeseries_collection_names(db)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(restore_collection, db, zip_path, entry, name, incremental, name in timeseries): name
+            for name, entry in entries.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                report["collections"][name] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to restore collection {name}: {str(e)}", exc_info=True)
+                report["errors"][name] = str(e)
+    # Deletes of documents this archive exported before they were deleted
+    deleted += apply_tombstones(db, tombstones)
+
+    report["deleted"] = deleted
+    report["deleted_from"] = sorted(tombstones)
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    report["documents"] = sum(item["documents"] for item in report["collections"].values())
+    return report
+
+
+def restore_chain(
+    db,
+    zip_paths: List[str],
+    workers: int = RESTORE_WORKERS,
+    drop: bool = False,
+    collections: Optional[List[str]] = None,
+    build_indexes: bool = True,
+    on_archive: Optional[Callable[[int, Dict], None]] = None
+) -> Dict:
+    """
+    Restore a base archive and its increments in order, then build indexes once
+    Args:
+        db: pymongo Database to restore into
+        zip_paths: Base archive first, then increments oldest first
+        workers: Collections loaded in parallel
+        drop: Drop the target collections before loading the base archive
+        collections: Only restore these collections (None for all)
+        build_indexes: Build the application's indexes after the load
+        on_archive: Optional callback(archive index, archive report) after each archive is loaded
+    Returns: Dictionary with per-archive reports and the index build result
+    """
+    from timeseries_store import is_timeseries_backend, create_timeseries_collections
+
+    if is_timeseries_backend():
+        # Time-series collections must exist before documents are inserted into them
+        create_timeseries_collections(db)
+
+    reports = []
+    previous_id = None
+    for index, zip_path in enumerate(zip_paths):
+        report = restore_backup(db, zip_path, workers=workers, drop=drop and index == 0, collections=collections)
+        if index > 0 and report.get("parent") and report["parent"] != previous_id:
+            logger.warning(f"{report['archive']} follows backup {report['parent']}, not {previous_id}: the chain has a gap")
+        previous_id = report.get("backup_id")
+        reports.append(report)
+        if on_archive:
+            on_archive(index, report)
+
+    # Cached stats/status responses of the restored collections are stale now
+    bump_versions(db, [name for report in reports for name in list(report["collections"]) + report["deleted_from"]])
+
+    result = {"archives": reports, "indexes": None}
+    if build_indexes:
+        from schema_manager import bootstrap_schema
+        # Indexes are deferred until the data is in place: one build per index instead of per-insert maintenance
+        result["indexes"] = bootstrap_schema(force=True)
+    return result
+
+
+def main():
+    """Command line entry point"""
+    from mongo_pool import get_mongo_db
+
+    parser = argparse.ArgumentParser(description="Restore /api/backup archives (base first, then increments)")
+    parser.add_argument("archives", nargs="+", help="Backup zip files in restore order")
+    parser.add_argument("--workers", type=int, default=RESTORE_WORKERS, help="Collections loaded in parallel")
+    parser.add_argument("--drop", action="store_true", help="Drop target collections before loading the base archive")
+    parser.add_argument("--collections", help="Comma separated collections to restore (default: all)")
+    parser.add_argument("--skip-indexes", action="store_true", help="Do not build indexes after the load")
+    args = parser.parse_args()
+
+    _, db = get_mongo_db()
+    collections = [name.strip() for name in args.collections.split(",")] if args.collections else None
+    result = restore_chain(
+        db,
+        args.archives,
+        workers=args.workers,
+        drop=args.drop,
+        collections=collections,
+        build_indexes=not args.skip_indexes
+    )
+
+    failed = False
+    for report in result["archives"]:
+        print(f"{report['archive']} ({report['backup_type']}): {report['documents']} documents, "
+              f"{report['deleted']} deleted by tombstones in {report['seconds']}s")
+        for name, progress in sorted(report["collections"].items()):
+            print(f"  {name}: {progress['inserted']} inserted, {progress['duplicates']} duplicates, "
+                  f"{progress['replaced']} replaced, {progress['errors']} errors ({progress['docs_per_second']}/s)")
+        for name, error in report["errors"].items():
+            failed = True
+            print(f"  {name}: FAILED ({error})")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
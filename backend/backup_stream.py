@@ -0,0 +1,249 @@
+"""
+Streaming database backup
+Writes a zip archive of every collection chunk by chunk, with constant memory use:
+one cursor per collection, one NDJSON (extended JSON) or BSON entry per collection,
+and the compressed bytes handed to the caller as soon as a chunk is full
+
+Archive layout:
+    backup_metadata.json                 database, format, collections (written first)
+    collections/<name>.ndjson | .bson    one document per line (bson.json_util relaxed) or concatenated BSON
+    collections/<name>_error.json        written instead if a collection failed mid-export
+    backup_manifest.json                 per-collection document counts and errors (written last)
+"""
+
+import json
+import os
+import zipfile
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+from bson import json_util
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from dotenv import load_dotenv
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Backup configuration
+BACKUP_DIR = os.getenv('BACKUP_DIR', 'backups')  # Archives written to disk and restored from
+BACKUP_BATCH_SIZE = int(os.getenv('BACKUP_BATCH_SIZE', 1000))  # Cursor batch size
+BACKUP_CHUNK_SIZE = int(os.getenv('BACKUP_CHUNK_SIZE', 1024 * 1024))  # Bytes buffered before a chunk is yielded
+BACKUP_COMPRESS_LEVEL = int(os.getenv('BACKUP_COMPRESS_LEVEL', 6))
+
+BACKUP_FORMATS = ("ndjson", "bson")
+BACKUP_FORMAT_VERSION = 2  # 1: collections/<name>.json with a "documents" array
+
+METADATA_ENTRY = "backup_metadata.json"
+MANIFEST_ENTRY = "backup_manifest.json"
+
+# Lossless extended JSON (ObjectId, datetime, Decimal128 survive a restore)
+NDJSON_OPTIONS = json_util.RELAXED_JSON_OPTIONS
+
+
+def collection_entry_name(collection_name: str, backup_format: str) -> str:
+    """Zip entry holding a collection's documents"""
+    return f"collections/{collection_name}.{backup_format}"
+
+
+def list_backup_collections(db) -> List[str]:
+    """
+    Names of the collections a backup exports: regular and time-series collections
+    Views are skipped (their documents are backed up through their source collections), and so are
+    system collections such as the buckets behind a time-series collection
+    Args:
+        db: pymongo Database
+    Returns: Collection names
+    """
+    return [
+        info["name"] for info in db.list_collections()
+        if info.get("type") != "view" and not info["name"].startswith("system.")
+    ]
+
+
+class ChunkSink:
+    """
+    Write-only, non-seekable file object collecting zip output until it is drained
+    zipfile writes data descriptors instead of seeking back when the target cannot seek
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.pending = 0  # Bytes written since the last drain
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        self.pending += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        """Take everything written since the last drain"""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self.pending = 0
+        return data
+
+
+def write_collection(zip_file: zipfile.ZipFile, collection, backup_format: str = "ndjson", query: Optional[Dict] = None) -> Iterator[int]:
+    """
+    Write one collection into the archive with a single cursor
+    Args:
+        zip_file: Open ZipFile (mode 'w')
+        collection: pymongo Collection
+        backup_format: 'ndjson' or 'bson'
+        query: Optional filter (None exports every document)
+    Yields: Running document count after each cursor batch, so the caller can flush output
+    """
+    if backup_format == "bson":
+        # Raw documents are copied byte for byte without decoding
+        source = collection.with_options(codec_options=CodecOptions(document_class=RawBSONDocument))
+    else:
+        source = collection
+
+    count = 0
+    cursor = source.find(query or {}).sort("_id", 1).batch_size(BACKUP_BATCH_SIZE)
+    # force_zip64: entry sizes are unknown up front and may exceed 4 GB
+    with zip_file.open(collection_entry_name(collection.name, backup_format), "w", force_zip64=True) as entry:
+        for document in cursor:
+            if backup_format == "bson":
+                entry.write(document.raw)
+            else:
+                entry.write(json_util.dumps(document, json_options=NDJSON_OPTIONS).encode("utf-8"))
+                entry.write(b"\n")
+            count += 1
+            if count % BACKUP_BATCH_SIZE == 0:
+                yield count
+    yield count
+
+
+def write_backup(
+    zip_file: zipfile.ZipFile,
+    db,
+    collections: List[str],
+    backup_format: str = "ndjson",
+    queries: Optional[Dict[str, Dict]] = None,
+    metadata: Optional[Dict] = None,
+    on_progress: Optional[Callable[[str, int], None]] = None
+) -> Iterator[None]:
+    """
+    Write every collection into an archive, yielding whenever output may be flushed
+    Args:
+        zip_file: Open ZipFile (mode 'w')
+        db: pymongo Database
+        collections: Names of the collections to export
+        backup_format: 'ndjson' or 'bson'
+        queries: Optional collection name -> filter (incremental backups)
+        metadata: Extra fields for backup_metadata.json
+        on_progress: Optional callback(collection name, documents written so far)
+    Yields: None after each batch; the manifest dictionary is available as the generator's return value
+    """
+    queries = queries or {}
+    zip_file.writestr(METADATA_ENTRY, json.dumps({
+        "backup_date": datetime.now().isoformat(),
+        "database": db.name,
+        "format": backup_format,
+        "format_version": BACKUP_FORMAT_VERSION,
+        "collections": collections,
+        "total_collections": len(collections),
+        **(metadata or {})
+    }, indent=2, default=str))
+    yield
+
+    manifest = {"collections": {}, "errors": {}}
+    for collection_name in collections:
+        count = 0
+        try:
+            for count in write_collection(zip_file, db[collection_name], backup_format, queries.get(collection_name)):
+                if on_progress:
+                    on_progress(collection_name, count)
+                yield
+            manifest["collections"][collection_name] = count
+            logger.info(f"Exported collection: {collection_name} ({count} documents)")
+        except Exception as e:
+            logger.error(f"Error exporting collection {collection_name}: {str(e)}", exc_info=True)
+            # Continue with other collections even if one fails
+            manifest["errors"][collection_name] = str(e)
+            zip_file.writestr(
+                f"collections/{collection_name}_error.json",
+                json.dumps({"collection_name": collection_name, "documents_written": count, "error": str(e)}, indent=2)
+            )
+            yield
+
+    zip_file.writestr(MANIFEST_ENTRY, json.dumps(manifest, indent=2))
+    return manifest
+
+
+def stream_backup(
+    db,
+    collections: List[str],
+    backup_format: str = "ndjson",
+    queries: Optional[Dict[str, Dict]] = None,
+    metadata: Optional[Dict] = None,
+    chunk_size: int = BACKUP_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Stream a backup archive as zip bytes (for an HTTP response)
+    Args:
+        db: pymongo Database
+        collections: Names of the collections to export
+        backup_format: 'ndjson' or 'bson'
+        queries: Optional collection name -> filter (incremental backups)
+        metadata: Extra fields for backup_metadata.json
+        chunk_size: Bytes buffered before a chunk is yielded
+    Yields: Chunks of the zip file; the manifest dictionary is the generator's return value
+    """
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=BACKUP_COMPRESS_LEVEL) as zip_file:
+        writer = write_backup(zip_file, db, collections, backup_format, queries, metadata)
+        while True:
+            try:
+                next(writer)
+            except StopIteration as stop:
+                manifest = stop.value
+                break
+            if sink.pending >= chunk_size:
+                yield sink.drain()
+    # Closing the archive writes the central directory
+    yield sink.drain()
+    return manifest
+
+
+def write_backup_file(
+    fileobj,
+    db,
+    collections: List[str],
+    backup_format: str = "ndjson",
+    queries: Optional[Dict[str, Dict]] = None,
+    metadata: Optional[Dict] = None,
+    on_progress: Optional[Callable[[str, int], None]] = None
+) -> Dict:
+    """
+    Write a backup archive to a file (background jobs, CLI)
+    Args:
+        fileobj: File object opened for binary writing
+        db: pymongo Database
+        collections: Names of the collections to export
+        backup_format: 'ndjson' or 'bson'
+        queries: Optional collection name -> filter (incremental backups)
+        metadata: Extra fields for backup_metadata.json
+        on_progress: Optional callback(collection name, documents written so far)
+    Returns: Manifest with per-collection document counts and errors
+    """
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=BACKUP_COMPRESS_LEVEL) as zip_file:
+        writer = write_backup(zip_file, db, collections, backup_format, queries, metadata, on_progress)
+        while True:
+            try:
+                next(writer)
+            except StopIteration as stop:
+                return stop.value
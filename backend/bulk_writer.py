@@ -0,0 +1,161 @@
+"""
+Batched MongoDB persistence for collector cycles
+Collectors queue a cycle's writes here and flush them as unordered bulk_write
+batches grouped per collection, instead of one round-trip per document
+"""
+
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+import pymongo
+from dotenv import load_dotenv
+from response_cache import bump_versions
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Maximum operations sent in one bulk_write call
+BULK_WRITE_BATCH_SIZE = int(os.getenv('MONGO_BULK_WRITE_BATCH_SIZE', 500))
+
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# Outcomes reported to on_result callbacks
+OUTCOME_INSERTED = "inserted"
+OUTCOME_UPDATED = "updated"
+OUTCOME_DUPLICATE = "duplicate"
+OUTCOME_FAILED = "failed"
+
+
+class BulkWriteBuffer:
+    """Collects write operations for one cycle and flushes them in per-collection batches"""
+
+    def __init__(self, label: str = "bulk write", batch_size: int = BULK_WRITE_BATCH_SIZE):
+        """
+        Args:
+            label: Name used in log messages and the flush report
+            batch_size: Maximum operations per bulk_write call
+        """
+        self.label = label
+        self.batch_size = max(1, batch_size)
+        self._groups = {}  # collection full name -> {"collection", "entries"}
+
+    def __len__(self) -> int:
+        return sum(len(group["entries"]) for group in self._groups.values())
+
+    def add(self, collection, operation, tag: Any = None, on_result: Optional[Callable[[str], None]] = None):
+        """
+        Queue a write operation
+        Args:
+            collection: pymongo Collection the operation targets
+            operation: pymongo write model (InsertOne, UpdateOne, ...)
+            tag: Caller identifier (e.g. symbol) used to report failures
+            on_result: Optional callback called with the operation outcome after the flush
+        """
+        group = self._groups.setdefault(collection.full_name, {"collection": collection, "entries": []})
+        group["entries"].append({"operation": operation, "tag": tag, "on_result": on_result})
+
+    def _write_batch(self, collection, entries: List[Dict]) -> Dict:
+        """Send one unordered bulk_write and classify every operation in it"""
+        operations = [entry["operation"] for entry in entries]
+        started = time.monotonic()
+        try:
+            result = collection.bulk_write(operations, ordered=False)
+            details = result.bulk_api_result
+        except pymongo.errors.BulkWriteError as e:
+            details = e.details or {}
+        except Exception as e:
+            # The whole batch failed (network, auth, ...)
+            logger.error(f"{self.label}: bulk_write to {collection.name} failed: {str(e)}")
+            details = {"writeErrors": [{"index": i, "code": None, "errmsg": str(e)} for i in range(len(entries))]}
+        latency_ms = (time.monotonic() - started) * 1000
+
+        outcomes = [OUTCOME_UPDATED] * len(entries)
+        for upsert in details.get("upserted", []):
+            outcomes[upsert["index"]] = OUTCOME_INSERTED
+        for index, entry in enumerate(entries):
+            if isinstance(entry["operation"], pymongo.InsertOne):
+                outcomes[index] = OUTCOME_INSERTED
+
+        duplicates = 0
+        errors = 0
+        for error in details.get("writeErrors", []):
+            if error.get("code") == DUPLICATE_KEY_ERROR_CODE:
+                outcomes[error["index"]] = OUTCOME_DUPLICATE
+                duplicates += 1
+            else:
+                outcomes[error["index"]] = OUTCOME_FAILED
+                errors += 1
+                logger.debug(f"{self.label}: write to {collection.name} failed: {error.get('errmsg')}")
+
+        # An unordered batch with a write concern error may not be durable
+        if details.get("writeConcernErrors"):
+            logger.warning(f"{self.label}: write concern errors on {collection.name}: {details['writeConcernErrors']}")
+
+        failed_tags = []
+        for entry, outcome in zip(entries, outcomes):
+            if outcome == OUTCOME_FAILED and entry["tag"] is not None:
+                failed_tags.append(entry["tag"])
+            if entry["on_result"] is not None:
+                try:
+                    entry["on_result"](outcome)
+                except Exception as e:
+                    logger.error(f"{self.label}: result callback for {entry['tag']} failed: {str(e)}")
+
+        return {
+            "collection": collection.name,
+            "operations": len(entries),
+            "latency_ms": round(latency_ms, 2),
+            "inserted": details.get("nInserted", 0) + details.get("nUpserted", 0),
+            "modified": details.get("nModified", 0),
+            "matched": details.get("nMatched", 0),
+            "duplicates": duplicates,
+            "errors": errors,
+            "failed_tags": failed_tags
+        }
+
+    def flush(self) -> Dict:
+        """
+        Write all queued operations and clear the buffer
+        Returns: Report with per-batch latency/counts, totals and the tags of failed operations
+        """
+        groups = self._groups
+        self._groups = {}
+
+        batches = []
+        for group in groups.values():
+            entries = group["entries"]
+            written = False
+            for start in range(0, len(entries), self.batch_size):
+                batch = self._write_batch(group["collection"], entries[start:start + self.batch_size])
+                written = written or batch["inserted"] + batch["modified"] > 0
+                batches.append(batch)
+            if written:
+                # Invalidate cached stats/status responses computed from this collection
+                bump_versions(group["collection"].database, [group["collection"].name])
+
+        totals = {"operations": 0, "inserted": 0, "modified": 0, "matched": 0, "duplicates": 0, "errors": 0, "latency_ms": 0.0}
+        failed_tags = []
+        for batch in batches:
+            for key in totals:
+                totals[key] += batch[key]
+            failed_tags.extend(batch["failed_tags"])
+        totals["latency_ms"] = round(totals["latency_ms"], 2)
+
+        if batches:
+            logger.info(
+                f"{self.label}: {totals['operations']} ops in {len(batches)} batches "
+                f"({totals['latency_ms']}ms) - inserted {totals['inserted']}, modified {totals['modified']}, "
+                f"duplicates {totals['duplicates']}, errors {totals['errors']}"
+            )
+
+        return {
+            "label": self.label,
+            "round_trips": len(batches),
+            "batches": batches,
+            "totals": totals,
+            "failed_tags": failed_tags
+        }
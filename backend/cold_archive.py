@@ -0,0 +1,245 @@
+"""
+Cold-tier archive for raw option chain snapshots
+Moves snapshots older than COLD_ARCHIVE_AFTER_DAYS out of MongoDB into zstd-compressed NDJSON files
+(one file per collection and day) and leaves a small stub document behind
+
+File layout:
+    <COLD_ARCHIVE_DIR>/<collection>/<YYYY-MM-DD>.ndjson.zst
+Every snapshot is written as its own zstd frame holding one extended-JSON line, so a single record is
+read back with one seek, while `zstd -dc <file>` still yields the whole day as NDJSON.
+
+Stub layout (replaces the full document, same _id):
+    {"_id", "records": {"timestamp", "underlyingValue"}, "dataCount", "insertedAt", "updatedAt",
+     "archived": {"file": <path relative to COLD_ARCHIVE_DIR>, "offset", "length", "archivedAt"}}
+Delta-encoded snapshots are archived rebuilt (chains never span two trading days, so whole days are moved).
+OptionChainDeltaStore.find_snapshot / iter_snapshots read stubs through to the archive transparently.
+
+Usage:
+    python cold_archive.py [--older-than-days 28] [--symbols NIFTY,BANKNIFTY] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+import pymongo
+import zstandard
+from bson import json_util
+from dotenv import load_dotenv
+from timezone_utils import get_ist_now_naive, now_for_mongo
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Archive configuration
+COLD_ARCHIVE_DIR = os.getenv('COLD_ARCHIVE_DIR', os.path.join('archive', 'option_chain'))
+COLD_ARCHIVE_AFTER_DAYS = int(os.getenv('COLD_ARCHIVE_AFTER_DAYS', 28))
+COLD_ARCHIVE_ZSTD_LEVEL = int(os.getenv('COLD_ARCHIVE_ZSTD_LEVEL', 9))
+
+STUB_FIELD = "archived"
+ARCHIVE_FILE_SUFFIX = ".ndjson.zst"
+STUB_BATCH_SIZE = 200  # Stub replacements per bulk write
+
+
+def is_archived(document: Optional[Dict]) -> bool:
+    """Check if a stored document is a stub whose payload lives in the archive"""
+    return bool(document) and STUB_FIELD in document
+
+
+def _stub_document(document: Dict, relative_path: str, offset: int, length: int) -> Dict:
+    """Build the stub left in MongoDB for an archived snapshot"""
+    records = document.get("records") or {}
+    return {
+        "_id": document["_id"],
+        "records": {"timestamp": records.get("timestamp"), "underlyingValue": records.get("underlyingValue")},
+        "dataCount": len(records.get("data") or []),
+        "insertedAt": document.get("insertedAt"),
+        "updatedAt": now_for_mongo(),  # Replaced in place: the next incremental backup carries the stub
+        STUB_FIELD: {"file": relative_path, "offset": offset, "length": length, "archivedAt": now_for_mongo()}
+    }
+
+
+class ColdArchive:
+    """Writes and reads the per-day archive files"""
+
+    def __init__(self, archive_dir: str = COLD_ARCHIVE_DIR, level: int = COLD_ARCHIVE_ZSTD_LEVEL):
+        """
+        Args:
+            archive_dir: Root directory of the archive files
+            level: zstd compression level
+        """
+        self.archive_dir = archive_dir
+        self.level = level
+        self._local = threading.local()  # zstd contexts are not thread-safe
+
+    def _decompressor(self) -> zstandard.ZstdDecompressor:
+        """Per-thread zstd decompressor"""
+        decompressor = getattr(self._local, "decompressor", None)
+        if decompressor is None:
+            decompressor = zstandard.ZstdDecompressor()
+            self._local.decompressor = decompressor
+        return decompressor
+
+    def _day_file(self, collection_name: str, day: date) -> str:
+        """Relative path of a new archive file for a collection and day (a rerun adds a numbered part)"""
+        relative_path = os.path.join(collection_name, f"{day.isoformat()}{ARCHIVE_FILE_SUFFIX}")
+        part = 1
+        while os.path.exists(os.path.join(self.archive_dir, relative_path)):
+            relative_path = os.path.join(collection_name, f"{day.isoformat()}.{part}{ARCHIVE_FILE_SUFFIX}")
+            part += 1
+        return relative_path
+
+    def archive_day(self, collection, day: date, dry_run: bool = False) -> int:
+        """
+        Archive one day of a collection and replace its documents with stubs
+        The file is written and synced before any stub replaces a document
+        Args:
+            collection: MongoDB option chain collection
+            day: Day to archive (by insertedAt, naive IST)
+            dry_run: Only count the documents that would be archived
+        Returns: Number of snapshots archived
+        """
+        # Imported here: the delta store reads stubs through this module
+        from option_chain_delta_store import get_delta_store
+
+        day_start = datetime.combine(day, datetime.min.time())
+        query = {"insertedAt": {"$gte": day_start, "$lt": day_start + timedelta(days=1)}, STUB_FIELD: {"$exists": False}}
+        if dry_run:
+            return collection.count_documents(query)
+
+        relative_path = self._day_file(collection.name, day)
+        path = os.path.join(self.archive_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+
+        compressor = zstandard.ZstdCompressor(level=self.level)
+        stubs = []
+        offset = 0
+        with open(temp_path, "wb") as archive_file:
+            for document in get_delta_store().iter_snapshots(collection, query):
+                document.pop("storage", None)
+                frame = compressor.compress(json_util.dumps(document).encode("utf-8") + b"\n")
+                archive_file.write(frame)
+                stubs.append(_stub_document(document, relative_path, offset, len(frame)))
+                offset += len(frame)
+            archive_file.flush()
+            os.fsync(archive_file.fileno())
+
+        if not stubs:
+            os.remove(temp_path)
+            return 0
+        os.replace(temp_path, path)
+
+        for start in range(0, len(stubs), STUB_BATCH_SIZE):
+            collection.bulk_write([
+                pymongo.ReplaceOne({"_id": stub["_id"], STUB_FIELD: {"$exists": False}}, stub)
+                for stub in stubs[start:start + STUB_BATCH_SIZE]
+            ], ordered=False)
+        logger.info(f"Archived {len(stubs)} {collection.name} snapshots of {day.isoformat()} to {relative_path} ({offset} bytes)")
+        return len(stubs)
+
+    def archive_collection(self, collection, before: date, dry_run: bool = False) -> int:
+        """
+        Archive every day of a collection before a cutoff day
+        Returns: Number of snapshots archived
+        """
+        oldest = collection.find_one(
+            {STUB_FIELD: {"$exists": False}, "insertedAt": {"$lt": datetime.combine(before, datetime.min.time())}},
+            {"insertedAt": 1},
+            sort=[("insertedAt", 1)]
+        )
+        if oldest is None or not isinstance(oldest.get("insertedAt"), datetime):
+            return 0
+
+        archived = 0
+        day = oldest["insertedAt"].date()
+        while day < before:
+            archived += self.archive_day(collection, day, dry_run=dry_run)
+            day += timedelta(days=1)
+        return archived
+
+    def load(self, stub: Dict) -> Optional[Dict]:
+        """
+        Read the full snapshot a stub points to
+        Returns: The archived document (None if the archive file is missing or unreadable)
+        """
+        location = stub[STUB_FIELD]
+        path = os.path.join(self.archive_dir, location["file"])
+        try:
+            with open(path, "rb") as archive_file:
+                archive_file.seek(location["offset"])
+                frame = archive_file.read(location["length"])
+            return json_util.loads(self._decompressor().decompress(frame).decode("utf-8"))
+        except (OSError, ValueError, zstandard.ZstdError) as e:
+            logger.error(f"Failed to read archived snapshot {stub.get('_id')} from {path}: {str(e)}")
+            return None
+
+
+def run_archive(older_than_days: int = COLD_ARCHIVE_AFTER_DAYS, symbols: Optional[List[str]] = None, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Archive option chain snapshots older than a number of days for every index and bank
+    Args:
+        older_than_days: Keep this many most recent days in MongoDB
+        symbols: Symbols to archive (None for every index and bank)
+        dry_run: Only count the documents that would be archived
+    Returns: Dictionary of symbol -> snapshots archived
+    """
+    from mongo_pool import get_mongo_db
+    from schema_manager import get_option_chain_collection_names
+    from timeseries_store import is_timeseries_backend
+
+    if is_timeseries_backend():
+        # Time-series collections cannot be updated in place; use TIMESERIES_EXPIRE_AFTER_SECONDS instead
+        logger.warning("Cold archive skipped: snapshots are stored in time-series collections")
+        return {}
+
+    _, db = get_mongo_db()
+    archive = get_cold_archive()
+    before = get_ist_now_naive().date() - timedelta(days=max(1, older_than_days))
+
+    results = {}
+    for symbol, collection_name in get_option_chain_collection_names().items():
+        if symbols and symbol not in symbols:
+            continue
+        try:
+            results[symbol] = archive.archive_collection(db[collection_name], before, dry_run=dry_run)
+        except Exception as e:
+            logger.error(f"Cold archive failed for {symbol}: {str(e)}")
+    return results
+
+
+# Global instance
+_cold_archive = None
+
+def get_cold_archive() -> ColdArchive:
+    """Get global cold archive instance"""
+    global _cold_archive
+    if _cold_archive is None:
+        _cold_archive = ColdArchive()
+    return _cold_archive
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Move old option chain snapshots to compressed archive files")
+    parser.add_argument("--older-than-days", type=int, default=COLD_ARCHIVE_AFTER_DAYS, help="Keep this many recent days in MongoDB")
+    parser.add_argument("--symbols", help="Comma separated symbols (default: all indices and banks)")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the snapshots that would be archived")
+    args = parser.parse_args()
+
+    symbols = [symbol.strip().upper() for symbol in args.symbols.split(",")] if args.symbols else None
+    results = run_archive(older_than_days=args.older_than_days, symbols=symbols, dry_run=args.dry_run)
+    for symbol, count in results.items():
+        print(f"{symbol}: {count} snapshots {'to archive' if args.dry_run else 'archived'}")
+    print(f"Total: {sum(results.values())}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Bounded-concurrency fan-out engine for collectors
+Runs a per-symbol worker function for many symbols at once using a thread pool,
+so one slow symbol (or its retry delays) no longer holds up the whole cycle
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Optional
+from dotenv import load_dotenv
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Default parallelism cap (can be overridden per scheduler group in scheduler_config)
+DEFAULT_MAX_WORKERS = int(os.getenv('COLLECTOR_MAX_WORKERS', 4))
+
+
+def resolve_max_workers(max_workers: Optional[int], item_count: int) -> int:
+    """
+    Resolve the effective number of workers for a fan-out run
+    Args:
+        max_workers: Requested parallelism cap (None uses DEFAULT_MAX_WORKERS)
+        item_count: Number of items to process
+    Returns: Worker count between 1 and item_count
+    """
+    if max_workers is None:
+        max_workers = DEFAULT_MAX_WORKERS
+    try:
+        max_workers = int(max_workers)
+    except (TypeError, ValueError):
+        max_workers = DEFAULT_MAX_WORKERS
+    return max(1, min(max_workers, max(item_count, 1)))
+
+
+def run_fan_out(
+    items: Iterable[Any],
+    worker: Callable[[Any], Any],
+    key_func: Callable[[Any], str],
+    max_workers: Optional[int] = None,
+    label: str = "fan-out"
+) -> Dict[str, Any]:
+    """
+    Run worker(item) for every item with at most max_workers running at once
+    Args:
+        items: Items to process (e.g. BANKS or INDICES entries)
+        worker: Function called with each item; its return value is collected
+        key_func: Function returning the result key for an item (e.g. the symbol)
+        max_workers: Parallelism cap (1 means sequential)
+        label: Name used in log messages
+    Returns: Dictionary mapping item key to worker result (False if the worker raised)
+    """
+    items = list(items)
+    results = {}
+    if not items:
+        return results
+
+    workers = resolve_max_workers(max_workers, len(items))
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=label.replace(" ", "_")) as executor:
+        futures = {executor.submit(worker, item): key_func(item) for item in items}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logger.error(f"{label}: worker for {key} failed: {str(e)}", exc_info=True)
+                results[key] = False
+
+    elapsed = time.monotonic() - started
+    logger.debug(f"{label}: processed {len(items)} items with {workers} workers in {elapsed:.2f}s")
+
+    # Keep the caller's item order in the returned dictionary
+    return {key_func(item): results.get(key_func(item), False) for item in items}
@@ -39,6 +39,17 @@ def get_scheduler_config():
 
 STATUS_FILE = 'scheduler_status.json'
 
+# Long-lived collector reused across cycles (backed by the shared MongoDB pool)
+_collector = None
+
+def get_collector() -> NSEDataCollector:
+    """Get the scheduler's collector, creating it on first use"""
+    global _collector
+    if _collector is None:
+        _collector = NSEDataCollector()
+    return _collector
+
+
 def run_collector():
     """Execute the NSE data collector"""
     # Check if it's a holiday
@@ -56,11 +67,10 @@ def run_collector():
     if not config.get("enabled", True):
         return
     
-    collector = None
     try:
         logger.info(f"FII/DII Cronjob triggered at {now_ist.strftime('%Y-%m-%d %H:%M:%S')} IST")
         
-        collector = NSEDataCollector()
+        collector = get_collector()
         success = collector.collect_and_save()
         
         if not success:
@@ -86,9 +96,6 @@ def run_collector():
                 json.dump(status_data, f)
         except:
             pass
-    finally:
-        if collector:
-            collector.close()
 
 
 def main():
@@ -73,6 +73,17 @@ def is_market_hours(now: datetime) -> bool:
     return True
 
 
+# Long-lived collector reused across cycles (backed by the shared MongoDB pool)
+_collector = None
+
+def get_collector() -> NSEGainersLosersCollector:
+    """Get the scheduler's collector, creating it on first use"""
+    global _collector
+    if _collector is None:
+        _collector = NSEGainersLosersCollector()
+    return _collector
+
+
 def run_collector():
     """Execute the collector for gainers"""
     global last_run_time
@@ -88,7 +99,6 @@ def run_collector():
     interval_minutes = config.get("interval_minutes", 3)
     min_interval_seconds = interval_minutes * 60 - 10  # Allow 10 seconds buffer
     
-    collector = None
     try:
         if last_run_time:
             time_since_last_run = (now_ist - last_run_time).total_seconds()
@@ -106,7 +116,7 @@ def run_collector():
         logger.debug("=" * 60)
         
         last_run_time = now_ist
-        collector = NSEGainersLosersCollector()
+        collector = get_collector()
         success = collector.collect_and_save_single("gainers")
         
         if success:
@@ -142,8 +152,6 @@ def run_collector():
         except:
             pass
     finally:
-        if collector:
-            collector.close()
         # Always release the lock, even if we returned early
         execution_lock.release()
         logger.debug("=" * 60)
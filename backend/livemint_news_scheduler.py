@@ -80,6 +80,17 @@ def is_market_hours(now: datetime) -> bool:
     return True
 
 
+# Long-lived collector reused across cycles (backed by the shared MongoDB pool)
+_collector = None
+
+def get_collector() -> NSELiveMintNewsCollector:
+    """Get the scheduler's collector, creating it on first use"""
+    global _collector
+    if _collector is None:
+        _collector = NSELiveMintNewsCollector()
+    return _collector
+
+
 def run_collector():
     """Execute the LiveMint news collector"""
     global last_run_time
@@ -95,7 +106,6 @@ def run_collector():
     interval_minutes = config.get("interval_minutes", 15)
     min_interval_seconds = interval_minutes * 60 - 30  # Allow 30 seconds buffer
     
-    collector = None
     lock_acquired = True
     try:
         if last_run_time:
@@ -114,7 +124,7 @@ def run_collector():
         logger.info("=" * 60)
         
         last_run_time = now_ist
-        collector = NSELiveMintNewsCollector()
+        collector = get_collector()
         success = collector.collect_and_save()
         
         if success:
@@ -146,8 +156,6 @@ def run_collector():
         except:
             pass
     finally:
-        if collector:
-            collector.close()
         if lock_acquired:
             execution_lock.release()
         logger.info("=" * 60)
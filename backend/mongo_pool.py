@@ -0,0 +1,123 @@
+"""
+Shared MongoDB connection pool
+One health-checked MongoClient per process, shared by every collector and scheduler,
+with transparent reconnect when the server goes away
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Tuple
+from pymongo import MongoClient
+from dotenv import load_dotenv
+from mongodb_connection_helper import build_mongo_uri
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Pool configuration
+MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'nse_data')
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 50))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 5000))  # Max wait for a free pooled connection
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+MONGO_HEALTH_CHECK_INTERVAL_SECONDS = int(os.getenv('MONGO_HEALTH_CHECK_INTERVAL_SECONDS', 30))
+
+
+class MongoPool:
+    """Holds the process-wide MongoClient and replaces it if a health check fails"""
+
+    def __init__(self):
+        self._client = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reconnects = 0
+
+    def _create_client(self) -> MongoClient:
+        """Create and ping a new client"""
+        client = MongoClient(
+            build_mongo_uri(),
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS
+        )
+        client.admin.command('ping')
+        return client
+
+    def get_client(self) -> MongoClient:
+        """
+        Get the shared client, pinging it at most every MONGO_HEALTH_CHECK_INTERVAL_SECONDS
+        A client that fails its health check is closed and replaced
+        Raises: pymongo.errors.PyMongoError if no connection can be established
+        """
+        now = time.monotonic()
+        client = self._client
+        if client is not None and now - self._checked_at < MONGO_HEALTH_CHECK_INTERVAL_SECONDS:
+            return client
+
+        with self._lock:
+            if self._client is not None and time.monotonic() - self._checked_at < MONGO_HEALTH_CHECK_INTERVAL_SECONDS:
+                return self._client
+
+            if self._client is not None:
+                try:
+                    self._client.admin.command('ping')
+                    self._checked_at = time.monotonic()
+                    return self._client
+                except Exception as e:
+                    logger.warning(f"MongoDB health check failed, reconnecting: {str(e)}")
+                    try:
+                        self._client.close()
+                    except Exception:
+                        pass
+                    self._client = None
+                    self.reconnects += 1
+
+            self._client = self._create_client()
+            self._checked_at = time.monotonic()
+            logger.debug(f"Opened shared MongoDB client (maxPoolSize={MONGO_MAX_POOL_SIZE})")
+            return self._client
+
+    def get_stats(self) -> Dict:
+        """Get pool settings and health statistics"""
+        return {
+            "connected": self._client is not None,
+            "max_pool_size": MONGO_MAX_POOL_SIZE,
+            "min_pool_size": MONGO_MIN_POOL_SIZE,
+            "wait_queue_timeout_ms": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "health_check_interval_seconds": MONGO_HEALTH_CHECK_INTERVAL_SECONDS,
+            "seconds_since_health_check": round(time.monotonic() - self._checked_at, 1) if self._client is not None else None,
+            "reconnects": self.reconnects
+        }
+
+    def close(self):
+        """Close the shared client (process shutdown only)"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+# Global instance
+_mongo_pool = MongoPool()
+
+def get_mongo_pool() -> MongoPool:
+    """Get global MongoDB pool instance"""
+    return _mongo_pool
+
+def get_mongo_client() -> MongoClient:
+    """Get the shared, health-checked MongoClient"""
+    return _mongo_pool.get_client()
+
+def get_mongo_db(db_name: str = MONGO_DB_NAME) -> Tuple[MongoClient, object]:
+    """
+    Get the shared client and a database handle
+    Returns: (client, database)
+    """
+    client = get_mongo_client()
+    return client, client[db_name]
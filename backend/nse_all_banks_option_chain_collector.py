@@ -6,16 +6,26 @@ Runs Monday to Friday from 09:15 AM to 03:30 PM, every 3 minutes
 
 import requests
 import pymongo
-from pymongo import MongoClient
 from datetime import datetime
 import time
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import os
 from dotenv import load_dotenv
 from redis_expiry_cache import get_expiry_cache
-from urllib.parse import quote_plus
+from mongo_pool import get_mongo_client
 from timezone_utils import now_for_mongo
 from logger_config import get_logger
+from nse_http_session import get_nse_session
+from concurrent_collection import run_fan_out
+from option_chain_delta_store import get_delta_store, is_delta_mode
+from option_chain_timeseries import ingest_snapshot, get_timeseries, is_timeseries_enabled
+from option_greeks import ingest_greeks, get_greeks_store, is_greeks_enabled
+from option_chain_summary import ingest_summary, get_summary_store, is_summary_enabled
+from option_chain_rollups import update_rollups
+from bulk_writer import BulkWriteBuffer
+from response_cache import bump_versions
+from snapshot_dedup import get_snapshot_dedup, UNCHANGED
+from timeseries_store import get_timeseries_store, is_timeseries_backend, read_view_name, OPTION_CHAIN_TS_COLLECTION_NAME
 
 # Load environment variables
 load_dotenv()
@@ -28,6 +38,7 @@ OPTION_CHAIN_API_URL = "https://www.nseindia.com/api/option-chain-v3"
 TYPE = "Equity"  # Use Equity type for stocks
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
+DEFAULT_EXPIRY_COUNT = 1  # Nearest N expiries captured per symbol (overridden by scheduler_config)
 
 # List of all 12 banks to collect
 BANKS = [
@@ -51,6 +62,8 @@ MONGO_PORT = int(os.getenv('MONGO_PORT', 27017))
 MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'nse_data')
 MONGO_USERNAME = os.getenv('MONGO_USERNAME', None)
 MONGO_PASSWORD = os.getenv('MONGO_PASSWORD', None)
+# Shared collection for every expiry beyond the nearest one (per-symbol collections are keyed by timestamp only)
+ADDITIONAL_EXPIRIES_COLLECTION_NAME = os.getenv('MONGO_OPTION_CHAIN_ADDITIONAL_EXPIRIES_COLLECTION_NAME', 'option_chain_additional_expiries')
 
 
 class NSEAllBanksOptionChainCollector:
@@ -60,27 +73,19 @@ class NSEAllBanksOptionChainCollector:
         """Initialize MongoDB connection"""
         self.client = None
         self.db = None
+        self.http = get_nse_session()  # Shared pooled session with NSE cookies
         self.collections = {}  # Store collection references for each bank
+        self.additional_expiries_collection = None
         self.expiry_cache = get_expiry_cache()
+        self.dedup = get_snapshot_dedup()  # Last stored snapshot per symbol
+        self.last_write_report = None  # Bulk write report of the last full cycle
         self._connect_mongo()
     
     def _connect_mongo(self):
         """Establish MongoDB connection with error handling"""
         try:
-            if MONGO_USERNAME and MONGO_PASSWORD:
-                # URL-encode username and password to handle special characters like @, :, etc.
-                encoded_username = quote_plus(MONGO_USERNAME)
-                encoded_password = quote_plus(MONGO_PASSWORD)
-                # Get auth source (default to 'admin' for MongoDB) - REQUIRED for authentication
-                MONGO_AUTH_SOURCE = os.getenv('MONGO_AUTH_SOURCE', 'admin')
-                # Build connection string with authSource parameter (required for MongoDB auth)
-                mongo_uri = f"mongodb://{encoded_username}:{encoded_password}@{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB_NAME}?authSource={MONGO_AUTH_SOURCE}"
-            else:
-                mongo_uri = f"mongodb://{MONGO_HOST}:{MONGO_PORT}/"
-            
-            self.client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-            # Test connection
-            self.client.admin.command('ping')
+            # Shared, health-checked client: no new connection or ping per collector instance
+            self.client = get_mongo_client()
             self.db = self.client[MONGO_DB_NAME]
             
             # Create collection references for all banks
@@ -89,10 +94,10 @@ class NSEAllBanksOptionChainCollector:
                     f'MONGO_{bank["symbol"]}_OPTION_CHAIN_COLLECTION_NAME',
                     bank["collection"]
                 )
-                collection = self.db[collection_name]
-                # Create unique index on timestamp to prevent duplicates
-                collection.create_index([("records.timestamp", 1)], unique=True)
-                self.collections[bank["symbol"]] = collection
+                # Indexes are created once by schema_manager, not per connection
+                self.collections[bank["symbol"]] = self.db[collection_name]
+            
+            self.additional_expiries_collection = self.db[ADDITIONAL_EXPIRIES_COLLECTION_NAME]
             
             logger.debug(f"Successfully connected to MongoDB at {MONGO_HOST}:{MONGO_PORT}")
             logger.debug(f"Initialized collections for {len(BANKS)} banks")
@@ -100,6 +105,11 @@ class NSEAllBanksOptionChainCollector:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
             raise
     
+    def _ensure_connection(self):
+        """Rebind collections if the shared MongoDB client was replaced after a failed health check"""
+        if self.client is not get_mongo_client():
+            self._connect_mongo()
+    
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for NSE API requests"""
         return {
@@ -112,8 +122,8 @@ class NSEAllBanksOptionChainCollector:
     
     def _fetch_expiry_dates_with_retry(self, symbol: str) -> Optional[str]:
         """
-        Fetch expiry dates from NSE API with retry logic
-        First checks Redis cache, then fetches from API if not cached
+        Fetch the nearest expiry date
+        First checks Redis cache, then fetches the full expiry list from API if not cached
         Returns: First expiry date string (e.g., "25-Nov-2025") or None if all retries fail
         """
         # First, try to get from Redis cache
@@ -122,6 +132,20 @@ class NSEAllBanksOptionChainCollector:
             logger.debug(f"Using cached {symbol} expiry date: {cached_expiry}")
             return cached_expiry
         
+        expiry_dates = self._fetch_expiry_list_with_retry(symbol)
+        return expiry_dates[0] if expiry_dates else None
+    
+    def _fetch_expiry_list_with_retry(self, symbol: str) -> Optional[List[str]]:
+        """
+        Fetch all expiry dates (nearest first) from NSE API with retry logic
+        The list is fetched once per day and shared through the expiry cache
+        Returns: List of expiry date strings or None if all retries fail
+        """
+        cached_list = self.expiry_cache.get_expiry_list(symbol)
+        if cached_list:
+            logger.debug(f"Using cached {symbol} expiry list ({len(cached_list)} expiries)")
+            return cached_list
+        
         # If not in cache, fetch from API
         expiry_api_url = f"https://www.nseindia.com/api/option-chain-contract-info?symbol={symbol}"
         headers = self._get_headers()
@@ -130,7 +154,7 @@ class NSEAllBanksOptionChainCollector:
             try:
                 logger.debug(f"Fetching expiry dates for {symbol} from API (Attempt {attempt}/{MAX_RETRIES})")
                 
-                response = requests.get(expiry_api_url, headers=headers, timeout=30)
+                response = self.http.get(expiry_api_url, headers=headers, timeout=30)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -146,18 +170,16 @@ class NSEAllBanksOptionChainCollector:
                         continue
                     return None
                 
-                # Always pick the first expiry date
-                first_expiry = expiry_dates[0]
-                logger.debug(f"Successfully fetched {symbol} expiry dates. Using first expiry: {first_expiry}")
+                logger.debug(f"Successfully fetched {len(expiry_dates)} {symbol} expiry dates. First expiry: {expiry_dates[0]}")
                 
-                # Cache the expiry date for today
+                # Cache the full list (and the first expiry) for today
                 try:
-                    self.expiry_cache.set_expiry(symbol, first_expiry)
+                    self.expiry_cache.set_expiry_list(symbol, expiry_dates)
                 except Exception as cache_error:
-                    logger.warning(f"Failed to cache expiry date for {symbol}: {str(cache_error)}")
+                    logger.warning(f"Failed to cache expiry dates for {symbol}: {str(cache_error)}")
                     # Continue even if caching fails
                 
-                return first_expiry
+                return expiry_dates
                 
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Request failed for {symbol} (Attempt {attempt}/{MAX_RETRIES}): {str(e)}")
@@ -177,24 +199,34 @@ class NSEAllBanksOptionChainCollector:
         
         return None
     
-    def _fetch_option_chain_with_retry(self, symbol: str, expiry_date: str) -> Optional[Dict]:
+    def _fetch_option_chain_with_retry(self, symbol: str, expiry_date: str, dedup_key: Optional[str] = None) -> Optional[Dict]:
         """
         Fetch option chain data from NSE API with retry logic
         Args:
             symbol: Bank symbol (e.g., "HDFCBANK")
             expiry_date: Expiry date string (e.g., "25-Nov-2025")
-        Returns: Full API response as dict or None if all retries fail
+            dedup_key: Key for the last-stored-snapshot check (defaults to symbol)
+        Returns: Full API response as dict, UNCHANGED if the stored snapshot is still current,
+                 or None if all retries fail
         """
-        headers = self._get_headers()
+        # Conditional request if NSE sent an ETag for the stored snapshot
+        dedup_key = dedup_key or symbol
+        headers = {**self._get_headers(), **self.dedup.conditional_headers(dedup_key)}
         url = f"{OPTION_CHAIN_API_URL}?type={TYPE}&symbol={symbol}&expiry={expiry_date}"
         
         for attempt in range(1, MAX_RETRIES + 1):
             try:
                 logger.debug(f"Fetching option chain data for {symbol} expiry {expiry_date} (Attempt {attempt}/{MAX_RETRIES})")
                 
-                response = requests.get(url, headers=headers, timeout=30)
+                response = self.http.get(url, headers=headers, timeout=30)
+                if self.dedup.is_not_modified(dedup_key, response.status_code):
+                    return UNCHANGED
                 response.raise_for_status()
                 
+                # Skip parsing entirely if NSE returned the same bytes as the stored snapshot
+                if self.dedup.check_payload(dedup_key, response.content, response.headers.get("ETag")):
+                    return UNCHANGED
+                
                 data = response.json()
                 
                 # Validate response structure
@@ -218,6 +250,10 @@ class NSEAllBanksOptionChainCollector:
                         continue
                     return None
                 
+                # NSE has not refreshed the snapshot since the last write
+                if self.dedup.check_timestamp(dedup_key, timestamp):
+                    return UNCHANGED
+                
                 logger.debug(f"Successfully fetched option chain data for {symbol}. Timestamp: {timestamp}")
                 return data
                 
@@ -239,6 +275,27 @@ class NSEAllBanksOptionChainCollector:
         
         return None
     
+    def _snapshot_timestamp(self, data: Dict) -> Optional[str]:
+        """Get records.timestamp from an option chain response (None if missing)"""
+        records = data.get("records", {}) if isinstance(data, dict) else {}
+        return records.get("timestamp") if isinstance(records, dict) else None
+    
+    def _upsert_spec(self, timestamp: str, data: Dict) -> Tuple[Dict, Dict]:
+        """Build the (filter, update) of the timestamp-keyed upsert used to store a full snapshot"""
+        return (
+            {"records.timestamp": timestamp},
+            {
+                "$set": {
+                    **data,
+                    "dataCount": len(data.get("records", {}).get("data") or []),
+                    "updatedAt": now_for_mongo()
+                },
+                "$setOnInsert": {
+                    "insertedAt": now_for_mongo()
+                }
+            }
+        )
+    
     def _save_to_mongo(self, symbol: str, data: Dict) -> bool:
         """
         Save entire option chain response to MongoDB for a specific bank
@@ -256,27 +313,25 @@ class NSEAllBanksOptionChainCollector:
                 return False
             
             # Extract timestamp for duplicate check
-            records = data.get("records", {})
-            timestamp = records.get("timestamp") if isinstance(records, dict) else None
+            timestamp = self._snapshot_timestamp(data)
             
             if not timestamp:
                 logger.error(f"Cannot save {symbol}: timestamp not found in data")
                 return False
             
+            # Time-series backend: insert into the shared time-series collection (symbol as metaField)
+            if is_timeseries_backend():
+                return get_timeseries_store(self.db).save_snapshot(OPTION_CHAIN_TS_COLLECTION_NAME, symbol, data, timestamp)
+            
+            # Delta mode: store a keyframe or per-strike delta instead of the full response
+            if is_delta_mode():
+                return get_delta_store().save_snapshot(collection, data)
+            
             # Use upsert with timestamp as unique identifier
-            result = collection.update_one(
-                {"records.timestamp": timestamp},
-                {
-                    "$set": {
-                        **data,
-                        "updatedAt": now_for_mongo()
-                    },
-                    "$setOnInsert": {
-                        "insertedAt": now_for_mongo()
-                    }
-                },
-                upsert=True
-            )
+            query, update = self._upsert_spec(timestamp, data)
+            result = collection.update_one(query, update, upsert=True)
+            if result.upserted_id or result.modified_count > 0:
+                bump_versions(self.db, [collection.name])
             
             if result.upserted_id:
                 logger.debug(f"Inserted new record for {symbol} with timestamp: {timestamp}")
@@ -297,6 +352,108 @@ class NSEAllBanksOptionChainCollector:
             logger.error(f"Failed to save {symbol} data to MongoDB: {error_msg}")
             return False
     
+    def _queue_snapshot(self, buffer: BulkWriteBuffer, symbol: str, data: Dict) -> bool:
+        """
+        Queue a snapshot (and its per-strike rows) on the cycle's bulk write buffer
+        Returns: True if queued or already stored, False if the snapshot cannot be saved
+        """
+        collection = self.collections.get(symbol)
+        if collection is None:
+            logger.error(f"Collection not found for {symbol}")
+            return False
+        
+        timestamp = self._snapshot_timestamp(data)
+        if not timestamp:
+            logger.error(f"Cannot save {symbol}: timestamp not found in data")
+            return False
+        
+        if is_timeseries_backend():
+            prepared = get_timeseries_store(self.db).prepare_insert(OPTION_CHAIN_TS_COLLECTION_NAME, symbol, data, timestamp)
+            if prepared is None:
+                return True  # Already stored (or logged as unparseable)
+            document, on_result = prepared
+            buffer.add(self.db[OPTION_CHAIN_TS_COLLECTION_NAME], pymongo.InsertOne(document), tag=symbol, on_result=on_result)
+        elif is_delta_mode():
+            prepared = get_delta_store().prepare_snapshot(collection, data)
+            if prepared is None:
+                return True  # Same snapshot as the last cycle
+            document, on_result = prepared
+            buffer.add(collection, pymongo.InsertOne(document), tag=symbol, on_result=on_result)
+        else:
+            query, update = self._upsert_spec(timestamp, data)
+            buffer.add(collection, pymongo.UpdateOne(query, update, upsert=True), tag=symbol)
+        
+        if is_timeseries_enabled():
+            get_timeseries(self.db).queue_rows(buffer, symbol, data)
+        if is_greeks_enabled():
+            get_greeks_store(self.db).queue_greeks(buffer, symbol, data)
+        if is_summary_enabled():
+            get_summary_store(self.db).queue_summary(buffer, symbol, data)
+        return True
+    
+    def _queue_additional_expiry(self, buffer: BulkWriteBuffer, symbol: str, expiry_date: str, data: Dict) -> bool:
+        """
+        Queue a snapshot of a non-nearest expiry on the cycle's bulk write buffer
+        Stored in the shared additional-expiries collection, keyed by (symbol, expiryDate, records.timestamp)
+        Returns: True if queued, False if the snapshot cannot be saved
+        """
+        timestamp = self._snapshot_timestamp(data)
+        if not timestamp or self.additional_expiries_collection is None:
+            logger.error(f"Cannot save {symbol} {expiry_date}: timestamp not found in data")
+            return False
+        
+        buffer.add(
+            self.additional_expiries_collection,
+            pymongo.UpdateOne(
+                {"symbol": symbol, "expiryDate": expiry_date, "records.timestamp": timestamp},
+                {
+                    "$set": {
+                        **data,
+                        "symbol": symbol,
+                        "expiryDate": expiry_date,
+                        "dataCount": len(data.get("records", {}).get("data") or []),
+                        "updatedAt": now_for_mongo()
+                    },
+                    "$setOnInsert": {
+                        "insertedAt": now_for_mongo()
+                    }
+                },
+                upsert=True
+            ),
+            tag=symbol
+        )
+        
+        if is_timeseries_enabled():
+            get_timeseries(self.db).queue_rows(buffer, symbol, data)
+        if is_greeks_enabled():
+            get_greeks_store(self.db).queue_greeks(buffer, symbol, data)
+        if is_summary_enabled():
+            get_summary_store(self.db).queue_summary(buffer, symbol, data)
+        return True
+    
+    def fetch_single_bank(self, bank: Dict) -> Optional[Dict]:
+        """
+        Fetch the option chain response for a single bank (nearest expiry)
+        Args:
+            bank: Bank dictionary with 'symbol' and 'collection' keys
+        Returns: NSE option chain response, UNCHANGED if the stored snapshot is current, or None if the fetch failed
+        """
+        symbol = bank["symbol"]
+        
+        # Step 1: Fetch expiry dates and pick the first one
+        expiry_date = self._fetch_expiry_dates_with_retry(symbol)
+        
+        if not expiry_date:
+            logger.error(f"Failed to fetch expiry dates for {symbol} after all retries")
+            return None
+        
+        # Step 2: Fetch option chain data using the first expiry date
+        option_chain_data = self._fetch_option_chain_with_retry(symbol, expiry_date)
+        
+        if option_chain_data is None:
+            logger.error(f"Failed to fetch option chain data for {symbol} after all retries")
+        return option_chain_data
+    
     def collect_and_save_single_bank(self, bank: Dict) -> bool:
         """
         Collect option chain data for a single bank and save to MongoDB
@@ -304,30 +461,34 @@ class NSEAllBanksOptionChainCollector:
             bank: Bank dictionary with 'symbol' and 'collection' keys
         Returns: True if successful, False otherwise
         """
+        self._ensure_connection()
         symbol = bank["symbol"]
         try:
             logger.debug(f"Starting NSE {symbol} option chain data collection...")
             
-            # Step 1: Fetch expiry dates and pick the first one
-            expiry_date = self._fetch_expiry_dates_with_retry(symbol)
-            
-            if not expiry_date:
-                logger.error(f"Failed to fetch expiry dates for {symbol} after all retries")
-                return False
-            
-            # Step 2: Fetch option chain data using the first expiry date
-            option_chain_data = self._fetch_option_chain_with_retry(symbol, expiry_date)
-            
+            option_chain_data = self.fetch_single_bank(bank)
             if option_chain_data is None:
-                logger.error(f"Failed to fetch option chain data for {symbol} after all retries")
                 return False
+            if option_chain_data is UNCHANGED:
+                logger.debug(f"NSE {symbol} option chain unchanged since the last write, skipped")
+                return True
             
             # Step 3: Save entire response to MongoDB
             success = self._save_to_mongo(symbol, option_chain_data)
             
             if success:
+                self.dedup.commit(symbol)
+                # Step 4: Flatten into per-strike time series rows
+                ingest_snapshot(self.db, symbol, option_chain_data)
+                # Step 5: Implied volatility and Greeks for every strike
+                ingest_greeks(self.db, symbol, option_chain_data)
+                # Step 6: PCR, max pain and OI totals summary
+                ingest_summary(self.db, symbol, option_chain_data)
+                # Step 7: Fold the summary into the 5m / 15m / daily rollups (the schedulers do this per cycle)
+                update_rollups(self.db, [symbol])
                 logger.debug(f"NSE {symbol} option chain data collection completed successfully")
             else:
+                self.dedup.discard(symbol)
                 logger.warning(f"Failed to save {symbol} option chain data to MongoDB")
             
             return success
@@ -336,27 +497,102 @@ class NSEAllBanksOptionChainCollector:
             logger.error(f"Unexpected error in collect_and_save_single_bank for {symbol}: {str(e)}", exc_info=True)
             return False
     
-    def collect_and_save_all_banks(self) -> Dict[str, bool]:
+    def collect_and_save_all_banks(self, max_workers: Optional[int] = None, expiry_count: Optional[int] = None) -> Dict[str, bool]:
         """
         Main method to collect option chain data for all banks and save to MongoDB
-        Returns: Dictionary mapping bank symbols to success status
+        Every (bank, expiry) chain is fetched concurrently, bounded by max_workers, then the
+        whole cycle is written with one unordered bulk_write per collection
+        Args:
+            max_workers: Parallelism cap (None uses COLLECTOR_MAX_WORKERS, 1 runs sequentially)
+            expiry_count: Nearest N expiries to capture per bank (None uses DEFAULT_EXPIRY_COUNT);
+                          the nearest goes to the bank's collection, the rest to the additional-expiries collection
+        Returns: Dictionary mapping bank symbols to success status (all of its expiries saved)
         """
+        self._ensure_connection()
+        expiry_count = max(1, int(expiry_count or DEFAULT_EXPIRY_COUNT))
+        logger.debug(f"Starting NSE All Banks Option Chain data collection for {len(BANKS)} banks ({expiry_count} expiries each)...")
+        
+        # Warm the in-process expiry cache for every symbol with at most one Redis round-trip
+        symbols = [item["symbol"] for item in BANKS]
+        if expiry_count == 1:
+            self.expiry_cache.get_expiries(symbols)
+        else:
+            self.expiry_cache.get_expiry_lists(symbols)
+        
+        # Step 1: Resolve the expiries to capture (one contract-info call per symbol per day)
+        def resolve_expiries(item: Dict) -> Optional[List[str]]:
+            if expiry_count == 1:
+                expiry_date = self._fetch_expiry_dates_with_retry(item["symbol"])
+                return [expiry_date] if expiry_date else None
+            expiry_dates = self._fetch_expiry_list_with_retry(item["symbol"])
+            return expiry_dates[:expiry_count] if expiry_dates else None
+        
+        expiries = run_fan_out(
+            BANKS,
+            resolve_expiries,
+            key_func=lambda item: item["symbol"],
+            max_workers=max_workers,
+            label="All Banks Option Chain expiries"
+        )
+        
         results = {}
-        logger.debug(f"Starting NSE All Banks Option Chain data collection for {len(BANKS)} banks...")
+        tasks = []
+        for symbol, expiry_dates in expiries.items():
+            if not expiry_dates:
+                logger.error(f"Failed to fetch expiry dates for {symbol} after all retries")
+                results[symbol] = False
+                continue
+            results[symbol] = True
+            for rank, expiry_date in enumerate(expiry_dates):
+                # The nearest expiry keeps the plain symbol as dedup key so its state survives expiry rollover
+                key = symbol if rank == 0 else f"{symbol}:{expiry_date}"
+                tasks.append({"symbol": symbol, "expiry": expiry_date, "rank": rank, "key": key})
         
-        for bank in BANKS:
-            symbol = bank["symbol"]
-            try:
-                success = self.collect_and_save_single_bank(bank)
-                results[symbol] = success
-                
-                # Small delay between banks to avoid overwhelming the API
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error collecting data for {symbol}: {str(e)}", exc_info=True)
+        # Step 2: Fetch every chain concurrently
+        def fetch_task(task: Dict) -> Optional[Dict]:
+            return self._fetch_option_chain_with_retry(task["symbol"], task["expiry"], dedup_key=task["key"])
+        
+        fetched = run_fan_out(
+            tasks,
+            fetch_task,
+            key_func=lambda task: task["key"],
+            max_workers=max_workers,
+            label="All Banks Option Chain"
+        )
+        
+        # Step 3: Queue every fetched snapshot, then flush the cycle in a handful of round-trips
+        buffer = BulkWriteBuffer(label="All Banks Option Chain")
+        queued = []
+        for task in tasks:
+            symbol, data = task["symbol"], fetched.get(task["key"])
+            if data is UNCHANGED:
+                continue  # Nothing new to write
+            if not data:
+                logger.error(f"Failed to fetch option chain data for {symbol} {task['expiry']} after all retries")
+                results[symbol] = False
+                continue
+            if task["rank"] == 0:
+                ok = self._queue_snapshot(buffer, symbol, data)
+            else:
+                ok = self._queue_additional_expiry(buffer, symbol, task["expiry"], data)
+            if ok:
+                queued.append(task)
+            else:
                 results[symbol] = False
         
+        report = buffer.flush()
+        failed_symbols = set(report["failed_tags"])
+        for symbol in failed_symbols:
+            results[symbol] = False
+        self.last_write_report = report
+        
+        # Only remember snapshots that actually reached the database
+        for task in queued:
+            if task["symbol"] in failed_symbols:
+                self.dedup.discard(task["key"])
+            else:
+                self.dedup.commit(task["key"])
+        
         # Summary
         successful = sum(1 for success in results.values() if success)
         failed = len(results) - successful
@@ -374,14 +610,19 @@ class NSEAllBanksOptionChainCollector:
         Args:
             symbol: Bank symbol (e.g., "HDFCBANK")
         Returns: MongoDB collection object or None if not found
+        In the time-series backend this is the symbol's read-only view over the time-series collection
         """
-        return self.collections.get(symbol)
+        collection = self.collections.get(symbol)
+        if collection is not None and is_timeseries_backend():
+            return self.db[read_view_name(collection.name)]
+        return collection
     
     def close(self):
-        """Close MongoDB connection"""
-        if self.client:
-            self.client.close()
-            logger.debug("MongoDB connection closed")
+        """
+        Release this collector
+        The shared MongoDB client stays open, so a collector can be kept and reused after close()
+        """
+        logger.debug("Collector released (shared MongoDB client kept open)")
 
 
 def main():
@@ -6,15 +6,16 @@ Runs Monday to Friday at 5:00 PM
 
 import requests
 import pymongo
-from pymongo import MongoClient
 from datetime import datetime
 import time
 import logging
 from typing import List, Dict, Optional
 import os
 from dotenv import load_dotenv
-from urllib.parse import quote_plus
+from mongo_pool import get_mongo_client
 from timezone_utils import now_for_mongo
+from nse_http_session import get_nse_session
+from response_cache import bump_versions
 
 # Load environment variables
 load_dotenv()
@@ -50,37 +51,29 @@ class NSEDataCollector:
         """Initialize MongoDB connection"""
         self.client = None
         self.db = None
+        self.http = get_nse_session()  # Shared pooled session with NSE cookies
         self.collection = None
         self._connect_mongo()
     
     def _connect_mongo(self):
         """Establish MongoDB connection with error handling"""
         try:
-            if MONGO_USERNAME and MONGO_PASSWORD:
-                # URL-encode username and password to handle special characters like @, :, etc.
-                encoded_username = quote_plus(MONGO_USERNAME)
-                encoded_password = quote_plus(MONGO_PASSWORD)
-                # Get auth source (default to 'admin' for MongoDB) - REQUIRED for authentication
-                MONGO_AUTH_SOURCE = os.getenv('MONGO_AUTH_SOURCE', 'admin')
-                # Build connection string with authSource parameter (required for MongoDB auth)
-                mongo_uri = f"mongodb://{encoded_username}:{encoded_password}@{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB_NAME}?authSource={MONGO_AUTH_SOURCE}"
-            else:
-                mongo_uri = f"mongodb://{MONGO_HOST}:{MONGO_PORT}/"
-            
-            self.client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-            # Test connection
-            self.client.admin.command('ping')
+            # Shared, health-checked client: no new connection or ping per collector instance
+            self.client = get_mongo_client()
             self.db = self.client[MONGO_DB_NAME]
+            # Indexes (unique on date) are created once by schema_manager
             self.collection = self.db[MONGO_COLLECTION_NAME]
             
-            # Create unique index on date to prevent duplicates (one document per date)
-            self.collection.create_index([("date", 1)], unique=True)
-            
             # Only log connection errors, not successful connections
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
             raise
     
+    def _ensure_connection(self):
+        """Rebind collections if the shared MongoDB client was replaced after a failed health check"""
+        if self.client is not get_mongo_client():
+            self._connect_mongo()
+    
     def _fetch_data_with_retry(self) -> Optional[List[Dict]]:
         """
         Fetch data from NSE API with retry logic
@@ -99,7 +92,7 @@ class NSEDataCollector:
                 if attempt == MAX_RETRIES:
                     logger.warning(f"Final attempt to fetch data from NSE API")
                 
-                response = requests.get(NSE_API_URL, headers=headers, timeout=30)
+                response = self.http.get(NSE_API_URL, headers=headers, timeout=30)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -209,6 +202,9 @@ class NSEDataCollector:
                 except Exception as e:
                     logger.error(f"Error saving record for date {date}: {str(e)}")
             
+            if success_count > 0 or updated_count > 0:
+                bump_versions(self.collection.database, [self.collection.name])
+            
             # Data save completed silently
             return success_count > 0 or updated_count > 0
             
@@ -221,6 +217,7 @@ class NSEDataCollector:
         Main method to collect data and save to MongoDB
         Returns: True if successful, False otherwise
         """
+        self._ensure_connection()
         try:
             # Starting NSE data collection
             
@@ -244,9 +241,11 @@ class NSEDataCollector:
             return False
     
     def close(self):
-        """Close MongoDB connection"""
-        if self.client:
-            self.client.close()
+        """
+        Release this collector
+        The shared MongoDB client stays open, so a collector can be kept and reused after close()
+        """
+        logger.debug("Collector released (shared MongoDB client kept open)")
             # MongoDB connection closed
 
 
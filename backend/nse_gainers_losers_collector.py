@@ -5,14 +5,16 @@ Collects data from NSE API for gainers and losers and stores in MongoDB
 
 import requests
 import pymongo
-from pymongo import MongoClient
 from datetime import datetime
 import time
 from typing import Optional, Dict
 import os
 from dotenv import load_dotenv
-from urllib.parse import quote_plus
+from mongo_pool import get_mongo_client
 from logger_config import get_logger
+from nse_http_session import get_nse_session
+from timeseries_store import get_timeseries_store, is_timeseries_backend, read_view_name, MARKET_MOVERS_TS_COLLECTION_NAME
+from response_cache import bump_versions
 
 # Load environment variables
 load_dotenv()
@@ -45,6 +47,7 @@ class NSEGainersLosersCollector:
         """Initialize MongoDB connection"""
         self.client = None
         self.db = None
+        self.http = get_nse_session()  # Shared pooled session with NSE cookies
         self.gainers_collection = None
         self.losers_collection = None
         self._connect_mongo()
@@ -52,42 +55,24 @@ class NSEGainersLosersCollector:
     def _connect_mongo(self):
         """Establish MongoDB connection with error handling"""
         try:
-            if MONGO_USERNAME and MONGO_PASSWORD:
-                # URL-encode username and password to handle special characters
-                encoded_username = quote_plus(MONGO_USERNAME)
-                encoded_password = quote_plus(MONGO_PASSWORD)
-                MONGO_AUTH_SOURCE = os.getenv('MONGO_AUTH_SOURCE', 'admin')
-                mongo_uri = f"mongodb://{encoded_username}:{encoded_password}@{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB_NAME}?authSource={MONGO_AUTH_SOURCE}"
-            else:
-                mongo_uri = f"mongodb://{MONGO_HOST}:{MONGO_PORT}/"
-            
-            self.client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-            # Test connection
-            self.client.admin.command('ping')
+            # Shared, health-checked client: no new connection or ping per collector instance
+            self.client = get_mongo_client()
             self.db = self.client[MONGO_DB_NAME]
             
-            # Initialize collections
+            # Initialize collections (indexes are created once by schema_manager)
             self.gainers_collection = self.db[MONGO_GAINERS_COLLECTION_NAME]
             self.losers_collection = self.db[MONGO_LOSERS_COLLECTION_NAME]
             
-            # Create unique index on timestamp to prevent duplicates
-            try:
-                self.gainers_collection.create_index([("timestamp", 1)], unique=True)
-            except Exception as e:
-                if "already exists" not in str(e).lower():
-                    logger.debug(f"Gainers index creation note: {str(e)}")
-            
-            try:
-                self.losers_collection.create_index([("timestamp", 1)], unique=True)
-            except Exception as e:
-                if "already exists" not in str(e).lower():
-                    logger.debug(f"Losers index creation note: {str(e)}")
-            
             logger.info(f"Successfully connected to MongoDB at {MONGO_HOST}:{MONGO_PORT}")
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
             raise
     
+    def _ensure_connection(self):
+        """Rebind collections if the shared MongoDB client was replaced after a failed health check"""
+        if self.client is not get_mongo_client():
+            self._connect_mongo()
+    
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for NSE API requests"""
         return {
@@ -112,7 +97,7 @@ class NSEGainersLosersCollector:
             try:
                 logger.info(f"Fetching {data_type} data (Attempt {attempt}/{MAX_RETRIES})")
                 
-                response = requests.get(api_url, headers=headers, timeout=30)
+                response = self.http.get(api_url, headers=headers, timeout=30)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -216,6 +201,10 @@ class NSEGainersLosersCollector:
                 logger.debug(f"Data structure sample: {str(data)[:500]}")
                 return False
             
+            # Time-series backend: insert into the shared market movers collection (symbol = data type)
+            if is_timeseries_backend():
+                return get_timeseries_store(self.db).save_snapshot(MARKET_MOVERS_TS_COLLECTION_NAME, data_type, data, timestamp)
+            
             # Use upsert with timestamp as unique identifier
             result = collection.update_one(
                 {"timestamp": timestamp},
@@ -230,6 +219,8 @@ class NSEGainersLosersCollector:
                 },
                 upsert=True
             )
+            if result.upserted_id or result.modified_count > 0:
+                bump_versions(self.db, [collection.name])
             
             if result.upserted_id:
                 logger.info(f"Inserted new {data_type} record with timestamp: {timestamp}")
@@ -256,6 +247,7 @@ class NSEGainersLosersCollector:
             data_type: Type of data ("gainers" or "losers")
         Returns: True if successful, False otherwise
         """
+        self._ensure_connection()
         try:
             if data_type == "gainers":
                 api_url = GAINERS_API_URL
@@ -296,18 +288,24 @@ class NSEGainersLosersCollector:
         Args:
             data_type: Type of data ("gainers" or "losers")
         Returns: MongoDB collection object or None
+        In the time-series backend this is the read-only view over the time-series collection
         """
         if data_type == "gainers":
-            return self.gainers_collection
+            collection = self.gainers_collection
         elif data_type == "losers":
-            return self.losers_collection
-        return None
+            collection = self.losers_collection
+        else:
+            return None
+        if is_timeseries_backend():
+            return self.db[read_view_name(collection.name)]
+        return collection
     
     def close(self):
-        """Close MongoDB connection"""
-        if self.client:
-            self.client.close()
-            logger.info("MongoDB connection closed")
+        """
+        Release this collector
+        The shared MongoDB client stays open, so a collector can be kept and reused after close()
+        """
+        logger.debug("Collector released (shared MongoDB client kept open)")
 
 
 def main():
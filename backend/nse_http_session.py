@@ -0,0 +1,185 @@
+"""
+Shared HTTP session for NSE API requests
+Provides a process-wide pooled requests.Session with keep-alive connections,
+per-host connection limits and automatic cookie warm-up against the NSE homepage
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from logger_config import get_logger
+from rate_limiter import get_rate_limiter
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Configuration
+NSE_HOMEPAGE_URL = "https://www.nseindia.com/"
+NSE_POOL_CONNECTIONS = int(os.getenv('NSE_POOL_CONNECTIONS', 4))  # Number of hosts to keep pools for
+NSE_POOL_MAXSIZE = int(os.getenv('NSE_POOL_MAXSIZE', 8))  # Max open connections per host
+NSE_COOKIE_TTL_SECONDS = int(os.getenv('NSE_COOKIE_TTL_SECONDS', 600))  # Re-prime cookies after this age
+COOKIE_REFRESH_STATUS_CODES = (401, 403)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive'
+}
+
+HOMEPAGE_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+}
+
+
+class NSEHttpSession:
+    """Pooled, cookie-primed HTTP session shared by all NSE collectors"""
+
+    def __init__(self):
+        """Create the underlying requests session and connection pools"""
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        # pool_block=True makes NSE_POOL_MAXSIZE a hard per-host connection limit
+        self.adapter = HTTPAdapter(
+            pool_connections=NSE_POOL_CONNECTIONS,
+            pool_maxsize=NSE_POOL_MAXSIZE,
+            pool_block=True
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        self._cookie_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._cookies_primed_at = None
+        self._stats = {
+            "requests": 0,
+            "cookie_refreshes": 0,
+            "cookie_refresh_failures": 0,
+            "auth_retries": 0
+        }
+
+    def _increment(self, key: str, amount: int = 1):
+        """Increment a stats counter"""
+        with self._stats_lock:
+            self._stats[key] = self._stats.get(key, 0) + amount
+
+    def _throttle(self, url: str):
+        """Wait for the shared per-host rate limiter before sending a request"""
+        host = urlparse(url).hostname or ""
+        if not get_rate_limiter().acquire(host):
+            raise requests.exceptions.RequestException(f"Rate limit wait exceeded for {host}")
+
+    def _cookies_expired(self) -> bool:
+        """Check if the NSE cookies need to be (re)primed"""
+        if self._cookies_primed_at is None:
+            return True
+        return (time.monotonic() - self._cookies_primed_at) > NSE_COOKIE_TTL_SECONDS
+
+    def prime_cookies(self, force: bool = False) -> bool:
+        """
+        Visit the NSE homepage so the session picks up the cookies NSE expects on API calls
+        Args:
+            force: Refresh even if the current cookies are still within their TTL
+        Returns: True if cookies are primed, False if the homepage request failed
+        """
+        primed_at = self._cookies_primed_at
+        with self._cookie_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if not force and not self._cookies_expired():
+                return True
+            if force and self._cookies_primed_at != primed_at:
+                return True
+
+            try:
+                self._throttle(NSE_HOMEPAGE_URL)
+                response = self.session.get(NSE_HOMEPAGE_URL, headers=HOMEPAGE_HEADERS, timeout=30)
+                response.raise_for_status()
+                self._cookies_primed_at = time.monotonic()
+                self._increment("cookie_refreshes")
+                logger.debug(f"Primed NSE cookies ({len(self.session.cookies)} cookies)")
+                return True
+            except requests.exceptions.RequestException as e:
+                self._increment("cookie_refresh_failures")
+                logger.warning(f"Failed to prime NSE cookies: {str(e)}")
+                return False
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30, **kwargs) -> requests.Response:
+        """
+        Send a GET request through the shared session
+        Cookies are primed on first use, refreshed after NSE_COOKIE_TTL_SECONDS,
+        and refreshed once more (with a single retry) when NSE answers 401/403
+        Every request (including cookie priming) waits for the shared per-host rate limiter
+        Args:
+            url: Request URL
+            headers: Extra per-request headers
+            timeout: Request timeout in seconds
+        Returns: requests.Response (caller is responsible for raise_for_status)
+        """
+        if self._cookies_expired():
+            self.prime_cookies()
+
+        self._throttle(url)
+        self._increment("requests")
+        response = self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+
+        if response.status_code in COOKIE_REFRESH_STATUS_CODES:
+            logger.debug(f"NSE returned {response.status_code} for {url}, refreshing cookies")
+            response.close()
+            self._increment("auth_retries")
+            if self.prime_cookies(force=True):
+                self._throttle(url)
+                self._increment("requests")
+                response = self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+
+        return response
+
+    def _pool_counters(self) -> Dict[str, int]:
+        """Sum connection and request counters across the urllib3 host pools"""
+        connections = 0
+        requests_sent = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += getattr(pool, "num_connections", 0)
+            requests_sent += getattr(pool, "num_requests", 0)
+        return {"connections_opened": connections, "pool_requests": requests_sent}
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get session statistics
+        Returns: Dictionary with request, connection, handshake-saved and cookie-refresh counts
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update(self._pool_counters())
+        # Every request served on an already-open connection skipped a TCP+TLS handshake
+        stats["handshakes_saved"] = max(0, stats["pool_requests"] - stats["connections_opened"])
+        stats["rate_limiter"] = get_rate_limiter().get_stats()
+        return stats
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+# Global instance
+_nse_session = None
+_nse_session_lock = threading.Lock()
+
+def get_nse_session() -> NSEHttpSession:
+    """Get global NSE HTTP session instance"""
+    global _nse_session
+    if _nse_session is None:
+        with _nse_session_lock:
+            if _nse_session is None:
+                _nse_session = NSEHttpSession()
+    return _nse_session
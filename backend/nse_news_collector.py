@@ -9,13 +9,13 @@ from datetime import datetime, timedelta
 from textblob import TextBlob
 import pytz
 import pymongo
-from pymongo import MongoClient
 import logging
 from typing import List, Dict, Optional
 import os
 from dotenv import load_dotenv
-from urllib.parse import quote_plus
+from mongo_pool import get_mongo_client
 from timezone_utils import now_for_mongo
+from bulk_writer import BulkWriteBuffer
 
 # Load environment variables
 load_dotenv()
@@ -89,36 +89,22 @@ class NSENewsCollector:
     def _connect_mongo(self):
         """Establish MongoDB connection with error handling"""
         try:
-            if MONGO_USERNAME and MONGO_PASSWORD:
-                # URL-encode username and password to handle special characters like @, :, etc.
-                encoded_username = quote_plus(MONGO_USERNAME)
-                encoded_password = quote_plus(MONGO_PASSWORD)
-                # Get auth source (default to 'admin' for MongoDB) - REQUIRED for authentication
-                MONGO_AUTH_SOURCE = os.getenv('MONGO_AUTH_SOURCE', 'admin')
-                # Build connection string with authSource parameter (required for MongoDB auth)
-                mongo_uri = f"mongodb://{encoded_username}:{encoded_password}@{MONGO_HOST}:{MONGO_PORT}/{MONGO_DB_NAME}?authSource={MONGO_AUTH_SOURCE}"
-            else:
-                mongo_uri = f"mongodb://{MONGO_HOST}:{MONGO_PORT}/"
-            
-            self.client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-            # Test connection
-            self.client.admin.command('ping')
+            # Shared, health-checked client: no new connection or ping per collector instance
+            self.client = get_mongo_client()
             self.db = self.client[MONGO_DB_NAME]
+            # Indexes (unique on date + keyword + link) are created once by schema_manager
             self.collection = self.db[MONGO_COLLECTION_NAME]
             
-            # Create unique index on (date, keyword, link) to prevent duplicates
-            self.collection.create_index([("date", 1), ("keyword", 1), ("link", 1)], unique=True)
-            
-            # Create indexes for faster queries
-            self.collection.create_index([("date", -1)])
-            self.collection.create_index([("keyword", 1)])
-            self.collection.create_index([("sentiment", 1)])
-            
             logger.info(f"Successfully connected to MongoDB at {MONGO_HOST}:{MONGO_PORT}")
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
             raise
     
+    def _ensure_connection(self):
+        """Rebind collections if the shared MongoDB client was replaced after a failed health check"""
+        if self.client is not get_mongo_client():
+            self._connect_mongo()
+    
     def get_sentiment(self, text: str) -> str:
         """
         Analyze sentiment of text using TextBlob
@@ -222,16 +208,16 @@ class NSENewsCollector:
             logger.warning("No news items to save")
             return 0
         
-        saved_count = 0
-        skipped_count = 0
-        
+        # One unordered bulk_write for the whole cycle instead of a round-trip per article
+        buffer = BulkWriteBuffer(label="Google News")
         for item in news_items:
-            try:
-                # Remove insertedAt from item to avoid conflict with $setOnInsert
-                item_copy = {k: v for k, v in item.items() if k != "insertedAt"}
-                
-                # Use upsert to avoid duplicates based on unique index
-                result = self.collection.update_one(
+            # Remove insertedAt from item to avoid conflict with $setOnInsert
+            item_copy = {k: v for k, v in item.items() if k != "insertedAt"}
+            
+            # Use upsert to avoid duplicates based on unique index
+            buffer.add(
+                self.collection,
+                pymongo.UpdateOne(
                     {
                         "date": item["date"],
                         "keyword": item["keyword"],
@@ -247,21 +233,16 @@ class NSENewsCollector:
                         }
                     },
                     upsert=True
-                )
-                
-                if result.upserted_id:
-                    saved_count += 1
-                    logger.debug(f"Inserted news: {item['keyword']} - {item['title'][:50]}...")
-                else:
-                    skipped_count += 1
-                    logger.debug(f"Skipped duplicate: {item['keyword']} - {item['title'][:50]}...")
-            
-            except pymongo.errors.DuplicateKeyError:
-                skipped_count += 1
-                logger.debug(f"Duplicate news skipped: {item['keyword']} - {item['title'][:50]}...")
-            
-            except Exception as e:
-                logger.error(f"Error saving news item: {str(e)}")
+                ),
+                tag=item["link"]
+            )
+        
+        report = buffer.flush()
+        totals = report["totals"]
+        saved_count = totals["inserted"]
+        skipped_count = totals["operations"] - totals["inserted"] - totals["errors"]
+        if totals["errors"]:
+            logger.error(f"Error saving {totals['errors']} news items")
         
         logger.info(f"Saved {saved_count} news items, skipped {skipped_count} duplicates")
         return saved_count
@@ -271,6 +252,7 @@ class NSENewsCollector:
         Main method to collect news for all keywords and save to MongoDB
         Returns: True if successful, False otherwise
         """
+        self._ensure_connection()
         try:
             logger.info("Starting news collection...")
             
@@ -304,10 +286,11 @@ class NSENewsCollector:
             return False
     
     def close(self):
-        """Close MongoDB connection"""
-        if self.client:
-            self.client.close()
-            logger.info("MongoDB connection closed")
+        """
+        Release this collector
+        The shared MongoDB client stays open, so a collector can be kept and reused after close()
+        """
+        logger.debug("Collector released (shared MongoDB client kept open)")
 
 
 def main():
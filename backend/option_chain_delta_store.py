@@ -0,0 +1,459 @@
+"""
+Delta-encoded storage for option chain snapshots
+Writes a full keyframe periodically and per-strike deltas in between,
+and rebuilds any stored snapshot transparently for the API endpoints
+
+Document layout in delta mode:
+    keyframe: full NSE response + storage {"type": "keyframe", "chain": <own _id>, "seq": 0}
+    delta:    NSE response without records.data / filtered.data
+              + delta {"records": <row delta>, "filtered": <row delta>}
+              + storage {"type": "delta", "chain": <keyframe _id>, "seq": n}
+Each delta is relative to the previous snapshot (seq - 1) of the same chain.
+A chain never spans two trading days.
+A delta is only appended while its predecessor is still the tail of the chain in MongoDB (another
+process may have deleted it or extended the chain); otherwise a new keyframe is started.
+A snapshot whose chain has a gap cannot be rebuilt: it is returned as stored, with "incomplete": True.
+Snapshots moved to the cold archive (cold_archive.py) are stubs and are read back from their archive file.
+"""
+
+import copy
+import os
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import pymongo
+from bson import ObjectId
+from dotenv import load_dotenv
+from timezone_utils import now_for_mongo, parse_nse_timestamp
+from bulk_writer import OUTCOME_INSERTED, OUTCOME_DUPLICATE, OUTCOME_FAILED
+from response_cache import bump_versions
+from backup_incremental import record_deletions
+from cold_archive import is_archived, get_cold_archive
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Storage configuration
+OPTION_CHAIN_STORAGE_MODE = os.getenv('OPTION_CHAIN_STORAGE_MODE', 'full').lower()  # 'full' or 'delta'
+KEYFRAME_INTERVAL = int(os.getenv('OPTION_CHAIN_KEYFRAME_INTERVAL', 20))  # Snapshots per chain (keyframe + deltas)
+
+# Sections of the NSE response whose "data" array is delta-encoded
+DELTA_SECTIONS = ("records", "filtered")
+
+
+def is_delta_mode() -> bool:
+    """Check if option chain snapshots should be stored delta-encoded"""
+    return OPTION_CHAIN_STORAGE_MODE == 'delta'
+
+
+def _row_key(row: Dict) -> str:
+    """Key identifying a strike row (expiry + strike price)"""
+    expiry = row.get("expiryDates") or row.get("expiryDate") or ""
+    return f"{expiry}|{row.get('strikePrice')}"
+
+
+def _diff_values(old: Dict, new: Dict, prefix: List[str], set_fields: List, unset_fields: List):
+    """Collect changed (set) and removed (unset) field paths between two row dicts"""
+    for key, value in new.items():
+        path = prefix + [key]
+        old_value = old.get(key)
+        if isinstance(value, dict) and isinstance(old_value, dict):
+            _diff_values(old_value, value, path, set_fields, unset_fields)
+        elif key not in old or old_value != value:
+            set_fields.append([path, value])
+    for key in old:
+        if key not in new:
+            unset_fields.append(prefix + [key])
+
+
+def _set_path(target: Dict, path: List[str], value):
+    """Set a nested value by path"""
+    for key in path[:-1]:
+        child = target.get(key)
+        if not isinstance(child, dict):
+            child = {}
+            target[key] = child
+        target = child
+    target[path[-1]] = value
+
+
+def _unset_path(target: Dict, path: List[str]):
+    """Remove a nested value by path"""
+    for key in path[:-1]:
+        target = target.get(key)
+        if not isinstance(target, dict):
+            return
+    target.pop(path[-1], None)
+
+
+def diff_rows(old_rows: List[Dict], new_rows: List[Dict]) -> Dict:
+    """
+    Compute a per-strike delta between two data arrays
+    Returns: {"changed": [...], "added": [...], "removed": [...], "order": [...] (only if order differs)}
+    """
+    old_by_key = {_row_key(row): row for row in old_rows}
+    new_keys = [_row_key(row) for row in new_rows]
+    new_key_set = set(new_keys)
+
+    changed = []
+    added = []
+    for key, row in zip(new_keys, new_rows):
+        old_row = old_by_key.get(key)
+        if old_row is None:
+            added.append(row)
+            continue
+        set_fields, unset_fields = [], []
+        _diff_values(old_row, row, [], set_fields, unset_fields)
+        if set_fields or unset_fields:
+            entry = {"k": key}
+            if set_fields:
+                entry["s"] = set_fields
+            if unset_fields:
+                entry["u"] = unset_fields
+            changed.append(entry)
+
+    removed = [key for key in old_by_key if key not in new_key_set]
+
+    delta = {"changed": changed, "added": added, "removed": removed}
+    # Only store the row order when applying the delta would not reproduce it
+    implied_order = [_row_key(row) for row in old_rows if _row_key(row) in new_key_set] + [_row_key(row) for row in added]
+    if implied_order != new_keys:
+        delta["order"] = new_keys
+    return delta
+
+
+def apply_row_delta(old_rows: List[Dict], delta: Dict) -> List[Dict]:
+    """Apply a per-strike delta produced by diff_rows to a data array"""
+    removed = set(delta.get("removed", []))
+    rows = [copy.deepcopy(row) for row in old_rows if _row_key(row) not in removed]
+    rows_by_key = {_row_key(row): row for row in rows}
+
+    for entry in delta.get("changed", []):
+        row = rows_by_key.get(entry["k"])
+        if row is None:
+            continue
+        for path, value in entry.get("s", []):
+            _set_path(row, path, value)
+        for path in entry.get("u", []):
+            _unset_path(row, path)
+
+    for row in delta.get("added", []):
+        row = copy.deepcopy(row)
+        rows.append(row)
+        rows_by_key[_row_key(row)] = row
+
+    order = delta.get("order")
+    if order:
+        rows = [rows_by_key[key] for key in order if key in rows_by_key]
+    return rows
+
+
+def _section_rows(data: Dict, section: str) -> List[Dict]:
+    """Get the data array of a response section (records / filtered)"""
+    value = data.get(section)
+    if isinstance(value, dict) and isinstance(value.get("data"), list):
+        return value["data"]
+    return []
+
+
+def _trade_date(timestamp: str) -> Optional[str]:
+    """Trading date (YYYY-MM-DD) of an NSE timestamp"""
+    parsed = parse_nse_timestamp(timestamp)
+    return parsed.date().isoformat() if parsed else None
+
+
+class OptionChainDeltaStore:
+    """Writes and reads delta-encoded option chain snapshots"""
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL):
+        """Initialize per-collection chain state (kept in memory for the life of the process)"""
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._state = {}  # collection name -> {"chain", "seq", "timestamp", "trade_date", "snapshot"}
+        self._lock = threading.Lock()
+
+    def reset(self, collection_name: str):
+        """Forget the chain state for a collection so the next write starts a new keyframe"""
+        with self._lock:
+            self._state.pop(collection_name, None)
+
+    def _is_chain_tail(self, collection, state: Dict) -> bool:
+        """Check that the snapshot a chain state ends with is still the last one of its chain in MongoDB"""
+        tail = collection.find_one(
+            {"storage.chain": state["chain"]},
+            {"storage.seq": 1},
+            sort=[("storage.seq", pymongo.DESCENDING)]
+        )
+        return tail is not None and tail["storage"]["seq"] == state["seq"]
+
+    def _build_document(self, collection, data: Dict) -> Tuple[Dict, Dict]:
+        """
+        Build the document to insert for a snapshot
+        Returns: (document, new chain state)
+        """
+        records = data.get("records", {})
+        timestamp = records.get("timestamp") if isinstance(records, dict) else None
+        trade_date = _trade_date(timestamp)
+        data_count = len(_section_rows(data, "records"))
+
+        with self._lock:
+            state = self._state.get(collection.name)
+
+        start_keyframe = (
+            state is None
+            or state["seq"] + 1 >= self.keyframe_interval
+            or state["trade_date"] != trade_date
+        )
+        if not start_keyframe and not self._is_chain_tail(collection, state):
+            # Deleted or extended by another process (admin panel, scheduler): a delta would have the wrong base
+            logger.info(f"Chain {state['chain']} of {collection.name} changed in another process, starting a new keyframe")
+            start_keyframe = True
+
+        doc_id = ObjectId()
+        snapshot = {section: _section_rows(data, section) for section in DELTA_SECTIONS}
+
+        if start_keyframe:
+            document = {
+                **data,
+                "_id": doc_id,
+                "dataCount": data_count,
+                "storage": {"type": "keyframe", "chain": doc_id, "seq": 0, "trade_date": trade_date}
+            }
+            new_state = {"chain": doc_id, "seq": 0, "timestamp": timestamp, "trade_date": trade_date, "snapshot": snapshot}
+            return document, new_state
+
+        document = {key: value for key, value in data.items() if key not in DELTA_SECTIONS}
+        delta = {}
+        for section in DELTA_SECTIONS:
+            section_value = data.get(section)
+            if isinstance(section_value, dict):
+                document[section] = {key: value for key, value in section_value.items() if key != "data"}
+                delta[section] = diff_rows(state["snapshot"][section], snapshot[section])
+            elif section_value is not None:
+                document[section] = section_value
+
+        seq = state["seq"] + 1
+        document.update({
+            "_id": doc_id,
+            "dataCount": data_count,
+            "delta": delta,
+            "storage": {"type": "delta", "chain": state["chain"], "seq": seq, "trade_date": trade_date}
+        })
+        new_state = {"chain": state["chain"], "seq": seq, "timestamp": timestamp, "trade_date": trade_date, "snapshot": snapshot}
+        return document, new_state
+
+    def prepare_snapshot(self, collection, data: Dict) -> Optional[Tuple[Dict, Callable[[str], None]]]:
+        """
+        Build the document for a snapshot without writing it (for batched bulk writes)
+        The chain state only advances once the returned callback reports the outcome
+        Args:
+            collection: MongoDB collection for the symbol
+            data: Full NSE option chain response (must contain records.timestamp)
+        Returns: (document to insert, outcome callback), or None if the snapshot is already stored
+        """
+        records = data.get("records", {})
+        timestamp = records.get("timestamp") if isinstance(records, dict) else None
+
+        with self._lock:
+            state = self._state.get(collection.name)
+        if state is not None and state["timestamp"] == timestamp:
+            logger.debug(f"Snapshot {timestamp} already stored in {collection.name} (no changes)")
+            return None
+
+        document, new_state = self._build_document(collection, data)
+        now = now_for_mongo()
+        document["insertedAt"] = now
+        document["updatedAt"] = now
+
+        def on_result(outcome: str):
+            if outcome == OUTCOME_INSERTED:
+                with self._lock:
+                    self._state[collection.name] = new_state
+                logger.debug(f"Stored {document['storage']['type']} for {collection.name} timestamp {timestamp} (seq {new_state['seq']})")
+            elif outcome == OUTCOME_FAILED:
+                # The chain may now have a gap, start over with a keyframe next time
+                self.reset(collection.name)
+
+        return document, on_result
+
+    def save_snapshot(self, collection, data: Dict) -> bool:
+        """
+        Save an option chain snapshot as a keyframe or delta document
+        Args:
+            collection: MongoDB collection for the symbol
+            data: Full NSE option chain response
+        Returns: True if stored (or already stored), False otherwise
+        """
+        records = data.get("records", {})
+        timestamp = records.get("timestamp") if isinstance(records, dict) else None
+        if not timestamp:
+            logger.error(f"Cannot save delta snapshot to {collection.name}: timestamp not found in data")
+            return False
+
+        prepared = self.prepare_snapshot(collection, data)
+        if prepared is None:
+            return True
+        document, on_result = prepared
+
+        try:
+            collection.insert_one(document)
+        except pymongo.errors.DuplicateKeyError:
+            logger.debug(f"Duplicate snapshot skipped for {collection.name} timestamp: {timestamp}")
+            on_result(OUTCOME_DUPLICATE)
+            return True
+        except Exception as e:
+            on_result(OUTCOME_FAILED)
+            logger.error(f"Failed to save delta snapshot to {collection.name}: {str(e)}")
+            return False
+
+        bump_versions(collection.database, [collection.name])
+        on_result(OUTCOME_INSERTED)
+        return True
+
+    def rebuild(self, collection, document: Dict) -> Dict:
+        """
+        Rebuild the full snapshot for a stored document
+        Full (non delta) documents are returned unchanged; if the chain has no keyframe or a gap
+        before the document, it is returned as stored with "incomplete": True
+        """
+        if not document or document.get("storage", {}).get("type") != "delta":
+            return document
+
+        storage = document["storage"]
+        chain_docs = list(collection.find(
+            {"storage.chain": storage["chain"], "storage.seq": {"$lte": storage["seq"]}}
+        ).sort("storage.seq", 1))
+
+        # Start from the most recent keyframe (a deleted snapshot may have promoted a later one)
+        start = None
+        for index, chain_doc in enumerate(chain_docs):
+            if chain_doc.get("storage", {}).get("type") == "keyframe":
+                start = index
+        if start is None:
+            logger.error(f"No keyframe found for {collection.name} chain {storage['chain']}")
+            return {**document, "incomplete": True}
+
+        expected_seq = chain_docs[start]["storage"]["seq"]
+        rows = {section: _section_rows(chain_docs[start], section) for section in DELTA_SECTIONS}
+        for chain_doc in chain_docs[start + 1:]:
+            expected_seq += 1
+            if chain_doc["storage"]["seq"] != expected_seq:
+                # The missing delta cannot be recovered: applying later ones would give wrong data
+                logger.error(f"Gap in {collection.name} chain {storage['chain']} at seq {expected_seq}, cannot rebuild {document['_id']}")
+                return {**document, "incomplete": True}
+            for section, section_delta in chain_doc.get("delta", {}).items():
+                rows[section] = apply_row_delta(rows.get(section, []), section_delta)
+
+        rebuilt = {key: value for key, value in document.items() if key != "delta"}
+        for section in DELTA_SECTIONS:
+            if isinstance(rebuilt.get(section), dict):
+                rebuilt[section] = {**rebuilt[section], "data": rows.get(section, [])}
+        return rebuilt
+
+    def find_snapshot(self, collection, query: Dict) -> Optional[Dict]:
+        """Find one stored snapshot and rebuild it if it is delta-encoded or read it from the cold archive"""
+        document = collection.find_one(query)
+        if is_archived(document):
+            return get_cold_archive().load(document) or document
+        return self.rebuild(collection, document)
+
+    def iter_snapshots(self, collection, query: Dict, batch_size: int = 200) -> Iterator[Dict]:
+        """
+        Iterate stored snapshots in insertion order, rebuilding delta documents as they stream
+        Chains are replayed in a single pass instead of re-reading each chain per document
+        Args:
+            collection: MongoDB collection for the symbol
+            query: Filter on the stored documents
+            batch_size: Cursor batch size
+        Yields: Full snapshot documents
+        """
+        chains = {}  # chain id -> {"seq", "rows"}
+        cursor = collection.find(query).sort("_id", 1).batch_size(batch_size)
+        for document in cursor:
+            if is_archived(document):
+                yield get_cold_archive().load(document) or document
+                continue
+            storage = document.get("storage")
+            if not storage:
+                yield document
+                continue
+
+            chain = chains.get(storage["chain"])
+            if storage["type"] == "keyframe":
+                rows = {section: _section_rows(document, section) for section in DELTA_SECTIONS}
+                chains[storage["chain"]] = {"seq": storage["seq"], "rows": rows}
+                yield document
+                continue
+
+            if chain is None or chain["seq"] + 1 != storage["seq"]:
+                # Chain started before the query window (or has a gap): rebuild from the database
+                rebuilt = self.rebuild(collection, document)
+                if rebuilt.get("incomplete"):
+                    # Later deltas of the chain go through rebuild as well (and are flagged the same way)
+                    chains.pop(storage["chain"], None)
+                else:
+                    chains[storage["chain"]] = {
+                        "seq": storage["seq"],
+                        "rows": {section: _section_rows(rebuilt, section) for section in DELTA_SECTIONS}
+                    }
+                yield rebuilt
+                continue
+
+            for section, section_delta in document.get("delta", {}).items():
+                chain["rows"][section] = apply_row_delta(chain["rows"].get(section, []), section_delta)
+            chain["seq"] = storage["seq"]
+
+            rebuilt = {key: value for key, value in document.items() if key != "delta"}
+            for section in DELTA_SECTIONS:
+                if isinstance(rebuilt.get(section), dict):
+                    rebuilt[section] = {**rebuilt[section], "data": chain["rows"].get(section, [])}
+            yield rebuilt
+
+    def delete_snapshot(self, collection, record_id: ObjectId) -> int:
+        """
+        Delete a stored snapshot without breaking its delta chain
+        If a later snapshot depends on this one, it is rewritten as a full keyframe first
+        Returns: Number of deleted documents
+        """
+        document = collection.find_one({"_id": record_id}, {"storage": 1})
+        if document is None:
+            return 0
+
+        storage = document.get("storage")
+        if storage:
+            successor = collection.find_one({
+                "storage.chain": storage["chain"],
+                "storage.seq": storage["seq"] + 1
+            })
+            if successor is None:
+                # Deleting the tail: the next write must not be a delta against it
+                # (other processes notice through the chain tail check)
+                self.reset(collection.name)
+            elif successor["storage"]["type"] == "delta":
+                full = self.rebuild(collection, successor)
+                if full.get("incomplete"):
+                    logger.warning(f"Chain {storage['chain']} of {collection.name} already has a gap, {successor['_id']} is left as a delta")
+                else:
+                    full["storage"] = {**successor["storage"], "type": "keyframe"}
+                    # Rewritten in place: a fresh updatedAt puts it in the next incremental backup
+                    full["updatedAt"] = now_for_mongo()
+                    collection.replace_one({"_id": successor["_id"]}, full)
+
+        result = collection.delete_one({"_id": record_id})
+        if result.deleted_count > 0:
+            record_deletions(collection.database, collection.name, [record_id])
+            bump_versions(collection.database, [collection.name])
+        return result.deleted_count
+
+
+# Global instance
+_delta_store = None
+
+def get_delta_store() -> OptionChainDeltaStore:
+    """Get global option chain delta store instance"""
+    global _delta_store
+    if _delta_store is None:
+        _delta_store = OptionChainDeltaStore()
+    return _delta_store
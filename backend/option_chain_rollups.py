@@ -0,0 +1,334 @@
+"""
+Incremental intraday rollups of the option chain summary series
+Keeps 5-minute, 15-minute and daily buckets per symbol of underlying OHLC, total OI and PCR;
+each bucket a new summary falls in is recomputed from every summary it holds and overwritten, so
+a pass repeated after a crash or run concurrently never double-counts (days that receive summaries
+older than the last rolled-up snapshot are recomputed whole)
+
+Bucket layout:
+    {"symbol": "NIFTY", "resolution": "5m", "bucket": <naive IST bucket start>, "trade_date": "2025-10-17",
+     "expiry": <nearest expiry of the first snapshot>, "count": 2,
+     "underlying": {"open", "high", "low", "close"}, "totalOI": {"open", "high", "low", "close"},
+     "pcrOI": {"open", "high", "low", "close", "sum", "count"}, "firstTs", "lastTs"}
+Rollups follow the nearest expiry collected at each snapshot time.
+"""
+
+import os
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import pymongo
+from dotenv import load_dotenv
+from option_chain_summary import get_summary_store
+from timezone_utils import now_for_mongo
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Rollup configuration
+OPTION_CHAIN_ROLLUPS_ENABLED = os.getenv('OPTION_CHAIN_ROLLUPS_ENABLED', 'true').lower() == 'true'
+ROLLUPS_COLLECTION_NAME = os.getenv('MONGO_OPTION_CHAIN_ROLLUPS_COLLECTION_NAME', 'option_chain_rollups')
+ROLLUP_STATE_COLLECTION_NAME = os.getenv('MONGO_OPTION_CHAIN_ROLLUP_STATE_COLLECTION_NAME', 'option_chain_rollup_state')
+
+# Resolution name -> bucket size in minutes (None for one bucket per trading day)
+RESOLUTIONS = {"5m": 5, "15m": 15, "1d": None}
+
+# Raw summaries arrive every collection cycle (3 minutes by default)
+RAW_INTERVAL_MINUTES = 3
+TRADING_MINUTES_PER_DAY = 375  # 09:15 to 15:30 IST
+
+# Finest first: the series endpoint picks the first one that fits in max_points
+SERIES_RESOLUTIONS = ("raw", "5m", "15m", "1d")
+
+
+def is_rollups_enabled() -> bool:
+    """Check if rollups should be updated after each collection cycle"""
+    return OPTION_CHAIN_ROLLUPS_ENABLED
+
+
+def bucket_start(ts: datetime, resolution: str) -> datetime:
+    """Start of the bucket a snapshot time falls in"""
+    minutes = RESOLUTIONS[resolution]
+    if minutes is None:
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    return ts.replace(minute=ts.minute - ts.minute % minutes, second=0, microsecond=0)
+
+
+def estimate_points(start: datetime, end: datetime, resolution: str) -> int:
+    """Estimated number of points a series of the given resolution has between two times"""
+    days = max(1, (end.date() - start.date()).days + 1)
+    if resolution == "1d":
+        return days
+    span_minutes = min(days * TRADING_MINUTES_PER_DAY, max(0.0, (end - start).total_seconds() / 60))
+    minutes = RAW_INTERVAL_MINUTES if resolution == "raw" else RESOLUTIONS[resolution]
+    return max(1, math.ceil(span_minutes / minutes))
+
+
+def pick_resolution(start: datetime, end: datetime, max_points: int) -> str:
+    """
+    Pick the resolution for a requested range
+    Returns: The finest resolution whose point count fits in max_points (daily if none does)
+    """
+    for resolution in SERIES_RESOLUTIONS:
+        if estimate_points(start, end, resolution) <= max_points:
+            return resolution
+    return SERIES_RESOLUTIONS[-1]
+
+
+def _expiry_sort_key(expiry: Optional[str]) -> datetime:
+    """Sort key for NSE expiry strings (unparseable expiries sort last)"""
+    try:
+        return datetime.strptime(expiry, "%d-%b-%Y")
+    except (TypeError, ValueError):
+        return datetime.max
+
+
+def _ohlc(values: List) -> Optional[Dict]:
+    """Open/high/low/close of a measure's values, oldest first (None without values)"""
+    values = [value for value in values if value is not None]
+    if not values:
+        return None
+    return {"open": values[0], "high": max(values), "low": min(values), "close": values[-1]}
+
+
+class OptionChainRollups:
+    """Maintains and queries the rollup buckets"""
+
+    def __init__(self, db):
+        """
+        Args:
+            db: pymongo Database the option chain collections live in
+        """
+        # Unique (symbol, resolution, bucket) index is created by schema_manager
+        self.collection = db[ROLLUPS_COLLECTION_NAME]
+        self.state_collection = db[ROLLUP_STATE_COLLECTION_NAME]
+        self.summary_store = get_summary_store(db)
+
+    def _bucket_fields(self, summaries: List[Dict]) -> Dict:
+        """Compute a bucket from every summary it holds (oldest first)"""
+        first, last = summaries[0], summaries[-1]
+        fields = {
+            "trade_date": first.get("trade_date"),
+            "expiry": first.get("expiry"),
+            "firstTs": first["ts"],
+            "lastTs": last["ts"],
+            "count": len(summaries),
+            "updatedAt": now_for_mongo()
+        }
+        total_oi = [
+            summary["totalCEOI"] + summary["totalPEOI"]
+            if summary.get("totalCEOI") is not None and summary.get("totalPEOI") is not None else None
+            for summary in summaries
+        ]
+        pcr = [summary.get("pcrOI") for summary in summaries]
+        for name, values in (("underlying", [summary.get("underlyingValue") for summary in summaries]), ("totalOI", total_oi), ("pcrOI", pcr)):
+            ohlc = _ohlc(values)
+            if ohlc is not None:
+                fields[name] = ohlc
+        if "pcrOI" in fields:
+            present = [value for value in pcr if value is not None]
+            fields["pcrOI"].update({"sum": sum(present), "count": len(present)})
+        return fields
+
+    def _nearest_expiry_summaries(self, symbol: str, after: Optional[datetime], until: Optional[datetime] = None) -> List[Dict]:
+        """Summaries in (after, until], one per snapshot time (nearest expiry), oldest first"""
+        query = {"symbol": symbol}
+        if after is not None or until is not None:
+            query["ts"] = {}
+            if after is not None:
+                query["ts"]["$gt"] = after
+            if until is not None:
+                query["ts"]["$lte"] = until
+        projection = {"_id": 0, "symbol": 1, "expiry": 1, "ts": 1, "trade_date": 1,
+                      "underlyingValue": 1, "totalCEOI": 1, "totalPEOI": 1, "pcrOI": 1}
+
+        nearest = {}
+        for summary in self.summary_store.collection.find(query, projection):
+            current = nearest.get(summary["ts"])
+            if current is None or _expiry_sort_key(summary.get("expiry")) < _expiry_sort_key(current.get("expiry")):
+                nearest[summary["ts"]] = summary
+        return [nearest[ts] for ts in sorted(nearest)]
+
+    def _recompute_day(self, symbol: str, day: datetime, only: Optional[set] = None) -> int:
+        """
+        Recompute buckets of one trading day from its summaries, overwriting them ($set)
+        Recomputing is idempotent: a pass repeated after a crash, or running concurrently with another
+        pass over the same summaries, writes the same buckets
+        Args:
+            symbol: Index or stock symbol
+            day: Start of the trading day
+            only: Optional set of (resolution, bucket start) to recompute (None for every bucket of the day)
+        Returns: Number of snapshots in the day
+        """
+        next_day = day + timedelta(days=1)
+        summaries = self._nearest_expiry_summaries(symbol, day - timedelta(microseconds=1), next_day - timedelta(microseconds=1))
+        buckets = {}
+        for summary in summaries:
+            for resolution in RESOLUTIONS:
+                key = (resolution, bucket_start(summary["ts"], resolution))
+                if only is None or key in only:
+                    buckets.setdefault(key, []).append(summary)
+        operations = [
+            pymongo.UpdateOne(
+                {"symbol": symbol, "resolution": resolution, "bucket": bucket},
+                {"$set": self._bucket_fields(members)},
+                upsert=True
+            )
+            for (resolution, bucket), members in buckets.items()
+        ]
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+        return len(summaries)
+
+    def update_symbol(self, symbol: str) -> int:
+        """
+        Roll up the summaries written since the last rollup into the symbol's buckets
+        The watermark is the summary _id (upserts get server-generated, increasing ids), so a summary
+        inserted late with an older snapshot time (manual collection, backfill) is still picked up:
+        the buckets of snapshots newer than the last rolled-up one are recomputed, and days that
+        received older snapshots are recomputed whole
+        Returns: Number of snapshots rolled up
+        """
+        summaries_collection = self.summary_store.collection
+        state = self.state_collection.find_one({"_id": symbol}) or {}
+        last_id, last_ts = state.get("lastId"), state.get("lastTs")
+        # Bound the pass: summaries written while it runs are handled next time
+        newest = summaries_collection.find_one({"symbol": symbol}, {"_id": 1}, sort=[("_id", pymongo.DESCENDING)])
+        if newest is None or newest["_id"] == last_id:
+            return 0
+
+        late_days = set()
+        if last_id is not None and last_ts is not None:
+            late = summaries_collection.find(
+                {"symbol": symbol, "_id": {"$gt": last_id, "$lte": newest["_id"]}, "ts": {"$lte": last_ts}},
+                {"_id": 0, "ts": 1}
+            )
+            late_days = {bucket_start(summary["ts"], "1d") for summary in late}
+
+        summaries = self._nearest_expiry_summaries(symbol, last_ts)
+        affected = {(resolution, bucket_start(summary["ts"], resolution)) for summary in summaries for resolution in RESOLUTIONS}
+        new_per_day = {}
+        for summary in summaries:
+            day = bucket_start(summary["ts"], "1d")
+            new_per_day[day] = new_per_day.get(day, 0) + 1
+
+        rolled_up = 0
+        for day in sorted(late_days | set(new_per_day)):
+            # Days that received older snapshots are recomputed whole, others only where new snapshots fell
+            if day in late_days:
+                rolled_up += self._recompute_day(symbol, day)
+            else:
+                self._recompute_day(symbol, day, affected)
+                rolled_up += new_per_day[day]
+
+        self.state_collection.update_one(
+            {"_id": symbol},
+            {"$set": {
+                "lastId": newest["_id"],
+                "lastTs": summaries[-1]["ts"] if summaries else last_ts,
+                "updatedAt": now_for_mongo()
+            }},
+            upsert=True
+        )
+        return rolled_up
+
+    def get_series(
+        self,
+        symbol: str,
+        resolution: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 0
+    ) -> List[Dict]:
+        """
+        Get rollup buckets of a symbol (oldest first)
+        Args:
+            symbol: Index or stock symbol
+            resolution: One of RESOLUTIONS
+            start: Inclusive lower bound on the bucket start (naive IST)
+            end: Inclusive upper bound on the bucket start (naive IST)
+            limit: Maximum points to return (0 means no limit)
+        Returns: List of bucket points with the average PCR filled in
+        """
+        query = {"symbol": symbol, "resolution": resolution}
+        if start or end:
+            query["bucket"] = {}
+            if start:
+                query["bucket"]["$gte"] = bucket_start(start, resolution)
+            if end:
+                query["bucket"]["$lte"] = end
+
+        projection = {"_id": 0, "bucket": 1, "expiry": 1, "count": 1, "underlying": 1, "totalOI": 1, "pcrOI": 1}
+        cursor = self.collection.find(query, projection).sort("bucket", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+
+        points = []
+        for point in cursor:
+            pcr = point.get("pcrOI")
+            if pcr:
+                pcr_count = pcr.pop("count", 0)
+                pcr_sum = pcr.pop("sum", 0)
+                pcr["avg"] = round(pcr_sum / pcr_count, 4) if pcr_count else None
+            point["ts"] = point.pop("bucket")
+            points.append(point)
+        return points
+
+    def get_raw_series(self, symbol: str, start: Optional[datetime], end: Optional[datetime], limit: int = 0) -> List[Dict]:
+        """Get per-snapshot points (nearest expiry) in the same shape as the rollup buckets"""
+        points = []
+        after = None if start is None else start - timedelta(microseconds=1)
+        for summary in self._nearest_expiry_summaries(symbol, after, end):
+            total_oi = None
+            if summary.get("totalCEOI") is not None and summary.get("totalPEOI") is not None:
+                total_oi = summary["totalCEOI"] + summary["totalPEOI"]
+            points.append({
+                "ts": summary["ts"],
+                "expiry": summary.get("expiry"),
+                "count": 1,
+                "underlying": {"close": summary.get("underlyingValue")},
+                "totalOI": {"close": total_oi},
+                "pcrOI": {"close": summary.get("pcrOI")}
+            })
+            if limit and len(points) >= limit:
+                break
+        return points
+
+
+def update_rollups(db, symbols: List[str]) -> Dict[str, int]:
+    """
+    Rollup stage run after a collection cycle; never raises
+    Args:
+        db: pymongo Database the option chain collections live in
+        symbols: Symbols collected successfully in the cycle
+    Returns: Dictionary of symbol -> snapshots rolled up
+    """
+    if not is_rollups_enabled():
+        return {}
+    rolled_up = {}
+    rollups = get_rollup_store(db)
+    for symbol in symbols:
+        try:
+            rolled_up[symbol] = rollups.update_symbol(symbol)
+        except Exception as e:
+            logger.error(f"Failed to update rollups for {symbol}: {str(e)}")
+    logger.debug(f"Rolled up {sum(rolled_up.values())} snapshots for {len(rolled_up)} symbols")
+    return rolled_up
+
+
+# Global instances (one per database)
+_rollup_stores = {}
+
+def get_rollup_store(db) -> OptionChainRollups:
+    """Get the rollup store for a database"""
+    key = db.name
+    store = _rollup_stores.get(key)
+    # Rebuild if the shared MongoDB client was replaced after a failed health check
+    if store is None or store.collection.database.client is not db.client:
+        store = OptionChainRollups(db)
+        _rollup_stores[key] = store
+    return store
@@ -0,0 +1,338 @@
+"""
+Per-snapshot option chain analytics summary
+Computes a compact document for every saved snapshot (PCR, max pain, OI totals, ATM strike)
+so dashboards can chart a whole day from kilobytes instead of downloading full snapshots
+
+Document layout (one per symbol, expiry and snapshot time):
+    {"symbol": "NIFTY", "expiry": "28-Oct-2025", "ts": <naive IST datetime>, "trade_date": "2025-10-17",
+     "snapshotTimestamp": "17-Oct-2025 15:30:00", "underlyingValue": 25010.5, "atmStrike": 25000.0,
+     "maxPain": 25000.0, "pcrOI": 0.91, "pcrVolume": 1.05, "totalCEOI": ..., "totalPEOI": ...,
+     "totalCEChangeOI": ..., "totalPEChangeOI": ..., "totalCEVolume": ..., "totalPEVolume": ...,
+     "strikeCount": 120}
+
+Usage (backfill):
+    python option_chain_summary.py --start-date 2025-10-01 [--end-date 2025-10-17] [--symbols NIFTY]
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+import pymongo
+from dotenv import load_dotenv
+from timezone_utils import now_for_mongo, parse_nse_timestamp
+from logger_config import get_logger
+from option_chain_timeseries import latest_expiry
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Summary configuration
+OPTION_CHAIN_SUMMARY_ENABLED = os.getenv('OPTION_CHAIN_SUMMARY_ENABLED', 'true').lower() == 'true'
+SUMMARY_COLLECTION_NAME = os.getenv('MONGO_OPTION_CHAIN_SUMMARY_COLLECTION_NAME', 'option_chain_summary')
+
+# Fields a summary series can return (besides ts and expiry)
+SUMMARY_FIELDS = (
+    "underlyingValue",
+    "atmStrike",
+    "maxPain",
+    "pcrOI",
+    "pcrVolume",
+    "totalCEOI",
+    "totalPEOI",
+    "totalCEChangeOI",
+    "totalPEChangeOI",
+    "totalCEVolume",
+    "totalPEVolume",
+    "strikeCount"
+)
+
+
+def is_summary_enabled() -> bool:
+    """Check if summaries should be computed for new snapshots"""
+    return OPTION_CHAIN_SUMMARY_ENABLED
+
+
+def _number(value) -> float:
+    """Convert an OI/volume/price value to float (0 if missing or not numeric)"""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    """Rounded ratio (None when the denominator is zero)"""
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def max_pain(strikes: np.ndarray, ce_oi: np.ndarray, pe_oi: np.ndarray) -> Optional[float]:
+    """
+    Strike at which option writers pay out the least at expiry
+    Args:
+        strikes: Array of strike prices
+        ce_oi: Call open interest per strike
+        pe_oi: Put open interest per strike
+    Returns: Max pain strike (None if there is no open interest)
+    """
+    if strikes.size == 0 or not (ce_oi.any() or pe_oi.any()):
+        return None
+    # payout[i] = value of all calls and puts if the underlying settles at strikes[i]
+    moneyness = strikes[:, None] - strikes[None, :]
+    payout = np.clip(moneyness, 0, None) @ ce_oi + np.clip(-moneyness, 0, None) @ pe_oi
+    return float(strikes[int(np.argmin(payout))])
+
+
+def summarize_snapshot(symbol: str, data: Dict) -> List[Dict]:
+    """
+    Summarize an NSE option chain response
+    Args:
+        symbol: Index or stock symbol
+        data: Full NSE option chain response
+    Returns: One summary document per expiry in the snapshot (empty if it has no timestamp or data)
+    """
+    records = data.get("records") if isinstance(data, dict) else None
+    if not isinstance(records, dict):
+        return []
+    ts = parse_nse_timestamp(records.get("timestamp"))
+    if ts is None:
+        return []
+    underlying = records.get("underlyingValue")
+
+    # expiry -> column lists
+    groups = {}
+    for strike_row in records.get("data") or []:
+        if not isinstance(strike_row, dict):
+            continue
+        try:
+            strike = float(strike_row.get("strikePrice"))
+        except (TypeError, ValueError):
+            continue
+        expiry = strike_row.get("expiryDates") or strike_row.get("expiryDate")
+        ce = strike_row.get("CE") if isinstance(strike_row.get("CE"), dict) else {}
+        pe = strike_row.get("PE") if isinstance(strike_row.get("PE"), dict) else {}
+        if underlying is None:
+            underlying = ce.get("underlyingValue") or pe.get("underlyingValue")
+
+        columns = groups.setdefault(expiry, {key: [] for key in (
+            "strike", "ce_oi", "pe_oi", "ce_chg", "pe_chg", "ce_vol", "pe_vol"
+        )})
+        columns["strike"].append(strike)
+        columns["ce_oi"].append(_number(ce.get("openInterest")))
+        columns["pe_oi"].append(_number(pe.get("openInterest")))
+        columns["ce_chg"].append(_number(ce.get("changeinOpenInterest")))
+        columns["pe_chg"].append(_number(pe.get("changeinOpenInterest")))
+        columns["ce_vol"].append(_number(ce.get("totalTradedVolume")))
+        columns["pe_vol"].append(_number(pe.get("totalTradedVolume")))
+
+    summaries = []
+    for expiry, columns in groups.items():
+        arrays = {key: np.array(values, dtype=float) for key, values in columns.items()}
+        strikes = arrays["strike"]
+        totals = {key: float(arrays[key].sum()) for key in ("ce_oi", "pe_oi", "ce_chg", "pe_chg", "ce_vol", "pe_vol")}
+
+        atm_strike = None
+        if underlying is not None and strikes.size:
+            atm_strike = float(strikes[int(np.argmin(np.abs(strikes - float(underlying))))])
+
+        summaries.append({
+            "symbol": symbol,
+            "expiry": expiry,
+            "ts": ts,
+            "trade_date": ts.date().isoformat(),
+            "snapshotTimestamp": records.get("timestamp"),
+            "underlyingValue": underlying,
+            "atmStrike": atm_strike,
+            "maxPain": max_pain(strikes, arrays["ce_oi"], arrays["pe_oi"]),
+            "pcrOI": _ratio(totals["pe_oi"], totals["ce_oi"]),
+            "pcrVolume": _ratio(totals["pe_vol"], totals["ce_vol"]),
+            "totalCEOI": totals["ce_oi"],
+            "totalPEOI": totals["pe_oi"],
+            "totalCEChangeOI": totals["ce_chg"],
+            "totalPEChangeOI": totals["pe_chg"],
+            "totalCEVolume": totals["ce_vol"],
+            "totalPEVolume": totals["pe_vol"],
+            "strikeCount": int(strikes.size)
+        })
+    return summaries
+
+
+class OptionChainSummary:
+    """Writes and queries per-snapshot summaries"""
+
+    def __init__(self, db):
+        """
+        Args:
+            db: pymongo Database the option chain collections live in
+        """
+        # Unique (symbol, expiry, ts) and (symbol, ts) indexes are created by schema_manager
+        self.collection = db[SUMMARY_COLLECTION_NAME]
+
+    def _upsert(self, summary: Dict) -> pymongo.UpdateOne:
+        """Snapshot-keyed upsert for a summary document"""
+        return pymongo.UpdateOne(
+            {"symbol": summary["symbol"], "expiry": summary["expiry"], "ts": summary["ts"]},
+            {"$set": {**summary, "updatedAt": now_for_mongo()}},
+            upsert=True
+        )
+
+    def queue_summary(self, buffer, symbol: str, data: Dict) -> int:
+        """
+        Summarize a snapshot and queue the upserts on a BulkWriteBuffer
+        Args:
+            buffer: bulk_writer.BulkWriteBuffer for the current cycle
+            symbol: Index or stock symbol
+            data: Full NSE option chain response
+        Returns: Number of summaries queued
+        """
+        summaries = summarize_snapshot(symbol, data)
+        for summary in summaries:
+            buffer.add(self.collection, self._upsert(summary))
+        return len(summaries)
+
+    def save_summaries(self, summaries: List[Dict]) -> int:
+        """
+        Upsert summaries in one unordered bulk write
+        Returns: Number of documents inserted or updated
+        """
+        if not summaries:
+            return 0
+        result = self.collection.bulk_write([self._upsert(summary) for summary in summaries], ordered=False)
+        return result.upserted_count + result.modified_count
+
+    def get_latest_expiry(self, symbol: str) -> Optional[str]:
+        """Get the nearest expiry of the most recent snapshot for a symbol"""
+        return latest_expiry(self.collection, symbol)
+
+    def get_summary_series(
+        self,
+        symbol: str,
+        expiry: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fields: Optional[List[str]] = None,
+        limit: int = 0
+    ) -> Dict:
+        """
+        Get the summary series of a symbol
+        Args:
+            symbol: Index or stock symbol
+            expiry: Expiry date as stored by NSE (None uses the latest summarized expiry)
+            start: Inclusive lower bound on the snapshot time (naive IST)
+            end: Inclusive upper bound on the snapshot time (naive IST)
+            fields: Summary fields to return (None returns all of SUMMARY_FIELDS)
+            limit: Maximum points to return (0 means no limit)
+        Returns: Dictionary with the resolved expiry and the list of points (oldest first)
+        """
+        if expiry is None:
+            expiry = self.get_latest_expiry(symbol)
+
+        query = {"symbol": symbol, "expiry": expiry}
+        if start or end:
+            query["ts"] = {}
+            if start:
+                query["ts"]["$gte"] = start
+            if end:
+                query["ts"]["$lte"] = end
+
+        projection = {field: 1 for field in ["ts"] + list(fields or SUMMARY_FIELDS)}
+        projection["_id"] = 0
+
+        cursor = self.collection.find(query, projection).sort("ts", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+
+        return {"symbol": symbol, "expiry": expiry, "points": list(cursor)}
+
+
+def ingest_summary(db, symbol: str, data: Dict) -> int:
+    """
+    Summary stage run after a snapshot is saved; never raises
+    Returns: Number of summaries written (0 if disabled or on error)
+    """
+    if not is_summary_enabled():
+        return 0
+    try:
+        return get_summary_store(db).save_summaries(summarize_snapshot(symbol, data))
+    except Exception as e:
+        logger.error(f"Failed to summarize option chain for {symbol}: {str(e)}")
+        return 0
+
+
+# Global instances (one per database)
+_summary_stores = {}
+
+def get_summary_store(db) -> OptionChainSummary:
+    """Get the summary store for a database"""
+    key = db.name
+    store = _summary_stores.get(key)
+    # Rebuild if the shared MongoDB client was replaced after a failed health check
+    if store is None or store.collection.database.client is not db.client:
+        store = OptionChainSummary(db)
+        _summary_stores[key] = store
+    return store
+
+
+def backfill(symbols: Optional[List[str]], start_date: datetime, end_date: datetime, batch_size: int = 200) -> Dict[str, int]:
+    """
+    Summarize stored snapshots (batch job over history)
+    Args:
+        symbols: Symbols to process (None for every index and bank)
+        start_date: First trading day (inclusive)
+        end_date: Last trading day (inclusive)
+        batch_size: Summaries per bulk write
+    Returns: Dictionary of symbol -> documents written
+    """
+    # Imported here: the collectors import this module for the ingest stage
+    from mongo_pool import get_mongo_db
+    from option_chain_delta_store import get_delta_store
+    from schema_manager import get_option_chain_collection_names
+
+    _, db = get_mongo_db()
+    store = get_summary_store(db)
+    delta_store = get_delta_store()
+    query = {"insertedAt": {"$gte": start_date, "$lt": end_date + timedelta(days=1)}}
+
+    written = {}
+    for symbol, collection_name in get_option_chain_collection_names().items():
+        if symbols and symbol not in symbols:
+            continue
+        written[symbol] = 0
+        pending = []
+        for snapshot in delta_store.iter_snapshots(db[collection_name], query, batch_size=batch_size):
+            pending.extend(summarize_snapshot(symbol, snapshot))
+            if len(pending) >= batch_size:
+                written[symbol] += store.save_summaries(pending)
+                pending = []
+        written[symbol] += store.save_summaries(pending)
+        logger.info(f"Summary backfill {symbol}: {written[symbol]} documents")
+    return written
+
+
+def main():
+    """Command line entry point for the history backfill"""
+    parser = argparse.ArgumentParser(description="Backfill option chain summaries")
+    parser.add_argument("--start-date", required=True, help="First trading day (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="Last trading day (YYYY-MM-DD, default: start date)")
+    parser.add_argument("--symbols", help="Comma separated symbols (default: all indices and banks)")
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
+        end_date = datetime.strptime(args.end_date, "%Y-%m-%d") if args.end_date else start_date
+    except ValueError as e:
+        print(f"Invalid date: {e}")
+        sys.exit(2)
+
+    symbols = [symbol.strip().upper() for symbol in args.symbols.split(",")] if args.symbols else None
+    written = backfill(symbols, start_date, end_date)
+    print(f"Wrote {sum(written.values())} summary documents for {len(written)} symbols")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Normalized per-strike option chain time series
+Flattens every saved option chain snapshot into one row per
+(symbol, expiry, strike, type, timestamp) so single-strike intraday series
+can be read straight off an index instead of scanning full snapshots
+
+Row layout:
+    {"symbol": "NIFTY", "expiry": "28-Oct-2025", "strike": 24000.0, "type": "CE",
+     "ts": <naive IST datetime>, "trade_date": "2025-10-17",
+     "underlyingValue": ..., "openInterest": ..., "lastPrice": ..., ...}
+"""
+
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+import pymongo
+from dotenv import load_dotenv
+from timezone_utils import now_for_mongo, parse_nse_timestamp
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Time series configuration
+OPTION_CHAIN_TIMESERIES_ENABLED = os.getenv('OPTION_CHAIN_TIMESERIES_ENABLED', 'true').lower() == 'true'
+STRIKES_COLLECTION_NAME = os.getenv('MONGO_OPTION_CHAIN_STRIKES_COLLECTION_NAME', 'option_chain_strikes')
+
+OPTION_TYPES = ("CE", "PE")
+
+# Per-leg fields copied from the NSE response into each row
+LEG_FIELDS = (
+    "openInterest",
+    "changeinOpenInterest",
+    "pchangeinOpenInterest",
+    "totalTradedVolume",
+    "impliedVolatility",
+    "lastPrice",
+    "change",
+    "pChange",
+    "totalBuyQuantity",
+    "totalSellQuantity",
+    "bidQty",
+    "bidprice",
+    "askQty",
+    "askPrice"
+)
+
+# Fields every series query returns in addition to the requested ones
+SERIES_BASE_FIELDS = ("ts", "expiry", "strike", "type")
+
+
+def is_timeseries_enabled() -> bool:
+    """Check if snapshots should be flattened into the per-strike collection"""
+    return OPTION_CHAIN_TIMESERIES_ENABLED
+
+
+def _to_float(value) -> Optional[float]:
+    """Convert a strike price to float (None if not numeric)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def flatten_snapshot(symbol: str, data: Dict) -> List[Dict]:
+    """
+    Flatten an NSE option chain response into per-strike, per-type rows
+    Args:
+        symbol: Index or stock symbol (e.g. "NIFTY")
+        data: Full NSE option chain response
+    Returns: List of row dictionaries (empty if the snapshot has no timestamp or data)
+    """
+    records = data.get("records") if isinstance(data, dict) else None
+    if not isinstance(records, dict):
+        return []
+
+    ts = parse_nse_timestamp(records.get("timestamp"))
+    if ts is None:
+        return []
+
+    underlying = records.get("underlyingValue")
+    trade_date = ts.date().isoformat()
+    rows = []
+
+    for strike_row in records.get("data") or []:
+        if not isinstance(strike_row, dict):
+            continue
+        strike = _to_float(strike_row.get("strikePrice"))
+        if strike is None:
+            continue
+        expiry = strike_row.get("expiryDates") or strike_row.get("expiryDate")
+
+        for option_type in OPTION_TYPES:
+            leg = strike_row.get(option_type)
+            if not isinstance(leg, dict):
+                continue
+            row = {
+                "symbol": symbol,
+                "expiry": expiry or leg.get("expiryDate"),
+                "strike": strike,
+                "type": option_type,
+                "ts": ts,
+                "trade_date": trade_date,
+                "underlyingValue": leg.get("underlyingValue", underlying)
+            }
+            for field in LEG_FIELDS:
+                if field in leg:
+                    row[field] = leg[field]
+            rows.append(row)
+
+    return rows
+
+
+def latest_expiry(collection, symbol: str) -> Optional[str]:
+    """
+    Get the nearest expiry of the most recent snapshot for a symbol
+    Additional expiries share the snapshot time, so the earliest one stored at that time is picked
+
+    Args:
+        collection: Per-strike or summary collection ({symbol, expiry, ts} rows)
+        symbol: Symbol to look up
+
+    Returns:
+        Expiry string, or None when nothing is stored for the symbol
+    """
+    latest = collection.find_one({"symbol": symbol}, {"ts": 1}, sort=[("ts", -1)])
+    if latest is None:
+        return None
+    expiries = [expiry for expiry in collection.distinct("expiry", {"symbol": symbol, "ts": latest["ts"]}) if expiry]
+    return min(expiries, key=lambda expiry: parse_nse_timestamp(expiry) or datetime.max) if expiries else None
+
+
+class OptionChainTimeSeries:
+    """Writes and queries the normalized per-strike collection"""
+
+    def __init__(self, db):
+        """
+        Args:
+            db: pymongo Database the option chain collections live in
+        """
+        # Indexes (unique symbol/expiry/strike/type/ts and symbol/ts) are created by schema_manager
+        self.collection = db[STRIKES_COLLECTION_NAME]
+
+    def _build_rows(self, symbol: str, data: Dict) -> List[Dict]:
+        """Flatten a snapshot and stamp the rows with their insert time"""
+        rows = flatten_snapshot(symbol, data)
+        inserted_at = now_for_mongo()
+        for row in rows:
+            row["insertedAt"] = inserted_at
+        return rows
+
+    def ingest(self, symbol: str, data: Dict) -> int:
+        """
+        Flatten a snapshot and insert its rows
+        Rows that already exist (same symbol, expiry, strike, type, ts) are skipped
+        Args:
+            symbol: Index or stock symbol
+            data: Full NSE option chain response
+        Returns: Number of new rows inserted
+        """
+        rows = self._build_rows(symbol, data)
+        if not rows:
+            return 0
+
+        try:
+            result = self.collection.insert_many(rows, ordered=False)
+            return len(result.inserted_ids)
+        except pymongo.errors.BulkWriteError as e:
+            details = e.details or {}
+            errors = details.get("writeErrors", [])
+            # Duplicate key errors mean the snapshot was ingested already
+            other_errors = [err for err in errors if err.get("code") != 11000]
+            if other_errors:
+                logger.error(f"Failed to ingest {len(other_errors)} strike rows for {symbol}: {other_errors[0].get('errmsg')}")
+            return details.get("nInserted", 0)
+
+    def queue_rows(self, buffer, symbol: str, data: Dict) -> int:
+        """
+        Queue a snapshot's rows on a BulkWriteBuffer instead of inserting them directly
+        Args:
+            buffer: bulk_writer.BulkWriteBuffer for the current cycle
+            symbol: Index or stock symbol
+            data: Full NSE option chain response
+        Returns: Number of rows queued
+        """
+        rows = self._build_rows(symbol, data)
+        for row in rows:
+            buffer.add(self.collection, pymongo.InsertOne(row))
+        return len(rows)
+
+    def get_latest_expiry(self, symbol: str) -> Optional[str]:
+        """Get the nearest expiry of the most recent snapshot for a symbol"""
+        return latest_expiry(self.collection, symbol)
+
+    def get_strike_series(
+        self,
+        symbol: str,
+        strike: float,
+        option_type: str,
+        expiry: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fields: Optional[List[str]] = None,
+        limit: int = 0
+    ) -> Dict:
+        """
+        Get the intraday series of one strike leg
+        Args:
+            symbol: Index or stock symbol (e.g. "NIFTY")
+            strike: Strike price
+            option_type: "CE" or "PE"
+            expiry: Expiry date as stored by NSE (None uses the latest ingested expiry)
+            start: Inclusive lower bound on the snapshot time (naive IST)
+            end: Inclusive upper bound on the snapshot time (naive IST)
+            fields: Leg fields to return (None returns all of LEG_FIELDS plus underlyingValue)
+            limit: Maximum points to return (0 means no limit)
+        Returns: Dictionary with the resolved expiry and the list of points (oldest first)
+        """
+        if expiry is None:
+            expiry = self.get_latest_expiry(symbol)
+
+        query = {
+            "symbol": symbol,
+            "expiry": expiry,
+            "strike": float(strike),
+            "type": option_type.upper()
+        }
+        if start or end:
+            query["ts"] = {}
+            if start:
+                query["ts"]["$gte"] = start
+            if end:
+                query["ts"]["$lte"] = end
+
+        if fields:
+            projection = {field: 1 for field in list(SERIES_BASE_FIELDS) + list(fields)}
+        else:
+            projection = {field: 1 for field in list(SERIES_BASE_FIELDS) + list(LEG_FIELDS) + ["underlyingValue"]}
+        projection["_id"] = 0
+
+        cursor = self.collection.find(query, projection).sort("ts", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+
+        return {
+            "symbol": symbol,
+            "expiry": expiry,
+            "strike": float(strike),
+            "type": option_type.upper(),
+            "points": list(cursor)
+        }
+
+
+def ingest_snapshot(db, symbol: str, data: Dict) -> int:
+    """
+    Ingest stage run after a snapshot is saved; never raises
+    Args:
+        db: pymongo Database the option chain collections live in
+        symbol: Index or stock symbol
+        data: Full NSE option chain response
+    Returns: Number of rows inserted (0 if disabled or on error)
+    """
+    if not is_timeseries_enabled():
+        return 0
+    try:
+        inserted = get_timeseries(db).ingest(symbol, data)
+        logger.debug(f"Ingested {inserted} strike rows for {symbol}")
+        return inserted
+    except Exception as e:
+        logger.error(f"Failed to ingest strike rows for {symbol}: {str(e)}")
+        return 0
+
+
+# Global instances (one per database)
+_timeseries = {}
+
+def get_timeseries(db) -> OptionChainTimeSeries:
+    """Get the per-strike time series store for a database"""
+    key = db.name
+    timeseries = _timeseries.get(key)
+    # Rebuild if the shared MongoDB client was replaced after a failed health check
+    if timeseries is None or timeseries.collection.database.client is not db.client:
+        timeseries = OptionChainTimeSeries(db)
+        _timeseries[key] = timeseries
+    return timeseries
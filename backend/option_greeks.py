@@ -0,0 +1,461 @@
+"""
+Vectorized Black-Scholes implied volatility and Greeks for option chain snapshots
+Every leg of one or many snapshots is solved in a single set of NumPy array operations,
+both at ingest time and when backfilling stored history
+
+Document layout (one per symbol, expiry and snapshot time):
+    {"symbol": "NIFTY", "expiry": "28-Oct-2025", "ts": <naive IST datetime>, "trade_date": "2025-10-17",
+     "snapshotTimestamp": "17-Oct-2025 15:30:00", "underlyingValue": ..., "riskFreeRate": 0.065,
+     "strikes": [...],
+     "CE": {"iv": [...], "delta": [...], "gamma": [...], "theta": [...], "vega": [...], "rho": [...]},
+     "PE": {...}}
+Arrays are aligned with "strikes"; legs without a price or without a solution hold None.
+IV is in percent (like NSE's impliedVolatility), theta is per calendar day, vega and rho per 1% move.
+
+Usage (backfill):
+    python option_greeks.py --start-date 2025-10-01 --end-date 2025-10-17 [--symbols NIFTY,BANKNIFTY]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pymongo
+from dotenv import load_dotenv
+from timezone_utils import now_for_mongo, parse_nse_timestamp
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Greeks configuration
+OPTION_GREEKS_ENABLED = os.getenv('OPTION_GREEKS_ENABLED', 'true').lower() == 'true'
+GREEKS_COLLECTION_NAME = os.getenv('MONGO_OPTION_CHAIN_GREEKS_COLLECTION_NAME', 'option_chain_greeks')
+RISK_FREE_RATE = float(os.getenv('OPTION_GREEKS_RISK_FREE_RATE', 0.065))  # Annualized, continuously compounded
+DIVIDEND_YIELD = float(os.getenv('OPTION_GREEKS_DIVIDEND_YIELD', 0.0))
+
+# Solver settings
+IV_MIN = 1e-4
+IV_MAX = 5.0
+IV_INITIAL_GUESS = 0.3
+IV_PRICE_TOLERANCE = 1e-4
+IV_MAX_ITERATIONS = 50
+
+DAYS_PER_YEAR = 365.0
+EXPIRY_CUTOFF = (15, 30)  # NSE options expire at market close (IST)
+
+OPTION_TYPES = ("CE", "PE")
+GREEK_FIELDS = ("iv", "delta", "gamma", "theta", "vega", "rho")
+
+_SQRT_2 = np.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def is_greeks_enabled() -> bool:
+    """Check if Greeks should be computed for new snapshots"""
+    return OPTION_GREEKS_ENABLED
+
+
+def _erf(x: np.ndarray) -> np.ndarray:
+    """Vectorized error function (Abramowitz & Stegun 7.1.26, absolute error < 1.5e-7)"""
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return sign * (1.0 - poly * np.exp(-x * x))
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF"""
+    return 0.5 * (1.0 + _erf(x / _SQRT_2))
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal PDF"""
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def _d1_d2(spot, strike, years, sigma, rate, dividend_yield):
+    """Black-Scholes d1 and d2"""
+    vol_sqrt_t = sigma * np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate - dividend_yield + 0.5 * sigma * sigma) * years) / vol_sqrt_t
+    return d1, d1 - vol_sqrt_t
+
+
+def bs_price(spot, strike, years, sigma, is_call, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD) -> np.ndarray:
+    """
+    Black-Scholes price for arrays of European options
+    Args:
+        spot, strike, years, sigma: Arrays (or scalars) of underlying price, strike, time to expiry and volatility
+        is_call: Boolean array, True for calls
+        rate: Risk-free rate
+        dividend_yield: Continuous dividend yield
+    Returns: Array of option prices
+    """
+    d1, d2 = _d1_d2(spot, strike, years, sigma, rate, dividend_yield)
+    spot_df = spot * np.exp(-dividend_yield * years)
+    strike_df = strike * np.exp(-rate * years)
+    call = spot_df * norm_cdf(d1) - strike_df * norm_cdf(d2)
+    put = strike_df * norm_cdf(-d2) - spot_df * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def implied_volatility(price, spot, strike, years, is_call, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD) -> np.ndarray:
+    """
+    Solve Black-Scholes implied volatility for every option at once
+    Safeguarded Newton: each leg keeps a [low, high] bracket and falls back to bisection
+    whenever a Newton step would leave it, so every leg converges or stays NaN
+    Args:
+        price: Array of market prices
+        spot, strike, years, is_call: Arrays aligned with price
+        rate: Risk-free rate
+        dividend_yield: Continuous dividend yield
+    Returns: Array of volatilities (annualized, decimal); NaN where no solution exists
+    """
+    price, spot, strike, years = (np.asarray(value, dtype=float) for value in (price, spot, strike, years))
+    is_call = np.asarray(is_call, dtype=bool)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        spot_df = spot * np.exp(-dividend_yield * years)
+        strike_df = strike * np.exp(-rate * years)
+        lower_bound = np.where(is_call, np.maximum(spot_df - strike_df, 0.0), np.maximum(strike_df - spot_df, 0.0))
+        upper_bound = np.where(is_call, spot_df, strike_df)
+        valid = (
+            np.isfinite(price) & (price > 0) & (spot > 0) & (strike > 0) & (years > 0)
+            & (price > lower_bound) & (price < upper_bound)
+        )
+
+        sigma = np.full(price.shape, IV_INITIAL_GUESS)
+        low = np.full(price.shape, IV_MIN)
+        high = np.full(price.shape, IV_MAX)
+        converged = ~valid
+
+        for _ in range(IV_MAX_ITERATIONS):
+            active = ~converged
+            if not active.any():
+                break
+            d1, _ = _d1_d2(spot, strike, years, sigma, rate, dividend_yield)
+            diff = bs_price(spot, strike, years, sigma, is_call, rate, dividend_yield) - price
+            converged |= np.abs(diff) < IV_PRICE_TOLERANCE
+            active = ~converged
+
+            # Price is increasing in sigma, so the sign of diff tightens the bracket
+            high = np.where(active & (diff > 0), sigma, high)
+            low = np.where(active & (diff < 0), sigma, low)
+
+            vega = spot_df * norm_pdf(d1) * np.sqrt(years)
+            newton = sigma - diff / np.where(vega > 1e-10, vega, np.nan)
+            in_bracket = np.isfinite(newton) & (newton > low) & (newton < high)
+            sigma = np.where(active, np.where(in_bracket, newton, 0.5 * (low + high)), sigma)
+
+        diff = bs_price(spot, strike, years, sigma, is_call, rate, dividend_yield) - price
+        solved = valid & (np.abs(diff) < IV_PRICE_TOLERANCE * 10)
+    return np.where(solved, sigma, np.nan)
+
+
+def bs_greeks(spot, strike, years, sigma, is_call, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD) -> Dict[str, np.ndarray]:
+    """
+    Black-Scholes Greeks for arrays of options
+    Returns: Dictionary of arrays: delta, gamma, theta (per day), vega and rho (per 1% move)
+    """
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        d1, d2 = _d1_d2(spot, strike, years, sigma, rate, dividend_yield)
+        sqrt_t = np.sqrt(years)
+        q_df = np.exp(-dividend_yield * years)
+        r_df = np.exp(-rate * years)
+        pdf_d1 = norm_pdf(d1)
+        cdf_d1, cdf_d2 = norm_cdf(d1), norm_cdf(d2)
+        cdf_neg_d1, cdf_neg_d2 = norm_cdf(-d1), norm_cdf(-d2)
+
+        decay = -spot * q_df * pdf_d1 * sigma / (2.0 * sqrt_t)
+        call_theta = decay - rate * strike * r_df * cdf_d2 + dividend_yield * spot * q_df * cdf_d1
+        put_theta = decay + rate * strike * r_df * cdf_neg_d2 - dividend_yield * spot * q_df * cdf_neg_d1
+
+        return {
+            "delta": np.where(is_call, q_df * cdf_d1, -q_df * cdf_neg_d1),
+            "gamma": q_df * pdf_d1 / (spot * sigma * sqrt_t),
+            "theta": np.where(is_call, call_theta, put_theta) / DAYS_PER_YEAR,
+            "vega": spot * q_df * pdf_d1 * sqrt_t / 100.0,
+            "rho": np.where(is_call, strike * years * r_df * cdf_d2, -strike * years * r_df * cdf_neg_d2) / 100.0
+        }
+
+
+def _expiry_datetime(expiry: str) -> Optional[datetime]:
+    """Expiry date string (e.g. "28-Oct-2025") to its naive IST expiry time"""
+    try:
+        return datetime.strptime(expiry, "%d-%b-%Y").replace(hour=EXPIRY_CUTOFF[0], minute=EXPIRY_CUTOFF[1])
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value) -> float:
+    """Convert a price to float (NaN if missing or not numeric)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _finite_list(values: np.ndarray, digits: int = 6) -> List[Optional[float]]:
+    """Round an array to a JSON/BSON friendly list (NaN becomes None)"""
+    rounded = np.round(values, digits)
+    return [None if value != value else value for value in rounded.tolist()]
+
+
+def compute_greeks_documents(symbol: str, snapshots: Iterable[Dict]) -> List[Dict]:
+    """
+    Compute IV and Greeks for one or many snapshots of a symbol in one vectorized pass
+    Args:
+        symbol: Index or stock symbol
+        snapshots: Full NSE option chain responses
+    Returns: One document per (expiry, snapshot time), see the module docstring
+    """
+    documents = []
+    document_index = {}  # (ts, expiry) -> position in documents
+    expiry_times = {}
+
+    leg_document, leg_position, leg_type = [], [], []
+    leg_spot, leg_strike, leg_years, leg_price = [], [], [], []
+
+    for data in snapshots:
+        records = data.get("records") if isinstance(data, dict) else None
+        if not isinstance(records, dict):
+            continue
+        ts = parse_nse_timestamp(records.get("timestamp"))
+        if ts is None:
+            continue
+        underlying = _to_float(records.get("underlyingValue"))
+
+        for strike_row in records.get("data") or []:
+            if not isinstance(strike_row, dict):
+                continue
+            strike = _to_float(strike_row.get("strikePrice"))
+            expiry = strike_row.get("expiryDates") or strike_row.get("expiryDate")
+            if strike != strike or not expiry:
+                continue
+
+            if expiry not in expiry_times:
+                expiry_times[expiry] = _expiry_datetime(expiry)
+            expiry_time = expiry_times[expiry]
+            if expiry_time is None:
+                continue
+            years = (expiry_time - ts).total_seconds() / (DAYS_PER_YEAR * 86400.0)
+
+            key = (ts, expiry)
+            position = document_index.get(key)
+            if position is None:
+                position = len(documents)
+                document_index[key] = position
+                documents.append({
+                    "symbol": symbol,
+                    "expiry": expiry,
+                    "ts": ts,
+                    "trade_date": ts.date().isoformat(),
+                    "snapshotTimestamp": records.get("timestamp"),
+                    "underlyingValue": None if underlying != underlying else underlying,
+                    "riskFreeRate": RISK_FREE_RATE,
+                    "strikes": []
+                })
+            strikes = documents[position]["strikes"]
+
+            for option_type in OPTION_TYPES:
+                leg = strike_row.get(option_type)
+                if not isinstance(leg, dict):
+                    continue
+                spot = _to_float(leg.get("underlyingValue", underlying))
+                leg_document.append(position)
+                leg_position.append(len(strikes))
+                leg_type.append(option_type == "CE")
+                leg_spot.append(spot if spot == spot else underlying)
+                leg_strike.append(strike)
+                leg_years.append(years)
+                leg_price.append(_to_float(leg.get("lastPrice")))
+            strikes.append(strike)
+
+    if not documents:
+        return []
+
+    is_call = np.array(leg_type, dtype=bool)
+    spot = np.array(leg_spot, dtype=float)
+    strike = np.array(leg_strike, dtype=float)
+    years = np.array(leg_years, dtype=float)
+    price = np.array(leg_price, dtype=float)
+
+    sigma = implied_volatility(price, spot, strike, years, is_call)
+    results = bs_greeks(spot, strike, years, sigma, is_call)
+    results["iv"] = sigma * 100.0
+    columns = {field: _finite_list(results[field]) for field in GREEK_FIELDS}
+
+    for document in documents:
+        size = len(document["strikes"])
+        for option_type in OPTION_TYPES:
+            document[option_type] = {field: [None] * size for field in GREEK_FIELDS}
+
+    for index, (position, strike_position, call) in enumerate(zip(leg_document, leg_position, leg_type)):
+        legs = documents[position]["CE" if call else "PE"]
+        for field in GREEK_FIELDS:
+            legs[field][strike_position] = columns[field][index]
+
+    return documents
+
+
+class OptionChainGreeks:
+    """Writes and queries computed Greeks"""
+
+    def __init__(self, db):
+        """
+        Args:
+            db: pymongo Database the option chain collections live in
+        """
+        # Unique (symbol, expiry, ts) index is created by schema_manager
+        self.collection = db[GREEKS_COLLECTION_NAME]
+
+    def _upsert(self, document: Dict) -> pymongo.UpdateOne:
+        """Timestamp-keyed upsert for a Greeks document (re-running a backfill overwrites in place)"""
+        return pymongo.UpdateOne(
+            {"symbol": document["symbol"], "expiry": document["expiry"], "ts": document["ts"]},
+            {"$set": {**document, "computedAt": now_for_mongo()}},
+            upsert=True
+        )
+
+    def queue_greeks(self, buffer, symbol: str, data: Dict) -> int:
+        """
+        Compute a snapshot's Greeks and queue them on a BulkWriteBuffer
+        Args:
+            buffer: bulk_writer.BulkWriteBuffer for the current cycle
+            symbol: Index or stock symbol
+            data: Full NSE option chain response
+        Returns: Number of documents queued
+        """
+        documents = compute_greeks_documents(symbol, [data])
+        for document in documents:
+            buffer.add(self.collection, self._upsert(document))
+        return len(documents)
+
+    def save_documents(self, documents: List[Dict]) -> int:
+        """
+        Upsert computed Greeks documents in one unordered bulk write
+        Returns: Number of documents inserted or updated
+        """
+        if not documents:
+            return 0
+        result = self.collection.bulk_write([self._upsert(document) for document in documents], ordered=False)
+        return result.upserted_count + result.modified_count
+
+    def get_greeks(self, symbol: str, expiry: Optional[str] = None, ts: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        Get the Greeks of one snapshot
+        Args:
+            symbol: Index or stock symbol
+            expiry: Expiry date (None for any)
+            ts: Snapshot time (None for the latest)
+        Returns: Greeks document or None
+        """
+        query = {"symbol": symbol}
+        if expiry:
+            query["expiry"] = expiry
+        if ts:
+            query["ts"] = ts
+        return self.collection.find_one(query, {"_id": 0}, sort=[("ts", -1)])
+
+
+def ingest_greeks(db, symbol: str, data: Dict) -> int:
+    """
+    Greeks stage run after a snapshot is saved; never raises
+    Returns: Number of documents written (0 if disabled or on error)
+    """
+    if not is_greeks_enabled():
+        return 0
+    try:
+        return get_greeks_store(db).save_documents(compute_greeks_documents(symbol, [data]))
+    except Exception as e:
+        logger.error(f"Failed to compute Greeks for {symbol}: {str(e)}")
+        return 0
+
+
+# Global instances (one per database)
+_greeks_stores = {}
+
+def get_greeks_store(db) -> OptionChainGreeks:
+    """Get the Greeks store for a database"""
+    key = db.name
+    store = _greeks_stores.get(key)
+    # Rebuild if the shared MongoDB client was replaced after a failed health check
+    if store is None or store.collection.database.client is not db.client:
+        store = OptionChainGreeks(db)
+        _greeks_stores[key] = store
+    return store
+
+
+def backfill(symbols: Optional[List[str]], start_date: datetime, end_date: datetime, batch_size: int = 200) -> Dict[str, int]:
+    """
+    Compute Greeks for stored snapshots (batch job over history)
+    Snapshots are read in insertion order and solved batch_size at a time in one vectorized call
+    Args:
+        symbols: Symbols to process (None for every index and bank)
+        start_date: First trading day (inclusive)
+        end_date: Last trading day (inclusive)
+        batch_size: Snapshots per vectorized solve and bulk write
+    Returns: Dictionary of symbol -> documents written
+    """
+    # Imported here: the collectors import this module for the ingest stage
+    from mongo_pool import get_mongo_db
+    from option_chain_delta_store import get_delta_store
+    from schema_manager import get_option_chain_collection_names
+
+    _, db = get_mongo_db()
+    store = get_greeks_store(db)
+    delta_store = get_delta_store()
+    collection_names = get_option_chain_collection_names()
+    query = {"insertedAt": {"$gte": start_date, "$lt": end_date + timedelta(days=1)}}
+
+    written = {}
+    for symbol, collection_name in collection_names.items():
+        if symbols and symbol not in symbols:
+            continue
+        started = time.perf_counter()
+        written[symbol] = 0
+        snapshots = 0
+        batch = []
+        for snapshot in delta_store.iter_snapshots(db[collection_name], query, batch_size=batch_size):
+            batch.append(snapshot)
+            if len(batch) >= batch_size:
+                written[symbol] += store.save_documents(compute_greeks_documents(symbol, batch))
+                snapshots += len(batch)
+                batch = []
+        if batch:
+            written[symbol] += store.save_documents(compute_greeks_documents(symbol, batch))
+            snapshots += len(batch)
+        logger.info(f"Greeks backfill {symbol}: {snapshots} snapshots, {written[symbol]} documents in {time.perf_counter() - started:.2f}s")
+    return written
+
+
+def main():
+    """Command line entry point for the history backfill"""
+    parser = argparse.ArgumentParser(description="Backfill option chain IV and Greeks")
+    parser.add_argument("--start-date", required=True, help="First trading day (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="Last trading day (YYYY-MM-DD, default: start date)")
+    parser.add_argument("--symbols", help="Comma separated symbols (default: all indices and banks)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Snapshots per vectorized batch")
+    args = parser.parse_args()
+
+    try:
+        start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
+        end_date = datetime.strptime(args.end_date, "%Y-%m-%d") if args.end_date else start_date
+    except ValueError as e:
+        print(f"Invalid date: {e}")
+        sys.exit(2)
+
+    symbols = [symbol.strip().upper() for symbol in args.symbols.split(",")] if args.symbols else None
+    written = backfill(symbols, start_date, end_date, batch_size=max(1, args.batch_size))
+    print(f"Wrote {sum(written.values())} Greeks documents for {len(written)} symbols")
+
+
+if __name__ == "__main__":
+    main()
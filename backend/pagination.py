@@ -0,0 +1,158 @@
+"""
+Keyset (cursor) pagination for the list endpoints
+A cursor is an opaque token holding the sort value and _id of the last record of a page; the next page
+is the range after it, so a deep page costs the same index seek as page 1 (no skip)
+
+Modes (same endpoint):
+    ?page=N&limit=M          page numbers (skip/limit, totals as before)
+    ?cursor=&limit=M         first page in cursor mode (empty cursor)
+    ?cursor=<token>&limit=M  page after the token (next_cursor of the previous response)
+Every response carries next_cursor, so a client can switch from page 1 to cursor mode.
+?total=approx|exact adds a total in cursor mode (approx uses collection metadata when unfiltered).
+"""
+
+import base64
+import binascii
+from typing import Dict, List, Optional, Tuple
+from bson import ObjectId, json_util
+from logger_config import get_logger
+
+# Get logger
+logger = get_logger(__name__)
+
+TOTAL_MODES = ("none", "approx", "exact")
+APPROX_COUNT_LIMIT = 10000  # Filtered approximate totals stop counting here
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor token cannot be decoded"""
+
+
+def encode_cursor(sort_value, record_id) -> str:
+    """Encode the sort value and _id of a record into an opaque cursor token"""
+    raw = json_util.dumps([sort_value, record_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[object, ObjectId]:
+    """
+    Decode a cursor token
+    Returns: (sort value, _id)
+    Raises: InvalidCursorError if the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json_util.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {str(e)}")
+    if not isinstance(values, list) or len(values) != 2 or not isinstance(values[1], ObjectId):
+        raise InvalidCursorError("Invalid cursor")
+    return values[0], values[1]
+
+
+def _get_path(document: Dict, path: str):
+    """Get a dotted field from a document"""
+    value = document
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _after_filter(sort_field: str, sort_value, record_id: ObjectId, unique_sort: bool) -> Dict:
+    """Filter selecting records after (sort_value, record_id) in descending order"""
+    if unique_sort:
+        return {sort_field: {"$lt": sort_value}}
+    if sort_value is None:
+        # Records without a sort value come last, ordered by _id
+        return {sort_field: None, "_id": {"$lt": record_id}}
+    return {"$or": [
+        {sort_field: {"$lt": sort_value}},
+        {sort_field: sort_value, "_id": {"$lt": record_id}},
+        {sort_field: None}
+    ]}
+
+
+def count_total(collection, query_filter: Dict, approximate: bool = False) -> Tuple[int, bool]:
+    """
+    Count the records matching a filter
+    Unfiltered counts come from collection metadata (no scan)
+    Args:
+        collection: pymongo Collection
+        query_filter: Filter of the list
+        approximate: Stop counting a filtered list at APPROX_COUNT_LIMIT
+    Returns: (total, whether the total is approximate)
+    """
+    if not query_filter:
+        try:
+            return collection.estimated_document_count(), False
+        except Exception:
+            # Views (time-series backend) have no collection metadata to read
+            return collection.count_documents({}), False
+    if approximate:
+        total = collection.count_documents(query_filter, limit=APPROX_COUNT_LIMIT)
+        return total, total >= APPROX_COUNT_LIMIT
+    return collection.count_documents(query_filter), False
+
+
+def paginate(
+    collection,
+    query_filter: Dict,
+    sort_field: str,
+    page: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    total: Optional[str] = None,
+    unique_sort: bool = True,
+    projection: Optional[Dict] = None
+) -> Tuple[List[Dict], Dict]:
+    """
+    Fetch one page of a list sorted by a field (newest first)
+    Args:
+        collection: pymongo Collection
+        query_filter: Filter of the list
+        sort_field: Field the list is sorted by (descending)
+        page: Page number (page mode)
+        limit: Records per page
+        cursor: Cursor token ('' for the first page in cursor mode, None for page mode)
+        total: 'none', 'approx' or 'exact' (cursor mode only; page mode always counts)
+        unique_sort: True if sort_field is unique (otherwise _id breaks ties)
+        projection: Optional find projection (list responses only need summary fields; keep sort_field in it)
+    Returns: (records, pagination fields for the response)
+    Raises: InvalidCursorError if the cursor is malformed
+    """
+    sort = [(sort_field, -1)] if unique_sort else [(sort_field, -1), ("_id", -1)]
+
+    if cursor is None:
+        # Page mode (backwards compatible)
+        total_count, _ = count_total(collection, query_filter)
+        records = list(collection.find(query_filter, projection).sort(sort).skip((page - 1) * limit).limit(limit))
+        total_pages = (total_count + limit - 1) // limit  # Ceiling division
+        page_info = {
+            "total": total_count,
+            "page": page,
+            "limit": limit,
+            "total_pages": total_pages,
+            "has_next": page < total_pages,
+            "has_prev": page > 1
+        }
+    else:
+        page_filter = query_filter
+        if cursor:
+            sort_value, record_id = decode_cursor(cursor)
+            after = _after_filter(sort_field, sort_value, record_id, unique_sort)
+            page_filter = {"$and": [query_filter, after]} if query_filter else after
+        # One extra record tells whether another page exists
+        records = list(collection.find(page_filter, projection).sort(sort).limit(limit + 1))
+        has_next = len(records) > limit
+        records = records[:limit]
+        page_info = {"limit": limit, "has_next": has_next, "has_prev": bool(cursor)}
+        if total in ("approx", "exact"):
+            page_info["total"], page_info["total_is_approximate"] = count_total(collection, query_filter, total == "approx")
+
+    page_info["next_cursor"] = None
+    if records and page_info["has_next"]:
+        last = records[-1]
+        page_info["next_cursor"] = encode_cursor(_get_path(last, sort_field), last["_id"])
+    return records, page_info
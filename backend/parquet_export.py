@@ -0,0 +1,275 @@
+"""
+Columnar Parquet export of option chain history
+Streams snapshots from every <symbol>_option_chain_data collection, flattens records.data into
+typed columns (one row per strike per snapshot) and writes one Parquet file per symbol and
+trading day, using a process pool across symbols
+
+Layout (hive partitioned):
+    <PARQUET_EXPORT_DIR>/symbol=NIFTY/trade_date=2025-10-17/part-0.parquet
+
+Columns:
+    ts (timestamp), expiry (string), strike (float64), underlyingValue (float64),
+    CE_<field> and PE_<field> for every per-leg field (float64)
+
+Runs are incremental: days that already have a file are skipped (use --overwrite to redo them).
+Reading a month of one symbol:
+    pandas.read_parquet(PARQUET_EXPORT_DIR, filters=[("symbol", "=", "NIFTY"), ("trade_date", ">=", "2025-10-01")])
+
+Usage:
+    python parquet_export.py [--symbols NIFTY,BANKNIFTY] [--start-date 2025-10-01] [--end-date 2025-10-31]
+                             [--workers 4] [--overwrite] [--include-today]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+from timezone_utils import get_ist_now_naive, parse_nse_timestamp
+from option_chain_timeseries import LEG_FIELDS, OPTION_TYPES
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Export configuration
+PARQUET_EXPORT_DIR = os.getenv('PARQUET_EXPORT_DIR', os.path.join('exports', 'option_chain'))
+PARQUET_EXPORT_WORKERS = int(os.getenv('PARQUET_EXPORT_WORKERS', min(4, os.cpu_count() or 1)))
+PARQUET_COMPRESSION = os.getenv('PARQUET_COMPRESSION', 'zstd')
+PARQUET_BATCH_SIZE = 200  # Snapshots per cursor batch
+
+PART_FILE_NAME = "part-0.parquet"
+
+# Column schema shared by every file, so a partitioned dataset reads as one table
+EXPORT_SCHEMA = pa.schema(
+    [
+        ("ts", pa.timestamp("ms")),
+        ("expiry", pa.string()),
+        ("strike", pa.float64()),
+        ("underlyingValue", pa.float64())
+    ]
+    + [(f"{option_type}_{field}", pa.float64()) for option_type in OPTION_TYPES for field in LEG_FIELDS]
+)
+
+
+def partition_path(export_dir: str, symbol: str, trade_date: date) -> str:
+    """Directory of one symbol/day partition"""
+    return os.path.join(export_dir, f"symbol={symbol}", f"trade_date={trade_date.isoformat()}")
+
+
+def is_exported(export_dir: str, symbol: str, trade_date: date) -> bool:
+    """Check if a symbol/day has been written already"""
+    return os.path.exists(os.path.join(partition_path(export_dir, symbol, trade_date), PART_FILE_NAME))
+
+
+def _to_float(value) -> Optional[float]:
+    """Convert a numeric field to float (None if missing or not numeric)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def flatten_snapshots(snapshots) -> Dict[str, List]:
+    """
+    Flatten snapshots into export columns
+    Args:
+        snapshots: Iterable of full NSE option chain responses
+    Returns: Dictionary of column name -> list of values (see EXPORT_SCHEMA)
+    """
+    columns = {name: [] for name in EXPORT_SCHEMA.names}
+    leg_columns = [(option_type, field, columns[f"{option_type}_{field}"]) for option_type in OPTION_TYPES for field in LEG_FIELDS]
+
+    for data in snapshots:
+        records = data.get("records") if isinstance(data, dict) else None
+        if not isinstance(records, dict):
+            continue
+        ts = parse_nse_timestamp(records.get("timestamp"))
+        if ts is None:
+            continue
+        underlying = _to_float(records.get("underlyingValue"))
+
+        for strike_row in records.get("data") or []:
+            if not isinstance(strike_row, dict):
+                continue
+            strike = _to_float(strike_row.get("strikePrice"))
+            if strike is None:
+                continue
+            columns["ts"].append(ts)
+            columns["expiry"].append(strike_row.get("expiryDates") or strike_row.get("expiryDate"))
+            columns["strike"].append(strike)
+            columns["underlyingValue"].append(underlying)
+            for option_type, field, column in leg_columns:
+                leg = strike_row.get(option_type)
+                column.append(_to_float(leg.get(field)) if isinstance(leg, dict) else None)
+
+    return columns
+
+
+def _write_partition(export_dir: str, symbol: str, trade_date: date, columns: Dict[str, List]) -> int:
+    """
+    Write one symbol/day file atomically (temp file + rename, so a crashed run never looks exported)
+    Returns: Number of rows written
+    """
+    directory = partition_path(export_dir, symbol, trade_date)
+    os.makedirs(directory, exist_ok=True)
+    table = pa.Table.from_pydict(columns, schema=EXPORT_SCHEMA)
+    temp_path = os.path.join(directory, f".{PART_FILE_NAME}.tmp")
+    pq.write_table(table, temp_path, compression=PARQUET_COMPRESSION)
+    os.replace(temp_path, os.path.join(directory, PART_FILE_NAME))
+    return table.num_rows
+
+
+def export_symbol(symbol: str, collection_name: str, days: List[str], export_dir: str, overwrite: bool = False) -> Dict:
+    """
+    Export a symbol's snapshots for the given days (runs in a worker process)
+    Args:
+        symbol: Index or bank symbol
+        collection_name: Legacy option chain collection of the symbol
+        days: Trading days as YYYY-MM-DD strings
+        export_dir: Root of the partitioned dataset
+        overwrite: Rewrite days that were exported already
+    Returns: Dictionary with the symbol, days written, rows and elapsed seconds
+    """
+    # Each worker process opens its own MongoDB client
+    from mongo_pool import get_mongo_db
+    from option_chain_delta_store import get_delta_store
+    from timeseries_store import is_timeseries_backend, read_view_name, TIME_FIELD
+
+    started = time.perf_counter()
+    _, db = get_mongo_db()
+    # Time-series mode reads the symbol's view and filters on the time field (bucket pruning)
+    timeseries = is_timeseries_backend()
+    collection = db[read_view_name(collection_name) if timeseries else collection_name]
+    time_field = TIME_FIELD if timeseries else "insertedAt"
+    delta_store = get_delta_store()
+
+    written_days = 0
+    rows = 0
+    for day in days:
+        trade_date = date.fromisoformat(day)
+        if not overwrite and is_exported(export_dir, symbol, trade_date):
+            continue
+        day_start = datetime.combine(trade_date, datetime.min.time())
+        query = {time_field: {"$gte": day_start, "$lt": day_start + timedelta(days=1)}}
+        columns = flatten_snapshots(delta_store.iter_snapshots(collection, query, batch_size=PARQUET_BATCH_SIZE))
+        if not columns["ts"]:
+            continue  # Holiday / weekend / no data: leave the day unexported so a later backfill can fill it
+        rows += _write_partition(export_dir, symbol, trade_date, columns)
+        written_days += 1
+
+    return {"symbol": symbol, "days": written_days, "rows": rows, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def _export_days(start_date: date, end_date: date) -> List[str]:
+    """Weekdays between two dates (inclusive) as YYYY-MM-DD strings"""
+    days = []
+    current = start_date
+    while current <= end_date:
+        if current.weekday() < 5:
+            days.append(current.isoformat())
+        current += timedelta(days=1)
+    return days
+
+
+def run_export(
+    symbols: Optional[List[str]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    export_dir: str = PARQUET_EXPORT_DIR,
+    workers: int = PARQUET_EXPORT_WORKERS,
+    overwrite: bool = False,
+    include_today: bool = False
+) -> List[Dict]:
+    """
+    Export option chain history to Parquet, one process per symbol
+    Args:
+        symbols: Symbols to export (None for every index and bank)
+        start_date: First trading day (None for 30 days before end_date)
+        end_date: Last trading day (None for yesterday, or today with include_today)
+        export_dir: Root of the partitioned dataset
+        workers: Worker processes
+        overwrite: Rewrite days that were exported already
+        include_today: Allow exporting the current, still incomplete day
+    Returns: Per-symbol results
+    """
+    from schema_manager import get_option_chain_collection_names
+
+    today = get_ist_now_naive().date()
+    if end_date is None:
+        end_date = today if include_today else today - timedelta(days=1)
+    if not include_today and end_date >= today:
+        end_date = today - timedelta(days=1)
+    if start_date is None:
+        start_date = end_date - timedelta(days=30)
+    days = _export_days(start_date, end_date)
+
+    collection_names = get_option_chain_collection_names()
+    selected = {symbol: name for symbol, name in collection_names.items() if not symbols or symbol in symbols}
+
+    results = []
+    # spawn: worker processes must not inherit the parent's MongoDB client
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=context) as executor:
+        futures = {
+            executor.submit(export_symbol, symbol, name, days, export_dir, overwrite): symbol
+            for symbol, name in selected.items()
+        }
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                result = future.result()
+                logger.info(f"Parquet export {symbol}: {result['days']} days, {result['rows']} rows in {result['seconds']}s")
+            except Exception as e:
+                result = {"symbol": symbol, "error": str(e)}
+                logger.error(f"Parquet export failed for {symbol}: {str(e)}")
+            results.append(result)
+    return results
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Export option chain history to partitioned Parquet files")
+    parser.add_argument("--symbols", help="Comma separated symbols (default: all indices and banks)")
+    parser.add_argument("--start-date", help="First trading day (YYYY-MM-DD, default: 30 days before end date)")
+    parser.add_argument("--end-date", help="Last trading day (YYYY-MM-DD, default: yesterday)")
+    parser.add_argument("--export-dir", default=PARQUET_EXPORT_DIR, help="Dataset root directory")
+    parser.add_argument("--workers", type=int, default=PARQUET_EXPORT_WORKERS, help="Worker processes")
+    parser.add_argument("--overwrite", action="store_true", help="Rewrite days that were exported already")
+    parser.add_argument("--include-today", action="store_true", help="Also export the current (incomplete) day")
+    args = parser.parse_args()
+
+    try:
+        start_date = date.fromisoformat(args.start_date) if args.start_date else None
+        end_date = date.fromisoformat(args.end_date) if args.end_date else None
+    except ValueError as e:
+        print(f"Invalid date: {e}")
+        sys.exit(2)
+
+    symbols = [symbol.strip().upper() for symbol in args.symbols.split(",")] if args.symbols else None
+    results = run_export(
+        symbols=symbols,
+        start_date=start_date,
+        end_date=end_date,
+        export_dir=args.export_dir,
+        workers=args.workers,
+        overwrite=args.overwrite,
+        include_today=args.include_today
+    )
+    failed = [result for result in results if "error" in result]
+    print(f"Exported {sum(result.get('rows', 0) for result in results)} rows "
+          f"({sum(result.get('days', 0) for result in results)} symbol-days), {len(failed)} symbols failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Token-bucket rate limiter for outbound requests
+Every collector fetch goes through acquire(host), so all schedulers share one budget per host
+Supports an in-process mode and an optional Redis-backed mode that coordinates across processes
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+import redis
+from dotenv import load_dotenv
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Rate limit configuration
+RATE_LIMIT_PER_SECOND = float(os.getenv('NSE_RATE_LIMIT_PER_SECOND', 3))  # Sustained requests per second per host
+RATE_LIMIT_BURST = int(os.getenv('NSE_RATE_LIMIT_BURST', 5))  # Bucket capacity per host
+RATE_LIMIT_BACKEND = os.getenv('NSE_RATE_LIMIT_BACKEND', 'memory').lower()  # 'memory' or 'redis'
+RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv('NSE_RATE_LIMIT_MAX_WAIT_SECONDS', 60))
+
+# Redis Configuration
+REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
+REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
+REDIS_DB = int(os.getenv('REDIS_DB', 0))
+REDIS_PASSWORD = os.getenv('REDIS_PASSWORD', None)
+
+# Redis key prefix for token buckets
+RATE_LIMIT_KEY_PREFIX = "nse:ratelimit:"
+
+# Atomically refill the bucket and try to take one token
+# Returns 0 if a token was taken, otherwise the number of milliseconds to wait
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait_ms = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait_ms = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', key, math.ceil(capacity / rate) + 60)
+return wait_ms
+"""
+
+
+class TokenBucket:
+    """In-process token bucket for a single host"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_take(self) -> float:
+        """
+        Try to take one token
+        Returns: 0 if a token was taken, otherwise seconds until one is available
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class HostRateLimiter:
+    """Per-host token-bucket limiter with in-process and Redis backends"""
+
+    def __init__(self, rate: float = RATE_LIMIT_PER_SECOND, capacity: int = RATE_LIMIT_BURST, backend: str = RATE_LIMIT_BACKEND):
+        """Initialize limiter, connecting to Redis if the redis backend is requested"""
+        self.rate = max(rate, 0.001)
+        self.capacity = max(capacity, 1)
+        self.buckets = {}
+        self.buckets_lock = threading.Lock()
+        self.client = None
+        self.script = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"acquired": 0, "throttled": 0, "wait_seconds": 0.0}
+        if backend == 'redis':
+            self._connect_redis()
+
+    def _connect_redis(self):
+        """Establish Redis connection with error handling (falls back to in-process buckets)"""
+        try:
+            connection_params = {
+                'host': REDIS_HOST,
+                'port': REDIS_PORT,
+                'db': REDIS_DB,
+                'decode_responses': True,
+                'socket_connect_timeout': 5,
+                'socket_timeout': 5
+            }
+
+            if REDIS_PASSWORD:
+                connection_params['password'] = REDIS_PASSWORD
+
+            self.client = redis.Redis(**connection_params)
+            self.client.ping()
+            self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+            logger.info(f"Rate limiter using Redis at {REDIS_HOST}:{REDIS_PORT}")
+        except Exception as e:
+            logger.warning(f"Redis not available for rate limiting: {str(e)}. Using in-process buckets.")
+            self.client = None
+            self.script = None
+
+    def _get_bucket(self, host: str) -> TokenBucket:
+        """Get or create the in-process bucket for a host"""
+        with self.buckets_lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity)
+                self.buckets[host] = bucket
+            return bucket
+
+    def _try_take(self, host: str) -> float:
+        """Try to take a token from the configured backend; returns seconds to wait"""
+        if self.script is not None:
+            try:
+                wait_ms = self.script(
+                    keys=[f"{RATE_LIMIT_KEY_PREFIX}{host}"],
+                    args=[self.rate, self.capacity, time.time()]
+                )
+                return int(wait_ms) / 1000.0
+            except redis.RedisError as e:
+                logger.debug(f"Redis error in rate limiter for {host}: {str(e)}. Using in-process bucket.")
+        return self._get_bucket(host).try_take()
+
+    def acquire(self, host: str, max_wait: Optional[float] = None) -> bool:
+        """
+        Block until a request to host is allowed
+        Args:
+            host: Host name the request goes to (e.g. "www.nseindia.com")
+            max_wait: Maximum seconds to wait (None uses NSE_RATE_LIMIT_MAX_WAIT_SECONDS)
+        Returns: True if a token was acquired, False if max_wait was exceeded
+        """
+        if max_wait is None:
+            max_wait = RATE_LIMIT_MAX_WAIT_SECONDS
+        deadline = time.monotonic() + max_wait
+        waited = 0.0
+
+        while True:
+            wait = self._try_take(host)
+            if wait <= 0:
+                with self._stats_lock:
+                    self._stats["acquired"] += 1
+                    if waited > 0:
+                        self._stats["throttled"] += 1
+                        self._stats["wait_seconds"] += waited
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Rate limiter wait for {host} exceeded {max_wait}s")
+                return False
+            sleep_for = min(wait, remaining)
+            time.sleep(sleep_for)
+            waited += sleep_for
+
+    def get_stats(self) -> Dict:
+        """Get limiter statistics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        stats["backend"] = "redis" if self.script is not None else "memory"
+        stats["rate_per_second"] = self.rate
+        stats["burst"] = self.capacity
+        return stats
+
+
+# Global instance
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Get global host rate limiter instance"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = HostRateLimiter()
+    return _rate_limiter
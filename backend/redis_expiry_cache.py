@@ -1,13 +1,19 @@
 """
 Redis cache for NSE expiry dates
 Caches expiry dates per day to avoid repeated API calls
+An in-process LRU (L1) sits in front of Redis, so warm lookups need no Redis round-trip
+and expiries survive between runs in the same process even when Redis is down
 """
 
 import redis
+import json
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, date
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,6 +29,61 @@ REDIS_PASSWORD = os.getenv('REDIS_PASSWORD', None)
 # Redis key prefix for expiry dates
 EXPIRY_KEY_PREFIX = "nse:expiry:"
 EXPIRY_DATE_KEY_PREFIX = "nse:expiry_date:"
+EXPIRY_LIST_KEY_PREFIX = "nse:expiry_list:"
+
+# In-process (L1) cache configuration
+EXPIRY_L1_MAX_ENTRIES = int(os.getenv('EXPIRY_L1_MAX_ENTRIES', 256))
+EXPIRY_L1_TTL_SECONDS = int(os.getenv('EXPIRY_L1_TTL_SECONDS', 3600))  # Entries also expire at day rollover
+EXPIRY_MISS_TTL_SECONDS = int(os.getenv('EXPIRY_MISS_TTL_SECONDS', 60))  # Redis misses remembered so workers do not ask again
+
+
+class ExpiryL1Cache:
+    """Thread-safe in-process TTL/LRU cache whose entries are only valid on the day they were stored"""
+    
+    def __init__(self, max_entries: int = EXPIRY_L1_MAX_ENTRIES, ttl_seconds: int = EXPIRY_L1_TTL_SECONDS):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (value, day, stored_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str):
+        """Get a value stored today and within the TTL (None otherwise)"""
+        today = date.today().isoformat()
+        now = datetime.now().timestamp()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, day, stored_at = entry
+            if day != today or now - stored_at > self.ttl_seconds:
+                # Day rollover or TTL expiry: yesterday's nearest expiry may be gone
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: str, value):
+        """Store a value for today, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (value, date.today().isoformat(), datetime.now().timestamp())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str):
+        """Remove a value"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def get_stats(self) -> Dict:
+        """Get hit/miss statistics"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
 
 
 class RedisExpiryCache:
@@ -31,6 +92,10 @@ class RedisExpiryCache:
     def __init__(self):
         """Initialize Redis connection"""
         self.client = None
+        self.l1 = ExpiryL1Cache()  # Shared by all collectors in this process
+        self.redis_round_trips = 0
+        self._misses = {}  # L1 key -> monotonic time Redis last reported it missing
+        self._misses_lock = threading.Lock()
         self._connect_redis()
     
     def _connect_redis(self):
@@ -71,43 +136,95 @@ class RedisExpiryCache:
         """Get Redis key for expiry date (without date suffix)"""
         return f"{EXPIRY_DATE_KEY_PREFIX}{symbol}"
     
-    def get_expiry(self, symbol: str) -> Optional[str]:
+    def _get_expiry_list_key(self, symbol: str) -> str:
+        """Get Redis key for today's full expiry list for a symbol"""
+        today = date.today().isoformat()
+        return f"{EXPIRY_LIST_KEY_PREFIX}{symbol}:{today}"
+    
+    def _redis_lookups(self, keys: List[str]) -> List[str]:
+        """Drop the keys Redis reported missing within EXPIRY_MISS_TTL_SECONDS (asking again would only miss again)"""
+        now = time.monotonic()
+        with self._misses_lock:
+            return [key for key in keys if now - self._misses.get(key, float('-inf')) > EXPIRY_MISS_TTL_SECONDS]
+    
+    def _remember_misses(self, keys: Iterable[str]):
+        """Remember keys Redis does not have, until they are stored or EXPIRY_MISS_TTL_SECONDS passes"""
+        now = time.monotonic()
+        with self._misses_lock:
+            for key in keys:
+                self._misses[key] = now
+    
+    def _forget_misses(self, *keys: str):
+        """Forget remembered misses once the values are stored or cleared"""
+        with self._misses_lock:
+            for key in keys:
+                self._misses.pop(key, None)
+    
+    def _end_of_day_ttl(self) -> int:
+        """Seconds until the end of today (plus a 1 minute buffer)"""
+        now = datetime.now()
+        end_of_day = datetime.combine(date.today(), datetime.max.time())
+        return int((end_of_day - now).total_seconds()) + 60
+    
+    def get_expiries(self, symbols: Iterable[str]) -> Dict[str, Optional[str]]:
         """
-        Get cached expiry date for today
-        Returns: Expiry date string (e.g., "25-Nov-2025") or None if not cached
+        Get cached expiry dates for today for many symbols
+        L1 hits cost nothing; all misses are resolved with a single MGET round-trip
+        Returns: Dictionary mapping symbol to expiry date string (None if not cached)
         """
-        if not self.client:
-            return None
+        symbols = list(symbols)
+        results = {}
+        misses = []
+        for symbol in symbols:
+            expiry = self.l1.get(f"expiry:{symbol}")
+            results[symbol] = expiry
+            if expiry is None:
+                misses.append(symbol)
+        
+        # Symbols a warm-up lookup already found missing in Redis are not asked for again
+        misses = [key.split(":", 1)[1] for key in self._redis_lookups([f"expiry:{symbol}" for symbol in misses])]
+        if not misses or not self.client:
+            return results
         
         try:
-            # Check if we have expiry for today
-            today_key = self._get_today_key(symbol)
-            expiry = self.client.get(today_key)
-            
-            if expiry:
-                logger.info(f"Found cached expiry for {symbol}: {expiry}")
-                return expiry
+            today = date.today().isoformat()
+            keys = []
+            for symbol in misses:
+                expiry_key = self._get_expiry_date_key(symbol)
+                keys.extend([self._get_today_key(symbol), expiry_key, f"{expiry_key}:date"])
+            self.redis_round_trips += 1
+            values = self.client.mget(keys)
             
-            # Also check the general expiry date key (without date suffix)
-            expiry_key = self._get_expiry_date_key(symbol)
-            expiry = self.client.get(expiry_key)
+            for index, symbol in enumerate(misses):
+                today_value, general_value, stored_date = values[index * 3:index * 3 + 3]
+                # The general key is only valid if it was stored today
+                expiry = today_value or (general_value if stored_date == today else None)
+                if expiry:
+                    self.l1.set(f"expiry:{symbol}", expiry)
+                    results[symbol] = expiry
+            self._remember_misses(f"expiry:{symbol}" for symbol in misses if results[symbol] is None)
             
-            if expiry:
-                # Verify it's still valid for today by checking the date stored
-                stored_date = self.client.get(f"{expiry_key}:date")
-                if stored_date and stored_date == date.today().isoformat():
-                    logger.info(f"Found cached expiry for {symbol}: {expiry}")
-                    return expiry
-            
-            logger.debug(f"No cached expiry found for {symbol} today")
-            return None
+            logger.debug(f"Resolved {len(misses)} expiry lookups from Redis in one round-trip")
+            return results
             
         except redis.RedisError as e:
-            logger.debug(f"Redis error getting expiry for {symbol}: {str(e)}")
-            return None
+            logger.debug(f"Redis error getting expiries for {len(misses)} symbols: {str(e)}")
+            return results
         except Exception as e:
-            logger.debug(f"Unexpected error getting expiry for {symbol}: {str(e)}")
-            return None
+            logger.debug(f"Unexpected error getting expiries: {str(e)}")
+            return results
+    
+    def get_expiry(self, symbol: str) -> Optional[str]:
+        """
+        Get cached expiry date for today
+        Returns: Expiry date string (e.g., "25-Nov-2025") or None if not cached
+        """
+        expiry = self.get_expiries([symbol]).get(symbol)
+        if expiry:
+            logger.debug(f"Found cached expiry for {symbol}: {expiry}")
+        else:
+            logger.debug(f"No cached expiry found for {symbol} today")
+        return expiry
     
     def set_expiry(self, symbol: str, expiry: str, ttl_seconds: int = None) -> bool:
         """
@@ -116,8 +233,11 @@ class RedisExpiryCache:
             symbol: Symbol name (e.g., "BANKNIFTY")
             expiry: Expiry date string (e.g., "25-Nov-2025")
             ttl_seconds: Time to live in seconds. If None, expires at end of day (default)
-        Returns: True if successful, False otherwise
+        Returns: True if stored in Redis, False otherwise (the L1 copy is always stored)
         """
+        self.l1.set(f"expiry:{symbol}", expiry)
+        self._forget_misses(f"expiry:{symbol}")
+        
         if not self.client:
             return False
         
@@ -129,16 +249,15 @@ class RedisExpiryCache:
             
             # Calculate TTL until end of day if not specified
             if ttl_seconds is None:
-                now = datetime.now()
-                end_of_day = datetime.combine(today, datetime.max.time())
-                ttl_seconds = int((end_of_day - now).total_seconds()) + 60  # Add 1 minute buffer
-            
-            # Store expiry with today's date as key
-            self.client.setex(today_key, ttl_seconds, expiry)
+                ttl_seconds = self._end_of_day_ttl()
             
-            # Also store in general key with date marker
-            self.client.setex(expiry_key, ttl_seconds, expiry)
-            self.client.setex(date_key, ttl_seconds, today.isoformat())
+            # Store expiry with today's date as key, plus the general key with date marker (one round-trip)
+            pipe = self.client.pipeline(transaction=False)
+            pipe.setex(today_key, ttl_seconds, expiry)
+            pipe.setex(expiry_key, ttl_seconds, expiry)
+            pipe.setex(date_key, ttl_seconds, today.isoformat())
+            self.redis_round_trips += 1
+            pipe.execute()
             
             logger.info(f"Cached expiry for {symbol}: {expiry} (TTL: {ttl_seconds}s)")
             return True
@@ -150,22 +269,100 @@ class RedisExpiryCache:
             logger.debug(f"Unexpected error setting expiry for {symbol}: {str(e)}")
             return False
     
+    def get_expiry_lists(self, symbols: Iterable[str]) -> Dict[str, Optional[List[str]]]:
+        """
+        Get today's cached lists of all expiry dates (nearest first) for many symbols
+        L1 hits cost nothing; all misses are resolved with a single MGET round-trip
+        Returns: Dictionary mapping symbol to expiry list (None if not cached)
+        """
+        symbols = list(symbols)
+        results = {}
+        misses = []
+        for symbol in symbols:
+            expiry_list = self.l1.get(f"list:{symbol}")
+            results[symbol] = expiry_list
+            if expiry_list is None:
+                misses.append(symbol)
+        
+        misses = [key.split(":", 1)[1] for key in self._redis_lookups([f"list:{symbol}" for symbol in misses])]
+        if not misses or not self.client:
+            return results
+        
+        try:
+            self.redis_round_trips += 1
+            values = self.client.mget([self._get_expiry_list_key(symbol) for symbol in misses])
+            for symbol, value in zip(misses, values):
+                if not value:
+                    continue
+                expiry_list = json.loads(value)
+                self.l1.set(f"list:{symbol}", expiry_list)
+                results[symbol] = expiry_list
+            self._remember_misses(f"list:{symbol}" for symbol in misses if results[symbol] is None)
+            return results
+        except (redis.RedisError, ValueError) as e:
+            logger.debug(f"Error getting expiry lists for {len(misses)} symbols: {str(e)}")
+            return results
+    
+    def get_expiry_list(self, symbol: str) -> Optional[List[str]]:
+        """
+        Get today's cached list of all expiry dates for a symbol (nearest first)
+        Returns: List of expiry date strings or None if not cached
+        """
+        return self.get_expiry_lists([symbol]).get(symbol)
+    
+    def set_expiry_list(self, symbol: str, expiry_list: List[str]) -> bool:
+        """
+        Cache the full list of expiry dates for a symbol until the end of today
+        The nearest expiry is also stored as the symbol's expiry for single-expiry readers
+        Returns: True if stored in Redis, False if only kept in process
+        """
+        expiry_list = list(expiry_list)
+        self.l1.set(f"list:{symbol}", expiry_list)
+        self._forget_misses(f"list:{symbol}", f"expiry:{symbol}")
+        if not expiry_list:
+            return False
+        self.l1.set(f"expiry:{symbol}", expiry_list[0])
+        
+        if not self.client:
+            return False
+        
+        try:
+            today = date.today().isoformat()
+            ttl_seconds = self._end_of_day_ttl()
+            expiry_key = self._get_expiry_date_key(symbol)
+            pipe = self.client.pipeline(transaction=False)
+            pipe.setex(self._get_expiry_list_key(symbol), ttl_seconds, json.dumps(expiry_list))
+            pipe.setex(self._get_today_key(symbol), ttl_seconds, expiry_list[0])
+            pipe.setex(expiry_key, ttl_seconds, expiry_list[0])
+            pipe.setex(f"{expiry_key}:date", ttl_seconds, today)
+            self.redis_round_trips += 1
+            pipe.execute()
+            return True
+        except redis.RedisError as e:
+            logger.debug(f"Redis error setting expiry list for {symbol}: {str(e)}")
+            return False
+    
     def clear_expiry(self, symbol: str) -> bool:
         """
-        Clear cached expiry date for a symbol
+        Clear cached expiry date (and expiry list) for a symbol
         Returns: True if successful, False otherwise
         """
+        self.l1.delete(f"expiry:{symbol}")
+        self.l1.delete(f"list:{symbol}")
+        self._forget_misses(f"expiry:{symbol}", f"list:{symbol}")
+        
         if not self.client:
             return False
         
         try:
-            today_key = self._get_today_key(symbol)
             expiry_key = self._get_expiry_date_key(symbol)
-            date_key = f"{expiry_key}:date"
-            
-            self.client.delete(today_key)
-            self.client.delete(expiry_key)
-            self.client.delete(date_key)
+            self.redis_round_trips += 1
+            self.client.delete(
+                self._get_today_key(symbol),
+                expiry_key,
+                f"{expiry_key}:date",
+                self._get_expiry_list_key(symbol)
+            )
             
             logger.info(f"Cleared cached expiry for {symbol}")
             return True
@@ -177,6 +374,14 @@ class RedisExpiryCache:
             logger.debug(f"Unexpected error clearing expiry for {symbol}: {str(e)}")
             return False
     
+    def get_stats(self) -> Dict:
+        """Get L1 hit/miss and Redis round-trip statistics"""
+        return {
+            "l1": self.l1.get_stats(),
+            "redis_round_trips": self.redis_round_trips,
+            "redis_available": self.client is not None
+        }
+    
     def is_available(self) -> bool:
         """Check if Redis is available"""
         if not self.client:
@@ -0,0 +1,223 @@
+"""
+Write-invalidated response cache for the admin panel's stats and status endpoints
+Entries are keyed by endpoint and query parameters and tagged with the versions of the collections
+they were computed from; collectors bump a collection's version after every successful write, so
+repeat polls are memory hits until new data actually lands
+
+Versions live in MongoDB so collector processes and every admin panel worker share them; a worker
+re-reads them (one small query) at most every RESPONSE_CACHE_VERSION_CHECK_SECONDS
+Entries are kept in process (LRU); RESPONSE_CACHE_BACKEND=redis also stores them in Redis so workers
+share warm entries (the in-process copy still answers repeat polls without a round-trip)
+
+Version layout:
+    {"_id": <collection name>, "version": <int>, "updatedAt"}
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+import pymongo
+from dotenv import load_dotenv
+from timezone_utils import now_for_mongo
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Cache configuration
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory').lower()  # memory | redis
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 512))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv('RESPONSE_CACHE_TTL_SECONDS', 600))  # Upper bound on an entry's age, even without writes
+RESPONSE_CACHE_STATUS_TTL_SECONDS = int(os.getenv('RESPONSE_CACHE_STATUS_TTL_SECONDS', 15))  # Status also depends on scheduler processes
+RESPONSE_CACHE_VERSION_CHECK_SECONDS = float(os.getenv('RESPONSE_CACHE_VERSION_CHECK_SECONDS', 2))
+CACHE_VERSIONS_COLLECTION_NAME = os.getenv('MONGO_CACHE_VERSIONS_COLLECTION_NAME', '_cache_versions')
+
+# Redis Configuration (RESPONSE_CACHE_BACKEND=redis)
+REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
+REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
+REDIS_DB = int(os.getenv('REDIS_DB', 0))
+REDIS_PASSWORD = os.getenv('REDIS_PASSWORD', None)
+
+RESPONSE_KEY_PREFIX = "nse:response:"
+
+
+def bump_versions(db, collection_names: Iterable[str]):
+    """
+    Bump the cache version of collections after a successful write
+    Never raises: a failed bump only delays invalidation until the entry's TTL
+    Args:
+        db: pymongo Database the collections live in
+        collection_names: Names of the collections written
+    """
+    names = sorted(set(collection_names))
+    if not names:
+        return
+    try:
+        now = now_for_mongo()
+        db[CACHE_VERSIONS_COLLECTION_NAME].bulk_write([
+            pymongo.UpdateOne({"_id": name}, {"$inc": {"version": 1}, "$set": {"updatedAt": now}}, upsert=True)
+            for name in names
+        ], ordered=False)
+    except Exception as e:
+        logger.warning(f"Failed to bump cache versions of {', '.join(names)}: {str(e)}")
+
+
+class ResponseCache:
+    """Response bodies tagged with collection versions, in process with an optional Redis copy"""
+
+    def __init__(self, db, backend: str = RESPONSE_CACHE_BACKEND, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            db: pymongo Database holding the version documents
+            backend: 'memory' or 'redis'
+            max_entries: Maximum entries kept in process
+        """
+        self.db = db
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()  # key -> (body, versions, stored_at)
+        self._versions = {}
+        self._versions_read_at = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.redis_client = self._connect_redis() if backend == "redis" else None
+
+    def _connect_redis(self):
+        """Connect to Redis (None if unavailable: entries then stay in process only)"""
+        try:
+            import redis
+            client = redis.Redis(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                db=REDIS_DB,
+                password=REDIS_PASSWORD,
+                socket_connect_timeout=2,
+                socket_timeout=2
+            )
+            client.ping()
+            logger.info(f"Response cache using Redis at {REDIS_HOST}:{REDIS_PORT}")
+            return client
+        except Exception as e:
+            logger.warning(f"Redis not available for the response cache, using in-process entries only: {str(e)}")
+            return None
+
+    def get_versions(self, collection_names: List[str]) -> Optional[Dict[str, int]]:
+        """
+        Get the current versions of collections (re-read from MongoDB at most every RESPONSE_CACHE_VERSION_CHECK_SECONDS)
+        Returns: Dictionary of collection name -> version, or None if the versions cannot be read
+        """
+        now = time.monotonic()
+        with self._lock:
+            fresh = self._versions_read_at is not None and now - self._versions_read_at < RESPONSE_CACHE_VERSION_CHECK_SECONDS
+        if not fresh:
+            try:
+                versions = {doc["_id"]: doc.get("version", 0) for doc in self.db[CACHE_VERSIONS_COLLECTION_NAME].find({}, {"version": 1})}
+            except Exception as e:
+                logger.warning(f"Failed to read cache versions: {str(e)}")
+                return None
+            with self._lock:
+                self._versions = versions
+                self._versions_read_at = now
+        with self._lock:
+            return {name: self._versions.get(name, 0) for name in collection_names}
+
+    def get(self, key: str, versions: Dict[str, int], ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS) -> Optional[bytes]:
+        """
+        Get a response body stored with the given versions and within the TTL
+        Args:
+            key: Endpoint and parameters
+            versions: Current versions of the entry's collections (from get_versions)
+            ttl_seconds: Maximum age of the entry
+        Returns: Response body, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                body, stored_versions, stored_at = entry
+                if stored_versions == versions and now - stored_at <= ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return body
+                del self._entries[key]
+
+        if self.redis_client is not None:
+            try:
+                value = self.redis_client.get(RESPONSE_KEY_PREFIX + key)
+                if value:
+                    stored = json.loads(value)
+                    if stored["versions"] == versions and now - stored["stored_at"] <= ttl_seconds:
+                        body = stored["body"].encode("utf-8")
+                        self._store(key, body, versions, stored["stored_at"])
+                        with self._lock:
+                            self.hits += 1
+                        return body
+            except Exception as e:
+                logger.debug(f"Redis error reading cached response {key}: {str(e)}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _store(self, key: str, body: bytes, versions: Dict[str, int], stored_at: float):
+        """Store an entry in process, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (body, versions, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set(self, key: str, body: bytes, versions: Dict[str, int], ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS):
+        """
+        Store a response body
+        Args:
+            key: Endpoint and parameters
+            body: Response body
+            versions: Versions read before the response was computed (a write during it invalidates the entry)
+            ttl_seconds: Maximum age of the entry
+        """
+        stored_at = time.time()
+        self._store(key, body, versions, stored_at)
+        if self.redis_client is not None:
+            try:
+                value = json.dumps({"body": body.decode("utf-8"), "versions": versions, "stored_at": stored_at})
+                self.redis_client.setex(RESPONSE_KEY_PREFIX + key, ttl_seconds, value)
+            except Exception as e:
+                logger.debug(f"Redis error storing cached response {key}: {str(e)}")
+
+    def clear(self):
+        """Drop every in-process entry"""
+        with self._lock:
+            self._entries.clear()
+            self._versions_read_at = None
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss statistics"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "redis_available": self.redis_client is not None
+            }
+
+
+# Global instances (one per database)
+_response_caches = {}
+
+def get_response_cache(db) -> ResponseCache:
+    """Get the response cache for a database"""
+    key = db.name
+    cache = _response_caches.get(key)
+    # Rebuild if the shared MongoDB client was replaced after a failed health check
+    if cache is None or cache.db.client is not db.client:
+        cache = ResponseCache(db)
+        _response_caches[key] = cache
+    return cache
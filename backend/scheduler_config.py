@@ -16,13 +16,17 @@ DEFAULT_CONFIG = {
         "interval_minutes": 3,
         "start_time": "09:15",
         "end_time": "15:30",
-        "enabled": True
+        "enabled": True,
+        "max_workers": 6,  # Parallel symbol fetches per cycle
+        "expiry_count": 1  # Nearest N expiries captured per symbol
     },
     "indices": {
         "interval_minutes": 3,
         "start_time": "09:15",
         "end_time": "15:30",
-        "enabled": True
+        "enabled": True,
+        "max_workers": 4,  # Parallel symbol fetches per cycle
+        "expiry_count": 1  # Nearest N expiries captured per symbol
     },
     "gainers": {
         "interval_minutes": 3,
@@ -0,0 +1,303 @@
+"""
+Schema and index bootstrap
+Creates or verifies every index the collectors rely on once per deploy/startup and
+records the applied schema version, so collectors never issue DDL on hot paths
+
+Usage:
+    python schema_manager.py            # Apply if the recorded version is out of date
+    python schema_manager.py --force    # Re-check and create every index
+    python schema_manager.py --verify   # Report missing indexes without creating them
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import Dict, List
+from dotenv import load_dotenv
+from mongo_pool import get_mongo_db
+from timezone_utils import now_for_mongo
+from logger_config import get_logger
+from nse_all_indices_option_chain_collector import INDICES, ADDITIONAL_EXPIRIES_COLLECTION_NAME
+from nse_all_banks_option_chain_collector import BANKS
+from nse_fiidii_collector import MONGO_COLLECTION_NAME as FIIDII_COLLECTION_NAME
+from nse_gainers_losers_collector import MONGO_GAINERS_COLLECTION_NAME, MONGO_LOSERS_COLLECTION_NAME
+from nse_news_collector import MONGO_COLLECTION_NAME as NEWS_COLLECTION_NAME
+from nse_livemint_news_collector import MONGO_COLLECTION_NAME as LIVEMINT_NEWS_COLLECTION_NAME
+from option_chain_timeseries import STRIKES_COLLECTION_NAME
+from option_greeks import GREEKS_COLLECTION_NAME
+from option_chain_summary import SUMMARY_COLLECTION_NAME
+from option_chain_rollups import ROLLUPS_COLLECTION_NAME
+from backup_incremental import BACKUP_TOMBSTONES_COLLECTION_NAME, BACKUP_TOMBSTONE_RETENTION_DAYS
+from timeseries_store import (
+    is_timeseries_backend, create_timeseries_collections,
+    OPTION_CHAIN_TS_COLLECTION_NAME, MARKET_MOVERS_TS_COLLECTION_NAME, META_FIELD, TIME_FIELD
+)
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Bump whenever an index is added, removed or changed below
+SCHEMA_VERSION = 8
+
+SCHEMA_META_COLLECTION_NAME = os.getenv('MONGO_SCHEMA_META_COLLECTION_NAME', '_schema_meta')
+SCHEMA_META_ID = "indexes"
+
+
+def _option_chain_collection_name(item: Dict) -> str:
+    """Resolve an index/bank option chain collection name (same override as the collectors)"""
+    return os.getenv(f'MONGO_{item["symbol"]}_OPTION_CHAIN_COLLECTION_NAME', item["collection"])
+
+
+def get_option_chain_collection_names() -> Dict[str, str]:
+    """Get symbol -> option chain collection name for every index and bank"""
+    return {item["symbol"]: _option_chain_collection_name(item) for item in list(INDICES) + list(BANKS)}
+
+
+def get_index_specs() -> List[Dict]:
+    """
+    Get every index the application expects
+    Returns: List of {"collection", "keys", "options"} dictionaries
+    """
+    specs = []
+
+    for item in list(INDICES) + list(BANKS):
+        collection_name = _option_chain_collection_name(item)
+        # One snapshot per NSE timestamp
+        specs.append({"collection": collection_name, "keys": [("records.timestamp", 1)], "options": {"unique": True}})
+        # Rebuilding delta-encoded snapshots from their chain
+        specs.append({
+            "collection": collection_name,
+            "keys": [("storage.chain", 1), ("storage.seq", 1)],
+            "options": {"sparse": True}
+        })
+        # Day-range scans (Parquet export, Greeks/summary backfills)
+        specs.append({"collection": collection_name, "keys": [("insertedAt", 1)], "options": {}})
+
+    specs.append({
+        "collection": ADDITIONAL_EXPIRIES_COLLECTION_NAME,
+        "keys": [("symbol", 1), ("expiryDate", 1), ("records.timestamp", 1)],
+        "options": {"unique": True}
+    })
+
+    specs.append({
+        "collection": STRIKES_COLLECTION_NAME,
+        "keys": [("symbol", 1), ("expiry", 1), ("strike", 1), ("type", 1), ("ts", 1)],
+        "options": {"unique": True, "name": "symbol_expiry_strike_type_ts"}
+    })
+    specs.append({"collection": STRIKES_COLLECTION_NAME, "keys": [("symbol", 1), ("ts", -1)], "options": {"name": "symbol_ts"}})
+
+    # One Greeks document per symbol, expiry and snapshot time
+    specs.append({
+        "collection": GREEKS_COLLECTION_NAME,
+        "keys": [("symbol", 1), ("expiry", 1), ("ts", 1)],
+        "options": {"unique": True}
+    })
+    specs.append({"collection": GREEKS_COLLECTION_NAME, "keys": [("symbol", 1), ("ts", -1)], "options": {}})
+
+    # One analytics summary per symbol, expiry and snapshot time (also serves the summary series)
+    specs.append({
+        "collection": SUMMARY_COLLECTION_NAME,
+        "keys": [("symbol", 1), ("expiry", 1), ("ts", 1)],
+        "options": {"unique": True}
+    })
+    specs.append({"collection": SUMMARY_COLLECTION_NAME, "keys": [("symbol", 1), ("ts", -1)], "options": {}})
+
+    # One rollup bucket per symbol, resolution and bucket start
+    specs.append({
+        "collection": ROLLUPS_COLLECTION_NAME,
+        "keys": [("symbol", 1), ("resolution", 1), ("bucket", 1)],
+        "options": {"unique": True}
+    })
+
+    # Time-series backend: (symbol, ts) secondary index on each time-series collection
+    # (the collections themselves are created in bootstrap_schema before any index)
+    if is_timeseries_backend():
+        for collection_name in (OPTION_CHAIN_TS_COLLECTION_NAME, MARKET_MOVERS_TS_COLLECTION_NAME):
+            specs.append({"collection": collection_name, "keys": [(META_FIELD, 1), (TIME_FIELD, -1)], "options": {}})
+
+    specs.append({"collection": FIIDII_COLLECTION_NAME, "keys": [("date", 1)], "options": {"unique": True}})
+
+    for collection_name in (MONGO_GAINERS_COLLECTION_NAME, MONGO_LOSERS_COLLECTION_NAME):
+        specs.append({"collection": collection_name, "keys": [("timestamp", 1)], "options": {"unique": True}})
+
+    specs.append({
+        "collection": NEWS_COLLECTION_NAME,
+        "keys": [("date", 1), ("keyword", 1), ("link", 1)],
+        "options": {"unique": True}
+    })
+    specs.append({"collection": NEWS_COLLECTION_NAME, "keys": [("date", -1)], "options": {}})
+    specs.append({"collection": NEWS_COLLECTION_NAME, "keys": [("keyword", 1)], "options": {}})
+    specs.append({"collection": NEWS_COLLECTION_NAME, "keys": [("sentiment", 1)], "options": {}})
+    # Keyset pagination of the news list (pub_date is not unique, _id breaks ties)
+    specs.append({"collection": NEWS_COLLECTION_NAME, "keys": [("pub_date", -1), ("_id", -1)], "options": {}})
+
+    specs.append({"collection": LIVEMINT_NEWS_COLLECTION_NAME, "keys": [("date", 1), ("link", 1)], "options": {"unique": True}})
+    specs.append({"collection": LIVEMINT_NEWS_COLLECTION_NAME, "keys": [("date", -1)], "options": {}})
+    specs.append({"collection": LIVEMINT_NEWS_COLLECTION_NAME, "keys": [("pub_date", -1)], "options": {}})
+    specs.append({"collection": LIVEMINT_NEWS_COLLECTION_NAME, "keys": [("sentiment", 1)], "options": {}})
+    specs.append({"collection": LIVEMINT_NEWS_COLLECTION_NAME, "keys": [("pub_date", -1), ("_id", -1)], "options": {}})
+
+    # Collections updated in place: incremental backups use updatedAt as their high-water mark
+    # (option chain snapshots are re-upserted, promoted to keyframes and replaced by cold archive stubs)
+    updated_in_place = [_option_chain_collection_name(item) for item in list(INDICES) + list(BANKS)] + [
+        ADDITIONAL_EXPIRIES_COLLECTION_NAME,
+        MONGO_GAINERS_COLLECTION_NAME,
+        MONGO_LOSERS_COLLECTION_NAME,
+        FIIDII_COLLECTION_NAME,
+        NEWS_COLLECTION_NAME,
+        LIVEMINT_NEWS_COLLECTION_NAME,
+        ROLLUPS_COLLECTION_NAME
+    ]
+    for collection_name in updated_in_place:
+        specs.append({"collection": collection_name, "keys": [("updatedAt", 1)], "options": {}})
+
+    # Backup tombstones expire once no restore chain can need them
+    specs.append({
+        "collection": BACKUP_TOMBSTONES_COLLECTION_NAME,
+        "keys": [("deletedAt", 1)],
+        "options": {"expireAfterSeconds": BACKUP_TOMBSTONE_RETENTION_DAYS * 24 * 3600}
+    })
+
+    return specs
+
+
+def specs_fingerprint(specs: List[Dict]) -> str:
+    """Digest of the resolved index specs (changes when a collection name is overridden in .env)"""
+    payload = json.dumps(specs, sort_keys=True)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _existing_key_patterns(collection) -> set:
+    """Get the key patterns of a collection's indexes as tuples"""
+    return {
+        tuple((field, direction) for field, direction in info["key"])
+        for info in collection.index_information().values()
+    }
+
+
+def find_missing_indexes(db, specs: List[Dict]) -> List[Dict]:
+    """
+    Compare the expected indexes against the database
+    Args:
+        db: pymongo Database
+        specs: Index specs from get_index_specs()
+    Returns: Specs whose key pattern does not exist yet
+    """
+    existing = {}
+    missing = []
+    for spec in specs:
+        name = spec["collection"]
+        if name not in existing:
+            existing[name] = _existing_key_patterns(db[name])
+        if tuple(spec["keys"]) not in existing[name]:
+            missing.append(spec)
+    return missing
+
+
+def get_applied_schema(db) -> Dict:
+    """Get the recorded schema metadata (empty dict if never applied)"""
+    return db[SCHEMA_META_COLLECTION_NAME].find_one({"_id": SCHEMA_META_ID}) or {}
+
+
+def bootstrap_schema(force: bool = False) -> Dict:
+    """
+    Create any missing indexes and record the applied schema version
+    Skipped (one metadata read) when the recorded version and specs are current
+    Args:
+        force: Re-check every index even if the recorded version is current
+    Returns: Dictionary with the outcome (applied, version, created, failed)
+    """
+    _, db = get_mongo_db()
+    specs = get_index_specs()
+    fingerprint = specs_fingerprint(specs)
+
+    applied = get_applied_schema(db)
+    if not force and applied.get("version") == SCHEMA_VERSION and applied.get("fingerprint") == fingerprint:
+        logger.debug(f"Schema version {SCHEMA_VERSION} already applied")
+        return {"applied": False, "version": SCHEMA_VERSION, "created": [], "failed": []}
+
+    created = []
+    failed = []
+    if is_timeseries_backend():
+        # Must exist as time-series collections before create_index would create them as ordinary ones
+        try:
+            created.extend(create_timeseries_collections(db))
+        except Exception as e:
+            failed.append("time-series collections")
+            logger.error(f"Failed to create time-series collections: {str(e)}")
+
+    missing = find_missing_indexes(db, specs)
+    for spec in missing:
+        label = f"{spec['collection']}: {spec['keys']}"
+        try:
+            # Background builds keep the collection readable and writable on older servers
+            db[spec["collection"]].create_index(spec["keys"], background=True, **spec["options"])
+            created.append(label)
+            logger.info(f"Created index {label}")
+        except Exception as e:
+            failed.append(label)
+            logger.error(f"Failed to create index {label}: {str(e)}")
+
+    # Leave the version unrecorded on failure so the next startup retries
+    if not failed:
+        db[SCHEMA_META_COLLECTION_NAME].update_one(
+            {"_id": SCHEMA_META_ID},
+            {"$set": {
+                "version": SCHEMA_VERSION,
+                "fingerprint": fingerprint,
+                "index_count": len(specs),
+                "applied_at": now_for_mongo()
+            }},
+            upsert=True
+        )
+
+    logger.info(
+        f"Schema version {SCHEMA_VERSION}: {len(specs)} indexes expected, "
+        f"{len(created)} created, {len(failed)} failed"
+    )
+    return {"applied": not failed, "version": SCHEMA_VERSION, "created": created, "failed": failed}
+
+
+def start_schema_bootstrap_in_background() -> threading.Thread:
+    """Run bootstrap_schema() in a daemon thread so startup is not blocked by index builds"""
+    def bootstrap_worker():
+        try:
+            bootstrap_schema()
+        except Exception as e:
+            logger.error(f"Schema bootstrap failed: {str(e)}")
+
+    thread = threading.Thread(target=bootstrap_worker, daemon=True, name="SchemaBootstrap")
+    thread.start()
+    return thread
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Create or verify MongoDB indexes")
+    parser.add_argument("--force", action="store_true", help="Re-check every index even if the schema version is current")
+    parser.add_argument("--verify", action="store_true", help="Only report missing indexes")
+    args = parser.parse_args()
+
+    if args.verify:
+        _, db = get_mongo_db()
+        applied = get_applied_schema(db)
+        missing = find_missing_indexes(db, get_index_specs())
+        print(f"Recorded schema version: {applied.get('version', 'none')} (current: {SCHEMA_VERSION})")
+        for spec in missing:
+            print(f"Missing index {spec['collection']}: {spec['keys']}")
+        print(f"{len(missing)} missing indexes")
+        sys.exit(1 if missing else 0)
+
+    result = bootstrap_schema(force=args.force)
+    print(f"Schema version {result['version']}: {len(result['created'])} indexes created, {len(result['failed'])} failed")
+    sys.exit(1 if result["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
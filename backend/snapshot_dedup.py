@@ -0,0 +1,214 @@
+"""
+Content-hash deduplication for option chain snapshots
+Remembers the last stored timestamp, payload digest and ETag per symbol so
+collectors can skip parsing and rewriting a response NSE has not refreshed
+State is kept in memory with Redis as a fallback shared across processes and restarts
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict, Optional
+import redis
+from dotenv import load_dotenv
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Dedup configuration
+SNAPSHOT_DEDUP_ENABLED = os.getenv('SNAPSHOT_DEDUP_ENABLED', 'true').lower() == 'true'
+SNAPSHOT_DEDUP_TTL_SECONDS = int(os.getenv('SNAPSHOT_DEDUP_TTL_SECONDS', 86400))  # Redis record lifetime
+
+# Redis Configuration
+REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
+REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
+REDIS_DB = int(os.getenv('REDIS_DB', 0))
+REDIS_PASSWORD = os.getenv('REDIS_PASSWORD', None)
+
+# Redis key prefix for last stored snapshot per symbol
+SNAPSHOT_KEY_PREFIX = "nse:snapshot:"
+
+# Returned by collectors' fetch methods when the snapshot is already stored
+UNCHANGED = object()
+
+
+def payload_digest(content: bytes) -> str:
+    """Digest of a raw response body"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class SnapshotDeduplicator:
+    """Tracks the last stored snapshot per symbol and counts skipped work"""
+
+    def __init__(self):
+        """Initialize in-memory state and the optional Redis fallback"""
+        self.client = None
+        self._last = {}  # symbol -> {"timestamp", "digest", "etag"}
+        self._pending = {}  # symbol -> record waiting for a successful write
+        self._lock = threading.Lock()
+        self._stats = {
+            "checked": 0,
+            "skipped_not_modified": 0,
+            "skipped_same_digest": 0,
+            "skipped_same_timestamp": 0,
+            "changed": 0
+        }
+        if SNAPSHOT_DEDUP_ENABLED:
+            self._connect_redis()
+
+    def _connect_redis(self):
+        """Establish Redis connection with error handling (memory-only if unavailable)"""
+        try:
+            connection_params = {
+                'host': REDIS_HOST,
+                'port': REDIS_PORT,
+                'db': REDIS_DB,
+                'decode_responses': True,
+                'socket_connect_timeout': 5,
+                'socket_timeout': 5
+            }
+
+            if REDIS_PASSWORD:
+                connection_params['password'] = REDIS_PASSWORD
+
+            self.client = redis.Redis(**connection_params)
+            self.client.ping()
+        except Exception as e:
+            logger.debug(f"Redis not available for snapshot dedup: {str(e)}. Using in-memory state only.")
+            self.client = None
+
+    def _increment(self, key: str):
+        """Increment a stats counter"""
+        with self._lock:
+            self._stats[key] += 1
+
+    def _get_last(self, symbol: str) -> Optional[Dict]:
+        """Get the last stored snapshot record (memory first, then Redis)"""
+        with self._lock:
+            last = self._last.get(symbol)
+        if last is not None or self.client is None:
+            return last
+
+        try:
+            last = self.client.hgetall(f"{SNAPSHOT_KEY_PREFIX}{symbol}") or None
+        except redis.RedisError as e:
+            logger.debug(f"Redis error reading snapshot record for {symbol}: {str(e)}")
+            return None
+        if last:
+            with self._lock:
+                self._last.setdefault(symbol, last)
+        return last
+
+    def conditional_headers(self, symbol: str) -> Dict[str, str]:
+        """Headers for a conditional request (If-None-Match) if NSE sent an ETag last time"""
+        if not SNAPSHOT_DEDUP_ENABLED:
+            return {}
+        last = self._get_last(symbol)
+        if last and last.get("etag"):
+            return {"If-None-Match": last["etag"]}
+        return {}
+
+    def is_not_modified(self, symbol: str, status_code: int) -> bool:
+        """Check for (and count) a 304 Not Modified answer"""
+        if SNAPSHOT_DEDUP_ENABLED and status_code == 304:
+            self._increment("checked")
+            self._increment("skipped_not_modified")
+            logger.debug(f"{symbol} option chain not modified (304)")
+            return True
+        return False
+
+    def check_payload(self, symbol: str, content: bytes, etag: Optional[str] = None) -> bool:
+        """
+        Check a raw response body against the last stored snapshot (before parsing it)
+        Args:
+            symbol: Index or bank symbol
+            content: Raw response body
+            etag: ETag response header, if any
+        Returns: True if the payload is unchanged and can be skipped
+        """
+        if not SNAPSHOT_DEDUP_ENABLED:
+            return False
+        self._increment("checked")
+        digest = payload_digest(content)
+        last = self._get_last(symbol)
+        if last and last.get("digest") == digest:
+            self._increment("skipped_same_digest")
+            logger.debug(f"{symbol} option chain payload unchanged, skipping parse and write")
+            return True
+        with self._lock:
+            self._pending[symbol] = {"digest": digest, "etag": etag or ""}
+        return False
+
+    def check_timestamp(self, symbol: str, timestamp: str) -> bool:
+        """
+        Check a parsed snapshot's records.timestamp against the last stored one
+        Returns: True if NSE has not refreshed the snapshot and the write can be skipped
+        """
+        if not SNAPSHOT_DEDUP_ENABLED:
+            return False
+        last = self._get_last(symbol)
+        with self._lock:
+            pending = self._pending.get(symbol)
+            if pending is not None:
+                pending["timestamp"] = timestamp
+        if last and last.get("timestamp") == timestamp:
+            self._increment("skipped_same_timestamp")
+            logger.debug(f"{symbol} option chain timestamp {timestamp} unchanged, skipping write")
+            # Remember the new digest so the next identical payload is skipped before parsing
+            self.commit(symbol)
+            return True
+        self._increment("changed")
+        return False
+
+    def commit(self, symbol: str):
+        """Record the pending snapshot of a symbol as stored (call after a successful write)"""
+        if not SNAPSHOT_DEDUP_ENABLED:
+            return
+        with self._lock:
+            record = self._pending.pop(symbol, None)
+            if record is None or "timestamp" not in record:
+                return
+            self._last[symbol] = record
+
+        if self.client is not None:
+            try:
+                key = f"{SNAPSHOT_KEY_PREFIX}{symbol}"
+                pipe = self.client.pipeline()
+                pipe.hset(key, mapping=record)
+                pipe.expire(key, SNAPSHOT_DEDUP_TTL_SECONDS)
+                pipe.execute()
+            except redis.RedisError as e:
+                logger.debug(f"Redis error storing snapshot record for {symbol}: {str(e)}")
+
+    def discard(self, symbol: str):
+        """Drop the pending snapshot of a symbol (call when the write failed)"""
+        with self._lock:
+            self._pending.pop(symbol, None)
+
+    def get_stats(self) -> Dict:
+        """Get dedup statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["symbols_tracked"] = len(self._last)
+        stats["skipped"] = stats["skipped_not_modified"] + stats["skipped_same_digest"] + stats["skipped_same_timestamp"]
+        stats["enabled"] = SNAPSHOT_DEDUP_ENABLED
+        stats["backend"] = "memory+redis" if self.client is not None else "memory"
+        return stats
+
+
+# Global instance
+_snapshot_dedup = None
+_snapshot_dedup_lock = threading.Lock()
+
+def get_snapshot_dedup() -> SnapshotDeduplicator:
+    """Get global snapshot deduplicator instance"""
+    global _snapshot_dedup
+    if _snapshot_dedup is None:
+        with _snapshot_dedup_lock:
+            if _snapshot_dedup is None:
+                _snapshot_dedup = SnapshotDeduplicator()
+    return _snapshot_dedup
@@ -90,6 +90,13 @@ def main():
     # MASTER SCHEDULER - Starting All Data Collectors
     # Started at: {datetime.now()}
     
+    # Create or verify MongoDB indexes once before any collector runs
+    try:
+        from schema_manager import bootstrap_schema
+        bootstrap_schema()
+    except Exception as e:
+        logger.error(f"Schema bootstrap failed: {str(e)}")
+    
     # List of all schedulers
     schedulers = [
         ('cronjob_scheduler', 'FII/DII Data Collector'),
@@ -0,0 +1,86 @@
+"""
+Shared test fixtures
+Tests run against mongomock, so no MongoDB server is needed:
+    cd backend && pip install -r requirements-dev.txt && python -m pytest -q tests
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+import mongomock
+import pytest
+
+# Backend modules are flat, imported the way the schedulers and admin panel import them
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db():
+    """Empty in-memory database"""
+    return mongomock.MongoClient()["nse_data_test"]
+
+
+@pytest.fixture(autouse=True)
+def mongomock_list_collections(monkeypatch):
+    """mongomock has no listCollections: report every collection as a regular one"""
+    def list_collections(self, filter=None, **kwargs):
+        infos = [{"name": name, "type": "collection"} for name in self.list_collection_names()]
+        wanted = (filter or {}).get("type")
+        return iter([info for info in infos if wanted is None or info["type"] == wanted])
+
+    monkeypatch.setattr(mongomock.database.Database, "list_collections", list_collections, raising=False)
+
+
+def make_chain(timestamp: str, underlying: float, strikes) -> dict:
+    """
+    Build a minimal NSE option chain response
+    Args:
+        timestamp: records.timestamp (e.g. "17-Oct-2026 10:00:00")
+        underlying: records.underlyingValue
+        strikes: Iterable of (strike price, CE last price)
+    """
+    rows = [
+        {
+            "strikePrice": strike,
+            "expiryDates": "30-Oct-2026",
+            "CE": {"strikePrice": strike, "lastPrice": price, "openInterest": strike // 10},
+            "PE": {"strikePrice": strike, "lastPrice": round(price / 2, 2)}
+        }
+        for strike, price in strikes
+    ]
+    return {
+        "records": {"timestamp": timestamp, "underlyingValue": underlying, "expiryDates": ["30-Oct-2026"], "data": rows},
+        "filtered": {"data": [row for row in rows if row["strikePrice"] >= 25000]}
+    }
+
+
+@pytest.fixture
+def backup_clock(monkeypatch):
+    """Backup ids have one-second resolution: give each backup of a test its own second"""
+    import backup_incremental
+
+    class Clock(datetime):
+        calls = 0
+
+        @classmethod
+        def now(cls, tz=None):
+            cls.calls += 1
+            return datetime(2026, 10, 17, 18, 0) + timedelta(seconds=cls.calls)
+
+    monkeypatch.setattr(backup_incremental, "datetime", Clock)
+
+
+def take_backup(db, path, mode: str):
+    """
+    Write a planned backup of every collection to a file and record its checkpoint
+    Returns: The BackupPlan
+    """
+    from backup_incremental import BACKUP_CHECKPOINTS_COLLECTION_NAME, complete_backup, plan_backup
+    from backup_stream import write_backup_file
+
+    collections = [name for name in db.list_collection_names() if name != BACKUP_CHECKPOINTS_COLLECTION_NAME]
+    plan = plan_backup(db, collections, mode)
+    with open(path, "wb") as output:
+        manifest = write_backup_file(output, db, plan.collections, plan.backup_format, plan.queries, plan.metadata)
+    complete_backup(db, plan, manifest)
+    return plan
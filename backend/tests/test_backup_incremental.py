@@ -0,0 +1,63 @@
+"""Incremental backups: deletes and in-place rewrites reach a restore of the chain"""
+
+import zipfile
+from datetime import datetime
+import mongomock
+from conftest import make_chain, take_backup
+from backup_incremental import BACKUP_TOMBSTONES_COLLECTION_NAME
+from backup_restore import restore_chain
+from backup_stream import collection_entry_name
+from option_chain_delta_store import OptionChainDeltaStore
+
+
+def test_incremental_restore_replays_deletes_and_keyframe_promotion(db, tmp_path, backup_clock):
+    collection = db["nifty_option_chain"]
+    collection.create_index([("updatedAt", 1)])
+    store = OptionChainDeltaStore(keyframe_interval=10)
+    for minute in (0, 3, 6):
+        store.save_snapshot(collection, make_chain(f"17-Oct-2026 10:0{minute}:00", 25000.0 + minute, [(25000, 80.0 + minute)]))
+    first, second, third = [doc["_id"] for doc in collection.find().sort("_id", 1)]
+
+    base = take_backup(db, tmp_path / "base.zip", "full")
+    assert store.delete_snapshot(collection, first) == 1
+    assert db[BACKUP_TOMBSTONES_COLLECTION_NAME].find_one({"docId": first})["collection"] == "nifty_option_chain"
+    increment = take_backup(db, tmp_path / "incremental.zip", "incremental")
+    assert increment.parent == base.backup_id
+    assert increment.checkpoints["nifty_option_chain"]["key"] == "updatedAt"
+
+    target = mongomock.MongoClient()["nse_data_restored"]
+    result = restore_chain(target, [str(tmp_path / "base.zip"), str(tmp_path / "incremental.zip")], build_indexes=False)
+
+    assert result["archives"][1]["deleted"] == 1
+    restored = target["nifty_option_chain"]
+    assert [doc["_id"] for doc in restored.find().sort("_id", 1)] == [second, third]
+    assert restored.find_one({"_id": second})["storage"]["type"] == "keyframe"
+    assert store.find_snapshot(restored, {"_id": third})["records"] == store.find_snapshot(collection, {"_id": third})["records"]
+
+
+def test_failed_collection_is_exported_again_by_the_next_increment(db, tmp_path, backup_clock, monkeypatch):
+    import backup_incremental
+    import backup_stream
+    monkeypatch.setattr(backup_incremental, "BACKUP_CHECKPOINT_OVERLAP_SECONDS", 0)
+    collection = db["fiidii_trades"]
+    collection.create_index([("updatedAt", 1)])
+    collection.insert_one({"date": "16-Oct-2026", "updatedAt": datetime(2026, 10, 16, 18, 0)})
+    take_backup(db, tmp_path / "base.zip", "full")
+
+    collection.insert_one({"date": "17-Oct-2026", "updatedAt": datetime(2026, 10, 17, 18, 0)})
+    write_collection = backup_stream.write_collection
+
+    def failing_write_collection(zip_file, source, *args, **kwargs):
+        if source.name == "fiidii_trades":
+            raise RuntimeError("cursor killed")
+        return write_collection(zip_file, source, *args, **kwargs)
+
+    monkeypatch.setattr(backup_stream, "write_collection", failing_write_collection)
+    failed = take_backup(db, tmp_path / "incremental1.zip", "incremental")
+    assert failed.checkpoints["fiidii_trades"]["high"] == datetime(2026, 10, 16, 18, 0)
+
+    monkeypatch.setattr(backup_stream, "write_collection", write_collection)
+    take_backup(db, tmp_path / "incremental2.zip", "incremental")
+    with zipfile.ZipFile(tmp_path / "incremental2.zip") as archive:
+        exported = archive.read(collection_entry_name("fiidii_trades", "ndjson")).decode("utf-8")
+    assert "17-Oct-2026" in exported and "16-Oct-2026" not in exported
@@ -0,0 +1,132 @@
+"""Backup -> restore round-trips: increments replace updated documents, restores run as jobs"""
+
+import time
+from datetime import datetime
+from types import SimpleNamespace
+import mongomock
+from conftest import take_backup
+from backup_jobs import BACKUP_JOBS_COLLECTION_NAME, STATUS_COMPLETE, STATUS_RUNNING, BackupJobs
+from backup_restore import restore_chain
+from timezone_utils import now_for_mongo
+
+
+def _fiidii(db):
+    """Collection updated in place (updatedAt high-water key, as schema_manager indexes it)"""
+    collection = db["fiidii_trades"]
+    collection.create_index([("updatedAt", 1)])
+    collection.insert_many([
+        {"date": "16-Oct-2026", "netValue": 100.0, "updatedAt": now_for_mongo()},
+        {"date": "17-Oct-2026", "netValue": 200.0, "updatedAt": now_for_mongo()}
+    ])
+    return collection
+
+
+def _wait_for_job(jobs, job_id, timeout=10.0):
+    """Poll a job until it leaves the running state"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.get_job(job_id)
+        if job["status"] != STATUS_RUNNING:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} still running after {timeout}s")
+
+
+def test_increment_replaces_documents_updated_in_place(db, tmp_path, backup_clock):
+    collection = _fiidii(db)
+    take_backup(db, tmp_path / "base.zip", "full")
+    collection.update_one({"date": "17-Oct-2026"}, {"$set": {"netValue": 250.0, "updatedAt": now_for_mongo()}})
+    collection.insert_one({"date": "18-Oct-2026", "netValue": 300.0, "updatedAt": now_for_mongo()})
+    take_backup(db, tmp_path / "incremental.zip", "incremental")
+
+    target = mongomock.MongoClient()["nse_data_restored"]
+    result = restore_chain(target, [str(tmp_path / "base.zip"), str(tmp_path / "incremental.zip")], build_indexes=False)
+
+    base_report, increment_report = result["archives"]
+    assert base_report["backup_type"] == "full" and increment_report["backup_type"] == "incremental"
+    assert increment_report["parent"] == base_report["backup_id"]
+    assert increment_report["collections"]["fiidii_trades"]["inserted"] == 1
+    # The overlap window re-exports the untouched document too; replacing it is harmless
+    assert increment_report["collections"]["fiidii_trades"]["replaced"] == 2
+    restored = {doc["date"]: doc["netValue"] for doc in target["fiidii_trades"].find()}
+    assert restored == {"16-Oct-2026": 100.0, "17-Oct-2026": 250.0, "18-Oct-2026": 300.0}
+
+
+def test_restore_job_reports_result_and_keeps_job_documents(db, tmp_path, backup_clock):
+    _fiidii(db)
+    db[BACKUP_JOBS_COLLECTION_NAME].insert_one({"_id": "20261016_180000", "status": STATUS_COMPLETE})
+    take_backup(db, tmp_path / "base.zip", "full")
+
+    target = mongomock.MongoClient()["nse_data_restored"]
+    jobs = BackupJobs(target, backup_dir=str(tmp_path))
+    started = jobs.start_restore_job(["base.zip"], workers=2, drop=True, build_indexes=False)
+    assert started["status"] == STATUS_RUNNING and started["kind"] == "restore"
+
+    job = _wait_for_job(jobs, started["job_id"])
+    assert job["status"] == STATUS_COMPLETE, job.get("error")
+    assert job["archivesDone"] == 1 and job["documents"] == 2
+    assert job["result"]["archives"][0]["collections"]["fiidii_trades"]["inserted"] == 2
+    assert target["fiidii_trades"].count_documents({}) == 2
+    # The archive's job documents are not restored over the running job
+    assert target[BACKUP_JOBS_COLLECTION_NAME].find_one({"_id": "20261016_180000"}) is None
+    assert jobs.get_artifact_path(job) is None
+
+
+class TimeSeriesCollection:
+    """mongomock collection standing in for a time-series one, which stores a repeated _id silently"""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.name = collection.name
+        self.duplicates_written = 0
+
+    def insert_many(self, documents, ordered=True):
+        stored = {doc["_id"] for doc in self._collection.find({"_id": {"$in": [doc["_id"] for doc in documents]}}, {"_id": 1})}
+        self.duplicates_written += len(stored)
+        fresh = [doc for doc in documents if doc["_id"] not in stored]
+        return self._collection.insert_many(fresh, ordered=ordered) if fresh else SimpleNamespace(inserted_ids=[])
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+class TimeSeriesModeDatabase:
+    """Database whose option_chain_snapshots_ts is listed (and behaves) as a time-series collection"""
+
+    def __init__(self, db):
+        self._db = db
+        self.name = db.name
+        self.snapshots = TimeSeriesCollection(db["option_chain_snapshots_ts"])
+
+    def list_collections(self, filter=None):
+        infos = [{"name": name, "type": "collection"} for name in self._db.list_collection_names() if name != self.snapshots.name]
+        infos.append({"name": self.snapshots.name, "type": "timeseries"})
+        return iter([info for info in infos if info["type"] == (filter or {}).get("type", info["type"])])
+
+    def __getitem__(self, name):
+        return self.snapshots if name == self.snapshots.name else self._db[name]
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+def test_timeseries_restore_skips_documents_already_stored(db, tmp_path, backup_clock):
+    snapshots = db["option_chain_snapshots_ts"]
+    snapshots.insert_many([
+        {"ts": datetime(2026, 10, 17, 10, minute), "meta": "NIFTY", "updatedAt": now_for_mongo()} for minute in (0, 3)
+    ])
+    take_backup(db, tmp_path / "base.zip", "full")
+    snapshots.insert_one({"ts": datetime(2026, 10, 17, 10, 6), "meta": "NIFTY", "updatedAt": now_for_mongo()})
+    take_backup(db, tmp_path / "incremental.zip", "incremental")
+
+    target = TimeSeriesModeDatabase(mongomock.MongoClient()["nse_data_restored"])
+    archives = [str(tmp_path / "base.zip"), str(tmp_path / "incremental.zip")]
+    first = restore_chain(target, archives, build_indexes=False)
+    # Restoring again without drop reloads every document
+    second = restore_chain(target, archives, build_indexes=False)
+
+    assert target.snapshots.duplicates_written == 0
+    assert target.snapshots.count_documents({}) == 3
+    # The increment's overlap window re-reads the two base snapshots
+    assert first["archives"][1]["collections"]["option_chain_snapshots_ts"]["duplicates"] == 2
+    assert [report["collections"]["option_chain_snapshots_ts"]["inserted"] for report in second["archives"]] == [0, 0]
@@ -0,0 +1,67 @@
+"""
+Tests for the collections a backup exports
+mongomock has no listCollections, so the database below reports what MongoDB lists in
+time-series mode (time-series collections, their system.buckets and the read views)
+"""
+
+import io
+import json
+import zipfile
+from datetime import datetime
+from backup_stream import MANIFEST_ENTRY, METADATA_ENTRY, collection_entry_name, list_backup_collections, write_backup_file
+
+
+class TimeSeriesDatabase:
+    """mongomock database whose listCollections output includes collection types"""
+
+    def __init__(self, db, infos):
+        self._db = db
+        self._infos = infos
+        self.name = db.name
+
+    def list_collections(self):
+        return iter(self._infos)
+
+    def __getitem__(self, name):
+        return self._db[name]
+
+
+def timeseries_mode_db(db):
+    db["option_chain_snapshots_ts"].insert_many([
+        {"ts": datetime(2026, 10, 17, 10, 0), "meta": {"symbol": "NIFTY"}, "data": {"records": {}}},
+        {"ts": datetime(2026, 10, 17, 10, 1), "meta": {"symbol": "NIFTY"}, "data": {"records": {}}}
+    ])
+    db["market_movers_ts"].insert_one({"ts": datetime(2026, 10, 17, 10, 0), "meta": {"symbol": "gainers"}, "data": {}})
+    db["fiidii_trades"].insert_one({"date": "17-Oct-2026"})
+    return TimeSeriesDatabase(db, [
+        {"name": "option_chain_snapshots_ts", "type": "timeseries"},
+        {"name": "market_movers_ts", "type": "timeseries"},
+        {"name": "system.buckets.option_chain_snapshots_ts", "type": "collection"},
+        {"name": "system.buckets.market_movers_ts", "type": "collection"},
+        {"name": "system.views", "type": "collection"},
+        {"name": "option_chain_snapshots_ts_view", "type": "view"},
+        {"name": "fiidii_trades", "type": "collection"}
+    ])
+
+
+def test_backup_collections_include_timeseries_and_skip_views(db):
+    collections = list_backup_collections(timeseries_mode_db(db))
+
+    assert collections == ["option_chain_snapshots_ts", "market_movers_ts", "fiidii_trades"]
+
+
+def test_timeseries_mode_backup_contains_timeseries_collections(db):
+    source = timeseries_mode_db(db)
+    output = io.BytesIO()
+
+    manifest = write_backup_file(output, source, list_backup_collections(source))
+
+    assert manifest["errors"] == {}
+    assert manifest["collections"] == {"option_chain_snapshots_ts": 2, "market_movers_ts": 1, "fiidii_trades": 1}
+    with zipfile.ZipFile(output) as archive:
+        names = archive.namelist()
+        assert json.loads(archive.read(METADATA_ENTRY))["collections"] == list(manifest["collections"])
+        lines = archive.read(collection_entry_name("option_chain_snapshots_ts", "ndjson")).splitlines()
+    assert len(lines) == 2
+    assert MANIFEST_ENTRY in names
+    assert collection_entry_name("option_chain_snapshots_ts_view", "ndjson") not in names
@@ -0,0 +1,21 @@
+"""Series endpoints default to the nearest expiry even when additional expiries share the snapshot time"""
+
+from datetime import datetime
+import pytest
+from option_chain_summary import OptionChainSummary
+from option_chain_timeseries import OptionChainTimeSeries
+
+
+@pytest.mark.parametrize("store_class", [OptionChainTimeSeries, OptionChainSummary])
+def test_latest_expiry_is_nearest_at_latest_time(db, store_class):
+    store = store_class(db)
+    earlier, latest = datetime(2026, 10, 17, 10, 0), datetime(2026, 10, 17, 10, 3)
+    store.collection.insert_many([
+        {"symbol": "NIFTY", "ts": earlier, "expiry": "23-Oct-2026"},
+        {"symbol": "NIFTY", "ts": latest, "expiry": "27-Nov-2026"},
+        {"symbol": "NIFTY", "ts": latest, "expiry": "30-Oct-2026"},
+        {"symbol": "NIFTY", "ts": latest, "expiry": "24-Dec-2026"},
+        {"symbol": "BANKNIFTY", "ts": latest, "expiry": "28-Oct-2026"}
+    ])
+    assert store.get_latest_expiry("NIFTY") == "30-Oct-2026"
+    assert store.get_latest_expiry("FINNIFTY") is None
@@ -0,0 +1,141 @@
+"""Delta-encoded snapshot storage: write, rebuild and delete without breaking a chain"""
+
+from conftest import make_chain
+from option_chain_delta_store import OptionChainDeltaStore, diff_rows, apply_row_delta
+
+
+def _snapshots():
+    """Five consecutive snapshots with changed, added and removed strikes"""
+    return [
+        make_chain("17-Oct-2026 10:00:00", 25010.5, [(24900, 120.0), (25000, 80.0), (25100, 45.0)]),
+        make_chain("17-Oct-2026 10:03:00", 25020.0, [(24900, 125.0), (25000, 82.5), (25100, 45.0)]),
+        make_chain("17-Oct-2026 10:06:00", 25035.0, [(24900, 131.0), (25000, 86.0), (25100, 47.0), (25200, 20.0)]),
+        make_chain("17-Oct-2026 10:09:00", 25001.0, [(25000, 79.0), (25100, 44.0), (25200, 18.5)]),
+        make_chain("17-Oct-2026 10:12:00", 24990.0, [(25000, 75.0), (25100, 41.0), (25200, 17.0)])
+    ]
+
+
+def _strip(document):
+    """Snapshot fields that must survive the round-trip"""
+    return {"records": document["records"], "filtered": document["filtered"]}
+
+
+def test_diff_and_apply_rows_round_trip():
+    old, new = _snapshots()[2]["records"]["data"], _snapshots()[3]["records"]["data"]
+    assert apply_row_delta(old, diff_rows(old, new)) == new
+
+
+def test_round_trip_rebuilds_every_snapshot(db):
+    collection = db["nifty_option_chain"]
+    store = OptionChainDeltaStore(keyframe_interval=3)
+    snapshots = _snapshots()
+    for snapshot in snapshots:
+        assert store.save_snapshot(collection, snapshot)
+
+    stored = list(collection.find().sort("_id", 1))
+    assert [doc["storage"]["type"] for doc in stored] == ["keyframe", "delta", "delta", "keyframe", "delta"]
+    assert all("data" not in doc["records"] for doc in stored if doc["storage"]["type"] == "delta")
+    assert [doc["dataCount"] for doc in stored] == [3, 3, 4, 3, 3]
+
+    for snapshot, doc in zip(snapshots, stored):
+        assert _strip(store.find_snapshot(collection, {"_id": doc["_id"]})) == snapshot
+    assert [_strip(doc) for doc in store.iter_snapshots(collection, {})] == snapshots
+
+
+def test_same_timestamp_is_not_stored_twice(db):
+    collection = db["nifty_option_chain"]
+    store = OptionChainDeltaStore()
+    snapshot = _snapshots()[0]
+    store.save_snapshot(collection, snapshot)
+    store.save_snapshot(collection, snapshot)
+    assert collection.count_documents({}) == 1
+
+
+def test_delete_promotes_successor_to_keyframe(db):
+    collection = db["nifty_option_chain"]
+    store = OptionChainDeltaStore(keyframe_interval=10)
+    snapshots = _snapshots()
+    for snapshot in snapshots:
+        store.save_snapshot(collection, snapshot)
+    ids = [doc["_id"] for doc in collection.find().sort("_id", 1)]
+
+    # Deleting the keyframe rewrites the first delta as a full keyframe
+    assert store.delete_snapshot(collection, ids[0]) == 1
+    promoted = collection.find_one({"_id": ids[1]})
+    assert promoted["storage"]["type"] == "keyframe"
+    assert promoted["records"]["data"] == snapshots[1]["records"]["data"]
+
+    # Deleting a delta in the middle keeps later snapshots readable
+    assert store.delete_snapshot(collection, ids[2]) == 1
+    for snapshot, record_id in zip(snapshots[3:], ids[3:]):
+        assert _strip(store.find_snapshot(collection, {"_id": record_id})) == snapshot
+    assert [_strip(doc) for doc in store.iter_snapshots(collection, {})] == [snapshots[1]] + snapshots[3:]
+
+
+def test_delete_tail_starts_new_keyframe(db):
+    collection = db["nifty_option_chain"]
+    store = OptionChainDeltaStore(keyframe_interval=10)
+    snapshots = _snapshots()
+    for snapshot in snapshots[:2]:
+        store.save_snapshot(collection, snapshot)
+    tail = collection.find_one(sort=[("_id", -1)])
+
+    assert store.delete_snapshot(collection, tail["_id"]) == 1
+    store.save_snapshot(collection, snapshots[2])
+    latest = collection.find_one(sort=[("_id", -1)])
+    assert latest["storage"]["type"] == "keyframe"
+    assert _strip(store.find_snapshot(collection, {"_id": latest["_id"]})) == snapshots[2]
+
+
+def test_delete_missing_snapshot(db):
+    from bson import ObjectId
+    assert OptionChainDeltaStore().delete_snapshot(db["nifty_option_chain"], ObjectId()) == 0
+
+
+def test_delete_invalidates_cached_responses(db):
+    from response_cache import CACHE_VERSIONS_COLLECTION_NAME
+    collection = db["nifty_option_chain"]
+    store = OptionChainDeltaStore()
+    for snapshot in _snapshots()[:2]:
+        store.save_snapshot(collection, snapshot)
+    versions = db[CACHE_VERSIONS_COLLECTION_NAME]
+    before = versions.find_one({"_id": "nifty_option_chain"})["version"]
+
+    store.delete_snapshot(collection, collection.find_one(sort=[("_id", 1)])["_id"])
+    assert versions.find_one({"_id": "nifty_option_chain"})["version"] == before + 1
+
+
+def test_tail_deleted_by_another_process_starts_new_keyframe(db):
+    collection = db["nifty_option_chain"]
+    scheduler, admin_panel = OptionChainDeltaStore(keyframe_interval=10), OptionChainDeltaStore(keyframe_interval=10)
+    snapshots = _snapshots()
+    for snapshot in snapshots[:2]:
+        scheduler.save_snapshot(collection, snapshot)
+
+    tail = collection.find_one(sort=[("_id", -1)])
+    assert admin_panel.delete_snapshot(collection, tail["_id"]) == 1
+    scheduler.save_snapshot(collection, snapshots[2])
+
+    latest = collection.find_one(sort=[("_id", -1)])
+    assert latest["storage"]["type"] == "keyframe"
+    assert [_strip(doc) for doc in scheduler.iter_snapshots(collection, {})] == [snapshots[0], snapshots[2]]
+
+
+def test_gap_in_chain_returns_incomplete_document(db):
+    collection = db["nifty_option_chain"]
+    store = OptionChainDeltaStore(keyframe_interval=10)
+    snapshots = _snapshots()
+    for snapshot in snapshots:
+        store.save_snapshot(collection, snapshot)
+    ids = [doc["_id"] for doc in collection.find().sort("_id", 1)]
+    # Removed without delete_snapshot (manual cleanup): later deltas have no base
+    collection.delete_one({"_id": ids[2]})
+
+    broken = store.find_snapshot(collection, {"_id": ids[3]})
+    assert broken["incomplete"] is True
+    assert "data" not in broken["records"] and "delta" in broken
+    assert not store.find_snapshot(collection, {"_id": ids[1]}).get("incomplete")
+
+    streamed = list(store.iter_snapshots(collection, {}))
+    assert [bool(doc.get("incomplete")) for doc in streamed] == [False, False, True, True]
+    assert _strip(streamed[1]) == snapshots[1]
@@ -0,0 +1,68 @@
+"""Incremental rollups: late summaries (manual collection, backfill) still reach the buckets"""
+
+from datetime import datetime
+from option_chain_rollups import OptionChainRollups
+
+
+def _summary(ts: datetime, underlying: float, expiry: str = "30-Oct-2026") -> dict:
+    return {
+        "symbol": "NIFTY", "expiry": expiry, "ts": ts, "trade_date": ts.date().isoformat(),
+        "underlyingValue": underlying, "totalCEOI": 100.0, "totalPEOI": 80.0, "pcrOI": 0.8
+    }
+
+
+def _bucket(rollups, resolution: str, ts: datetime) -> dict:
+    return rollups.collection.find_one({"symbol": "NIFTY", "resolution": resolution, "bucket": ts})
+
+
+def test_incremental_updates_fold_new_snapshots(db):
+    rollups = OptionChainRollups(db)
+    summaries = rollups.summary_store.collection
+    summaries.insert_many([_summary(datetime(2026, 10, 17, 10, 0), 100.0), _summary(datetime(2026, 10, 17, 10, 3), 104.0)])
+    assert rollups.update_symbol("NIFTY") == 2
+    assert rollups.update_symbol("NIFTY") == 0
+
+    summaries.insert_one(_summary(datetime(2026, 10, 17, 10, 6), 101.0))
+    assert rollups.update_symbol("NIFTY") == 1
+    bucket = _bucket(rollups, "15m", datetime(2026, 10, 17, 10, 0))
+    assert bucket["count"] == 3
+    assert bucket["underlying"] == {"open": 100.0, "high": 104.0, "low": 100.0, "close": 101.0}
+
+
+def test_late_summary_rebuilds_its_day(db):
+    rollups = OptionChainRollups(db)
+    summaries = rollups.summary_store.collection
+    summaries.insert_many([_summary(datetime(2026, 10, 17, 10, 3), 104.0), _summary(datetime(2026, 10, 17, 10, 6), 101.0)])
+    rollups.update_symbol("NIFTY")
+
+    # Written after the rollup, with an older snapshot time
+    summaries.insert_one(_summary(datetime(2026, 10, 17, 10, 0), 99.0))
+    # An additional expiry at an already rolled-up time is not the nearest one and changes nothing
+    summaries.insert_one(_summary(datetime(2026, 10, 17, 10, 3), 500.0, expiry="27-Nov-2026"))
+    rollups.update_symbol("NIFTY")
+
+    bucket = _bucket(rollups, "15m", datetime(2026, 10, 17, 10, 0))
+    assert bucket["count"] == 3
+    assert bucket["firstTs"] == datetime(2026, 10, 17, 10, 0)
+    assert bucket["underlying"] == {"open": 99.0, "high": 104.0, "low": 99.0, "close": 101.0}
+    assert _bucket(rollups, "1d", datetime(2026, 10, 17))["count"] == 3
+    assert rollups.collection.count_documents({"resolution": "5m"}) == 2
+
+
+def test_repeated_pass_does_not_double_count(db):
+    rollups = OptionChainRollups(db)
+    summaries = rollups.summary_store.collection
+    summaries.insert_many([_summary(datetime(2026, 10, 17, 10, 0), 100.0), _summary(datetime(2026, 10, 17, 10, 3), 104.0)])
+    rollups.update_symbol("NIFTY")
+    before = _bucket(rollups, "1d", datetime(2026, 10, 17))
+
+    # A crash before the watermark was stored, or a concurrent pass that read the same watermark
+    rollups.state_collection.delete_many({})
+    assert rollups.update_symbol("NIFTY") == 2
+    OptionChainRollups(db).update_symbol("NIFTY")
+
+    after = _bucket(rollups, "1d", datetime(2026, 10, 17))
+    assert after["_id"] == before["_id"]
+    assert after["count"] == 2
+    assert after["pcrOI"] == {"open": 0.8, "high": 0.8, "low": 0.8, "close": 0.8, "sum": 1.6, "count": 2}
+    assert _bucket(rollups, "5m", datetime(2026, 10, 17, 10, 0))["count"] == 2
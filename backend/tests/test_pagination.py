@@ -0,0 +1,63 @@
+"""Keyset pagination over a non-unique sort field (news pub_date)"""
+
+from datetime import datetime
+import pytest
+from pagination import InvalidCursorError, paginate
+
+
+@pytest.fixture
+def news(db):
+    """News with pub_date ties and records without a pub_date, inserted out of order"""
+    collection = db["news_articles"]
+    pub_dates = [
+        datetime(2026, 10, 17, 9, 0), None, datetime(2026, 10, 17, 10, 0), datetime(2026, 10, 17, 9, 0),
+        datetime(2026, 10, 17, 10, 0), None, datetime(2026, 10, 17, 9, 0), datetime(2026, 10, 16, 18, 0)
+    ]
+    collection.insert_many([
+        {"title": f"Article {index}", "keyword": "nifty" if index % 2 else "bank", "pub_date": pub_date}
+        for index, pub_date in enumerate(pub_dates)
+    ])
+    collection.insert_one({"title": "Article without the field", "keyword": "nifty"})
+    return collection
+
+
+def _walk(collection, query_filter, limit):
+    """Follow next_cursor from the first page to the last"""
+    records, page_info = paginate(collection, query_filter, "pub_date", 1, limit, cursor="", unique_sort=False)
+    pages = [records]
+    while page_info["has_next"]:
+        assert len(records) == limit
+        records, page_info = paginate(collection, query_filter, "pub_date", 1, limit,
+                                      cursor=page_info["next_cursor"], unique_sort=False)
+        assert page_info["has_prev"]
+        pages.append(records)
+    assert page_info["next_cursor"] is None
+    return [record["_id"] for page in pages for record in page]
+
+
+def _expected(collection, query_filter):
+    """Newest first, _id breaking ties, records without a pub_date last"""
+    dated = sorted(collection.find({**query_filter, "pub_date": {"$ne": None}}), key=lambda doc: (doc["pub_date"], doc["_id"]), reverse=True)
+    undated = sorted(collection.find({**query_filter, "pub_date": None}), key=lambda doc: doc["_id"], reverse=True)
+    return [doc["_id"] for doc in dated + undated]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 20])
+def test_cursor_walk_visits_every_record_once_across_ties(news, limit):
+    assert _walk(news, {}, limit) == _expected(news, {})
+
+
+def test_cursor_walk_with_filter(news):
+    assert _walk(news, {"keyword": "nifty"}, 2) == _expected(news, {"keyword": "nifty"})
+
+
+def test_page_mode_matches_cursor_order(news):
+    records, page_info = paginate(news, {}, "pub_date", 2, 3, unique_sort=False)
+    assert [record["_id"] for record in records] == _expected(news, {})[3:6]
+    assert page_info["total"] == 9 and page_info["total_pages"] == 3 and page_info["has_prev"]
+    assert page_info["next_cursor"] is not None
+
+
+def test_malformed_cursor_is_rejected(news):
+    with pytest.raises(InvalidCursorError):
+        paginate(news, {}, "pub_date", 1, 2, cursor="not-a-cursor", unique_sort=False)
@@ -0,0 +1,62 @@
+"""Expiry cache: one Redis round-trip per cycle, even on a cold cache"""
+
+import pytest
+from redis_expiry_cache import RedisExpiryCache
+
+
+class FakeRedis:
+    """Records MGET calls; every key is missing until written through a pipeline"""
+
+    def __init__(self):
+        self.values = {}
+        self.mget_calls = 0
+
+    def mget(self, keys):
+        self.mget_calls += 1
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+
+    def setex(self, key, ttl, value):
+        self.redis.values[key] = value
+
+    def execute(self):
+        pass
+
+
+@pytest.fixture
+def cache():
+    expiry_cache = RedisExpiryCache()
+    expiry_cache.client = FakeRedis()
+    return expiry_cache
+
+
+def test_cold_cache_misses_are_not_repeated_by_workers(cache):
+    symbols = ["NIFTY", "BANKNIFTY", "FINNIFTY"]
+    assert cache.get_expiry_lists(symbols) == {symbol: None for symbol in symbols}
+    assert cache.get_expiries(symbols) == {symbol: None for symbol in symbols}
+    assert cache.client.mget_calls == 2
+
+    # Fan-out workers look their symbol up again before calling the API
+    for symbol in symbols:
+        assert cache.get_expiry_list(symbol) is None
+        assert cache.get_expiry(symbol) is None
+    assert cache.client.mget_calls == 2
+
+
+def test_stored_values_replace_remembered_misses(cache):
+    cache.get_expiry_lists(["NIFTY"])
+    cache.set_expiry_list("NIFTY", ["30-Oct-2026", "27-Nov-2026"])
+    assert cache.get_expiry_list("NIFTY") == ["30-Oct-2026", "27-Nov-2026"]
+    assert cache.get_expiry("NIFTY") == "30-Oct-2026"
+
+    # A new process (empty L1) reads what was stored in one round-trip
+    fresh = RedisExpiryCache()
+    fresh.client = cache.client
+    assert fresh.get_expiry_lists(["NIFTY"])["NIFTY"] == ["30-Oct-2026", "27-Nov-2026"]
@@ -0,0 +1,60 @@
+"""Content-hash dedup: only committed writes suppress later identical snapshots"""
+
+import pytest
+from snapshot_dedup import SnapshotDeduplicator
+
+
+@pytest.fixture
+def dedup():
+    """Memory-only deduplicator"""
+    deduplicator = SnapshotDeduplicator()
+    deduplicator.client = None
+    deduplicator._last.clear()
+    return deduplicator
+
+
+def _fetch(dedup, content: bytes, timestamp: str, etag: str = None) -> bool:
+    """Run a collector's checks for one response; True if it would be skipped"""
+    return dedup.check_payload("NIFTY", content, etag) or dedup.check_timestamp("NIFTY", timestamp)
+
+
+def test_committed_payload_is_skipped(dedup):
+    assert not _fetch(dedup, b'{"a": 1}', "17-Oct-2026 10:00:00", etag='"v1"')
+    dedup.commit("NIFTY")
+
+    assert _fetch(dedup, b'{"a": 1}', "17-Oct-2026 10:00:00")
+    assert dedup.conditional_headers("NIFTY") == {"If-None-Match": '"v1"'}
+    stats = dedup.get_stats()
+    assert stats["skipped_same_digest"] == 1 and stats["changed"] == 1
+
+
+def test_discarded_write_is_retried(dedup):
+    assert not _fetch(dedup, b'{"a": 1}', "17-Oct-2026 10:00:00")
+    dedup.discard("NIFTY")
+
+    # The write failed, so the same snapshot must not be skipped next cycle
+    assert not _fetch(dedup, b'{"a": 1}', "17-Oct-2026 10:00:00")
+    assert dedup.get_stats()["skipped"] == 0
+
+
+def test_same_timestamp_with_new_payload_is_skipped_and_remembered(dedup):
+    assert not _fetch(dedup, b'{"a": 1}', "17-Oct-2026 10:00:00")
+    dedup.commit("NIFTY")
+
+    # NSE re-serialized the same snapshot: skipped on the timestamp, and the new digest is kept
+    assert _fetch(dedup, b'{"a": 1, "b": 2}', "17-Oct-2026 10:00:00")
+    assert _fetch(dedup, b'{"a": 1, "b": 2}', "17-Oct-2026 10:00:00")
+    stats = dedup.get_stats()
+    assert stats["skipped_same_timestamp"] == 1 and stats["skipped_same_digest"] == 1
+
+
+def test_commit_without_timestamp_is_ignored(dedup):
+    dedup.check_payload("NIFTY", b'{"a": 1}')
+    dedup.commit("NIFTY")
+    assert dedup.get_stats()["symbols_tracked"] == 0
+
+
+def test_not_modified(dedup):
+    assert dedup.is_not_modified("NIFTY", 304)
+    assert not dedup.is_not_modified("NIFTY", 200)
+    assert dedup.get_stats()["skipped_not_modified"] == 1
@@ -0,0 +1,362 @@
+"""
+MongoDB time-series storage backend for snapshot data
+With SNAPSHOT_STORAGE_BACKEND=timeseries, option chain and gainers/losers snapshots are
+inserted into native time-series collections (metaField "symbol", timeField "ts") instead
+of one ordinary collection per symbol keyed by a unique string timestamp.
+Time-series collections store each symbol's snapshots in compressed, time-ordered buckets,
+so range scans read a handful of buckets and no large unique index has to be maintained.
+
+Read views named "<legacy collection>_ts_view" expose each symbol with the legacy document
+shape, so the admin panel's existing queries keep working. Time-series snapshots are
+insert-only: the snapshot delete endpoints answer 409 Conflict in this mode.
+
+Usage:
+    python timeseries_store.py migrate [--symbols NIFTY,gainers] [--batch-size 500]
+    python timeseries_store.py benchmark [--symbol NIFTY] [--days 5] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from bulk_writer import OUTCOME_INSERTED
+from response_cache import bump_versions
+from timezone_utils import now_for_mongo, parse_nse_timestamp
+from logger_config import get_logger
+
+# Load environment variables
+load_dotenv()
+
+# Get logger
+logger = get_logger(__name__)
+
+# Backend configuration
+SNAPSHOT_STORAGE_BACKEND = os.getenv('SNAPSHOT_STORAGE_BACKEND', 'collection').lower()  # 'collection' or 'timeseries'
+OPTION_CHAIN_TS_COLLECTION_NAME = os.getenv('MONGO_OPTION_CHAIN_TS_COLLECTION_NAME', 'option_chain_snapshots_ts')
+MARKET_MOVERS_TS_COLLECTION_NAME = os.getenv('MONGO_MARKET_MOVERS_TS_COLLECTION_NAME', 'market_movers_ts')
+TIMESERIES_GRANULARITY = os.getenv('TIMESERIES_GRANULARITY', 'minutes')  # 'seconds', 'minutes' or 'hours'
+TIMESERIES_EXPIRE_AFTER_SECONDS = int(os.getenv('TIMESERIES_EXPIRE_AFTER_SECONDS', 0))  # 0 keeps data forever
+
+TIME_FIELD = "ts"
+META_FIELD = "symbol"
+VIEW_SUFFIX = "_ts_view"
+
+
+def is_timeseries_backend() -> bool:
+    """Check if snapshots should be written to time-series collections"""
+    return SNAPSHOT_STORAGE_BACKEND == 'timeseries'
+
+
+def read_view_name(legacy_collection_name: str) -> str:
+    """Name of the read view standing in for a legacy per-symbol collection"""
+    return f"{legacy_collection_name}{VIEW_SUFFIX}"
+
+
+def get_snapshot_sources() -> Dict[str, Tuple[str, str]]:
+    """
+    Get every legacy snapshot collection and where its data lives in time-series mode
+    Returns: Dictionary of symbol -> (legacy collection name, time-series collection name)
+    Gainers and losers use the symbols "gainers" and "losers"
+    """
+    # Imported here: the collectors import this module for their write path
+    from schema_manager import get_option_chain_collection_names
+    from nse_gainers_losers_collector import MONGO_GAINERS_COLLECTION_NAME, MONGO_LOSERS_COLLECTION_NAME
+
+    sources = {
+        symbol: (collection_name, OPTION_CHAIN_TS_COLLECTION_NAME)
+        for symbol, collection_name in get_option_chain_collection_names().items()
+    }
+    sources["gainers"] = (MONGO_GAINERS_COLLECTION_NAME, MARKET_MOVERS_TS_COLLECTION_NAME)
+    sources["losers"] = (MONGO_LOSERS_COLLECTION_NAME, MARKET_MOVERS_TS_COLLECTION_NAME)
+    return sources
+
+
+def create_timeseries_collections(db) -> List[str]:
+    """
+    Create the time-series collections and per-symbol read views if they do not exist (DDL, startup only)
+    Returns: Names of the collections and views created
+    """
+    existing = set(db.list_collection_names())
+    created = []
+
+    options = {"timeField": TIME_FIELD, "metaField": META_FIELD, "granularity": TIMESERIES_GRANULARITY}
+    for name in (OPTION_CHAIN_TS_COLLECTION_NAME, MARKET_MOVERS_TS_COLLECTION_NAME):
+        if name in existing:
+            continue
+        kwargs = {"timeseries": options}
+        if TIMESERIES_EXPIRE_AFTER_SECONDS:
+            kwargs["expireAfterSeconds"] = TIMESERIES_EXPIRE_AFTER_SECONDS
+        db.create_collection(name, **kwargs)
+        created.append(name)
+        logger.info(f"Created time-series collection {name}")
+
+    for symbol, (legacy_name, ts_name) in get_snapshot_sources().items():
+        view_name = read_view_name(legacy_name)
+        if view_name in existing:
+            continue
+        db.create_collection(view_name, viewOn=ts_name, pipeline=[{"$match": {META_FIELD: symbol}}])
+        created.append(view_name)
+
+    return created
+
+
+def timeseries_document(symbol: str, data: Dict, ts: datetime) -> Dict:
+    """Wrap a snapshot for insertion into a time-series collection"""
+    now = now_for_mongo()
+    data_count = len(data.get("records", {}).get("data") or [])
+    return {**data, META_FIELD: symbol, TIME_FIELD: ts, "dataCount": data_count, "insertedAt": now, "updatedAt": now}
+
+
+class TimeSeriesSnapshotStore:
+    """Insert-only writer for time-series snapshot collections"""
+
+    def __init__(self, db):
+        """
+        Args:
+            db: pymongo Database the snapshot collections live in
+        """
+        self.db = db
+        self._last_ts = {}  # (collection name, symbol) -> last inserted snapshot time
+        self._lock = threading.Lock()
+
+    def _get_last_ts(self, collection, symbol: str) -> Optional[datetime]:
+        """Last stored snapshot time of a symbol (read from the collection once per process)"""
+        key = (collection.name, symbol)
+        with self._lock:
+            if key in self._last_ts:
+                return self._last_ts[key]
+        latest = collection.find_one({META_FIELD: symbol}, {TIME_FIELD: 1}, sort=[(TIME_FIELD, -1)])
+        last_ts = latest.get(TIME_FIELD) if latest else None
+        with self._lock:
+            self._last_ts.setdefault(key, last_ts)
+        return last_ts
+
+    def _mark_inserted(self, collection_name: str, symbol: str, ts: datetime):
+        """Advance a symbol's last stored snapshot time"""
+        with self._lock:
+            current = self._last_ts.get((collection_name, symbol))
+            if current is None or ts > current:
+                self._last_ts[(collection_name, symbol)] = ts
+
+    def prepare_insert(self, collection_name: str, symbol: str, data: Dict, timestamp: str) -> Optional[Tuple[Dict, Callable[[str], None]]]:
+        """
+        Build the insert for a snapshot without writing it (for batched bulk writes)
+        Time-series collections cannot have unique indexes, so snapshots at or before the
+        symbol's last stored time are skipped here instead
+        Args:
+            collection_name: Time-series collection name
+            symbol: Snapshot symbol (meta field)
+            data: Snapshot document
+            timestamp: NSE timestamp string of the snapshot
+        Returns: (document to insert, outcome callback), or None if the snapshot is already stored or has no valid time
+        """
+        ts = parse_nse_timestamp(timestamp)
+        if ts is None:
+            logger.error(f"Cannot store {symbol} in {collection_name}: unparseable timestamp {timestamp}")
+            return None
+        collection = self.db[collection_name]
+        last_ts = self._get_last_ts(collection, symbol)
+        if last_ts is not None and ts <= last_ts:
+            logger.debug(f"{symbol} snapshot {timestamp} already stored in {collection_name}")
+            return None
+
+        def on_result(outcome: str):
+            if outcome == OUTCOME_INSERTED:
+                self._mark_inserted(collection_name, symbol, ts)
+
+        return timeseries_document(symbol, data, ts), on_result
+
+    def save_snapshot(self, collection_name: str, symbol: str, data: Dict, timestamp: str) -> bool:
+        """
+        Insert one snapshot immediately
+        Returns: True if inserted or already stored, False on an invalid timestamp
+        """
+        prepared = self.prepare_insert(collection_name, symbol, data, timestamp)
+        if prepared is None:
+            return parse_nse_timestamp(timestamp) is not None
+        document, on_result = prepared
+        self.db[collection_name].insert_one(document)
+        bump_versions(self.db, [collection_name])
+        on_result(OUTCOME_INSERTED)
+        return True
+
+
+# Global instances (one per database)
+_timeseries_stores = {}
+
+def get_timeseries_store(db) -> TimeSeriesSnapshotStore:
+    """Get the time-series snapshot store for a database"""
+    key = db.name
+    store = _timeseries_stores.get(key)
+    # Rebuild if the shared MongoDB client was replaced after a failed health check
+    if store is None or store.db.client is not db.client:
+        store = TimeSeriesSnapshotStore(db)
+        _timeseries_stores[key] = store
+    return store
+
+
+def _snapshot_timestamp(document: Dict) -> Optional[str]:
+    """NSE timestamp of a stored snapshot (option chain records.timestamp or gainers/losers timestamp)"""
+    records = document.get("records")
+    if isinstance(records, dict) and records.get("timestamp"):
+        return records["timestamp"]
+    return document.get("timestamp")
+
+
+def migrate(symbols: Optional[List[str]] = None, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Copy existing snapshots into the time-series collections
+    Resumable: only snapshots newer than the symbol's latest time-series entry are copied
+    Delta-encoded option chain documents are rebuilt to full snapshots on the way
+    Args:
+        symbols: Symbols to migrate (None for all option chain symbols plus gainers and losers)
+        batch_size: Documents per insert_many
+    Returns: Dictionary of symbol -> documents copied
+    """
+    from mongo_pool import get_mongo_db
+    from option_chain_delta_store import get_delta_store
+
+    _, db = get_mongo_db()
+    create_timeseries_collections(db)
+    delta_store = get_delta_store()
+
+    copied = {}
+    for symbol, (legacy_name, ts_name) in get_snapshot_sources().items():
+        if symbols and symbol not in symbols:
+            continue
+        ts_collection = db[ts_name]
+        latest = ts_collection.find_one({META_FIELD: symbol}, {TIME_FIELD: 1}, sort=[(TIME_FIELD, -1)])
+        resume_after = latest.get(TIME_FIELD) if latest else None
+
+        started = time.perf_counter()
+        copied[symbol] = 0
+        batch = []
+        skipped = 0
+        for document in delta_store.iter_snapshots(db[legacy_name], {}, batch_size=batch_size):
+            ts = parse_nse_timestamp(_snapshot_timestamp(document))
+            if ts is None or (resume_after is not None and ts <= resume_after):
+                skipped += 1
+                continue
+            for field in ("_id", "storage", "delta"):
+                document.pop(field, None)
+            document[META_FIELD] = symbol
+            document[TIME_FIELD] = ts
+            batch.append(document)
+            if len(batch) >= batch_size:
+                ts_collection.insert_many(batch, ordered=False)
+                copied[symbol] += len(batch)
+                batch = []
+        if batch:
+            ts_collection.insert_many(batch, ordered=False)
+            copied[symbol] += len(batch)
+        logger.info(
+            f"Migrated {symbol}: {copied[symbol]} snapshots copied, {skipped} skipped "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+    return copied
+
+
+def _collection_stats(db, name: str) -> Dict:
+    """Storage statistics of a collection (sizes in bytes)"""
+    stats = db.command("collStats", name)
+    return {
+        "count": stats.get("count", 0),
+        "size": stats.get("size", 0),
+        "storageSize": stats.get("storageSize", 0),
+        "totalIndexSize": stats.get("totalIndexSize", 0)
+    }
+
+
+def _time_query(collection, query: Dict, projection: Dict, runs: int) -> Tuple[float, int]:
+    """Median latency (ms) and result count of a range query"""
+    latencies = []
+    count = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        count = sum(1 for _ in collection.find(query, projection))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return statistics.median(latencies), count
+
+
+def benchmark(symbol: str = "NIFTY", days: int = 5, runs: int = 5) -> Dict:
+    """
+    Compare storage size and range-query latency of a legacy collection and the time-series collection
+    The range query reads the underlying value of every snapshot in the last `days` days (indexed on both sides)
+    Args:
+        symbol: Symbol to benchmark
+        days: Length of the queried range, ending at the symbol's latest time-series snapshot
+        runs: Query repetitions (median reported)
+    Returns: Dictionary with "legacy" and "timeseries" results
+    """
+    from mongo_pool import get_mongo_db
+
+    _, db = get_mongo_db()
+    legacy_name, ts_name = get_snapshot_sources()[symbol]
+    ts_collection = db[ts_name]
+
+    latest = ts_collection.find_one({META_FIELD: symbol}, {TIME_FIELD: 1}, sort=[(TIME_FIELD, -1)])
+    end = latest[TIME_FIELD] if latest else now_for_mongo()
+    start = end - timedelta(days=days)
+    projection = {"_id": 0, "records.underlyingValue": 1}
+
+    # records.timestamp is a day-first string that cannot be range-queried, so the legacy side filters on
+    # insertedAt; make sure it is indexed (same spec as schema_manager) so both sides use an index
+    legacy_collection = db[legacy_name]
+    legacy_collection.create_index([("insertedAt", 1)])
+    legacy_latency, legacy_count = _time_query(
+        legacy_collection, {"insertedAt": {"$gte": start, "$lte": end}}, projection, runs
+    )
+    ts_latency, ts_count = _time_query(
+        ts_collection, {META_FIELD: symbol, TIME_FIELD: {"$gte": start, "$lte": end}}, projection, runs
+    )
+    return {
+        "symbol": symbol,
+        "range": {"start": start.isoformat(), "end": end.isoformat()},
+        "legacy": {"collection": legacy_name, **_collection_stats(db, legacy_name),
+                   "query_ms": round(legacy_latency, 2), "query_count": legacy_count},
+        "timeseries": {"collection": ts_name, **_collection_stats(db, ts_name),
+                       "query_ms": round(ts_latency, 2), "query_count": ts_count}
+    }
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Time-series snapshot storage tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Copy existing snapshots into the time-series collections")
+    migrate_parser.add_argument("--symbols", help="Comma separated symbols (default: all, including gainers and losers)")
+    migrate_parser.add_argument("--batch-size", type=int, default=500, help="Documents per insert")
+
+    benchmark_parser = subparsers.add_parser("benchmark", help="Compare storage size and range-query latency")
+    benchmark_parser.add_argument("--symbol", default="NIFTY", help="Symbol to benchmark (default: NIFTY)")
+    benchmark_parser.add_argument("--days", type=int, default=5, help="Queried range in days")
+    benchmark_parser.add_argument("--runs", type=int, default=5, help="Query repetitions")
+
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        symbols = [symbol.strip() for symbol in args.symbols.split(",")] if args.symbols else None
+        copied = migrate(symbols, batch_size=max(1, args.batch_size))
+        print(f"Copied {sum(copied.values())} snapshots for {len(copied)} symbols")
+        return
+
+    result = benchmark(args.symbol, days=args.days, runs=max(1, args.runs))
+    print(f"Symbol {result['symbol']}, range {result['range']['start']} to {result['range']['end']}")
+    print(f"{'':12}{'documents':>12}{'data MB':>12}{'storage MB':>12}{'index MB':>12}{'query ms':>12}{'rows':>8}")
+    for label in ("legacy", "timeseries"):
+        row = result[label]
+        print(
+            f"{label:12}{row['count']:>12}{row['size'] / 1e6:>12.2f}{row['storageSize'] / 1e6:>12.2f}"
+            f"{row['totalIndexSize'] / 1e6:>12.2f}{row['query_ms']:>12.2f}{row['query_count']:>8}"
+        )
+    print("Note: time-series sizes cover every symbol stored in the collection")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
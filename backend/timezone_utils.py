@@ -5,6 +5,7 @@ All timestamps should use this module to ensure consistency
 """
 
 from datetime import datetime
+from typing import Optional
 import pytz
 
 # IST timezone
@@ -71,3 +72,26 @@ def now_for_mongo() -> datetime:
     """
     return get_ist_now_naive()
 
+
+# Timestamp formats used in NSE API responses (e.g. "17-Oct-2025 15:30:00")
+NSE_TIMESTAMP_FORMATS = (
+    "%d-%b-%Y %H:%M:%S",
+    "%d-%b-%Y %H:%M",
+    "%d-%b-%Y"
+)
+
+def parse_nse_timestamp(value) -> Optional[datetime]:
+    """
+    Parse an NSE response timestamp (already in IST)
+    Returns naive datetime in IST, or None if the value cannot be parsed
+    """
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None) if value.tzinfo is None else value.astimezone(IST).replace(tzinfo=None)
+    if not value or not isinstance(value, str):
+        return None
+    for fmt in NSE_TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            continue
+    return None
@@ -25,6 +25,22 @@ class PaginationSchema(Schema):
             'required': 'Limit is required'
         }
     )
+    cursor = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.Length(max=512),
+        error_messages={
+            'invalid': 'cursor must be the next_cursor of a previous response'
+        }
+    )
+    total = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.OneOf(['none', 'approx', 'exact']),
+        error_messages={
+            'invalid': 'total must be one of: none, approx, exact'
+        }
+    )
 
 
 class DateFilterSchema(Schema):
@@ -144,6 +160,20 @@ class ConfigUpdateSchema(Schema):
             'invalid': 'enabled must be a boolean'
         }
     )
+    max_workers = fields.Int(
+        required=False,
+        validate=validate.Range(min=1, max=32),
+        error_messages={
+            'invalid': 'max_workers must be between 1 and 32'
+        }
+    )
+    expiry_count = fields.Int(
+        required=False,
+        validate=validate.Range(min=1, max=12),
+        error_messages={
+            'invalid': 'expiry_count must be between 1 and 12'
+        }
+    )
     
     @validates('end_time')
     def validate_end_after_start(self, value):
@@ -201,3 +231,217 @@ class CombinedPaginationDateSchema(PaginationSchema, DateFilterSchema):
     """Combined schema for endpoints that use both pagination and date filtering"""
     pass
 
+
+
+class StrikeSeriesSchema(Schema):
+    """Schema for per-strike option chain time series queries"""
+    symbol = fields.Str(
+        required=True,
+        validate=validate.Regexp(r'^[A-Z0-9&\-]{1,20}$'),
+        error_messages={
+            'required': 'symbol is required',
+            'invalid': 'symbol must be an NSE symbol (e.g., NIFTY)'
+        }
+    )
+    strike = fields.Float(
+        required=True,
+        validate=validate.Range(min=0, min_inclusive=False),
+        error_messages={
+            'required': 'strike is required',
+            'invalid': 'strike must be a number'
+        }
+    )
+    option_type = fields.Str(
+        required=True,
+        validate=validate.OneOf(['CE', 'PE']),
+        error_messages={
+            'required': 'option_type is required',
+            'invalid': 'option_type must be CE or PE'
+        }
+    )
+    expiry = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.Regexp(r'^\d{2}-[A-Za-z]{3}-\d{4}$'),
+        error_messages={
+            'invalid': 'expiry must be in DD-Mon-YYYY format (e.g., 28-Oct-2025)'
+        }
+    )
+    start = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.Regexp(r'^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?$'),
+        error_messages={
+            'invalid': 'start must be in YYYY-MM-DD or YYYY-MM-DD HH:MM format'
+        }
+    )
+    end = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.Regexp(r'^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?$'),
+        error_messages={
+            'invalid': 'end must be in YYYY-MM-DD or YYYY-MM-DD HH:MM format'
+        }
+    )
+    field_names = fields.Str(
+        data_key='fields',
+        required=False,
+        allow_none=True,
+        validate=validate.Regexp(r'^[A-Za-z,]+$'),
+        error_messages={
+            'invalid': 'fields must be a comma-separated list of field names'
+        }
+    )
+    limit = fields.Int(
+        missing=0,
+        validate=validate.Range(min=0, max=10000),
+        error_messages={
+            'invalid': 'limit must be between 0 and 10000'
+        }
+    )
+
+
+class SummarySeriesSchema(Schema):
+    """Schema for option chain summary series queries (PCR, max pain, OI totals)"""
+    symbol = fields.Str(
+        required=True,
+        validate=validate.Regexp(r'^[A-Z0-9&\-]{1,20}$'),
+        error_messages={
+            'required': 'symbol is required',
+            'invalid': 'symbol must be an NSE symbol (e.g., NIFTY)'
+        }
+    )
+    expiry = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.Regexp(r'^\d{2}-[A-Za-z]{3}-\d{4}$'),
+        error_messages={
+            'invalid': 'expiry must be in DD-Mon-YYYY format (e.g., 28-Oct-2025)'
+        }
+    )
+    start = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.Regexp(r'^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?$'),
+        error_messages={
+            'invalid': 'start must be in YYYY-MM-DD or YYYY-MM-DD HH:MM format'
+        }
+    )
+    end = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.Regexp(r'^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?$'),
+        error_messages={
+            'invalid': 'end must be in YYYY-MM-DD or YYYY-MM-DD HH:MM format'
+        }
+    )
+    field_names = fields.Str(
+        data_key='fields',
+        required=False,
+        allow_none=True,
+        validate=validate.Regexp(r'^[A-Za-z,]+$'),
+        error_messages={
+            'invalid': 'fields must be a comma-separated list of field names'
+        }
+    )
+    limit = fields.Int(
+        missing=0,
+        validate=validate.Range(min=0, max=10000),
+        error_messages={
+            'invalid': 'limit must be between 0 and 10000'
+        }
+    )
+
+
+class RollupSeriesSchema(Schema):
+    """Schema for option chain rollup series queries (underlying OHLC, total OI, PCR)"""
+    symbol = fields.Str(
+        required=True,
+        validate=validate.Regexp(r'^[A-Z0-9&\-]{1,20}$'),
+        error_messages={
+            'required': 'symbol is required',
+            'invalid': 'symbol must be an NSE symbol (e.g., NIFTY)'
+        }
+    )
+    start = fields.Str(
+        required=True,
+        validate=validate.Regexp(r'^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?$'),
+        error_messages={
+            'required': 'start is required',
+            'invalid': 'start must be in YYYY-MM-DD or YYYY-MM-DD HH:MM format'
+        }
+    )
+    end = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.Regexp(r'^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?$'),
+        error_messages={
+            'invalid': 'end must be in YYYY-MM-DD or YYYY-MM-DD HH:MM format'
+        }
+    )
+    resolution = fields.Str(
+        missing='auto',
+        validate=validate.OneOf(['auto', 'raw', '5m', '15m', '1d']),
+        error_messages={
+            'invalid': 'resolution must be one of: auto, raw, 5m, 15m, 1d'
+        }
+    )
+    max_points = fields.Int(
+        missing=500,
+        validate=validate.Range(min=1, max=10000),
+        error_messages={
+            'invalid': 'max_points must be between 1 and 10000'
+        }
+    )
+
+
+class BackupSchema(Schema):
+    """Schema for backup download parameters"""
+    format = fields.Str(
+        missing='ndjson',
+        validate=validate.OneOf(['ndjson', 'bson']),
+        error_messages={
+            'invalid': 'format must be one of: ndjson, bson'
+        }
+    )
+    mode = fields.Str(
+        missing='full',
+        validate=validate.OneOf(['full', 'incremental']),
+        error_messages={
+            'invalid': 'mode must be one of: full, incremental'
+        }
+    )
+
+
+class RestoreSchema(Schema):
+    """Schema for restoring backup archives stored in BACKUP_DIR"""
+    archives = fields.List(
+        fields.Str(validate=validate.Regexp(r'^[\w.\-]+\.zip$')),
+        required=True,
+        validate=validate.Length(min=1, max=100),
+        error_messages={
+            'required': 'archives is required',
+            'invalid': 'archives must be a list of backup file names (base first, then increments)'
+        }
+    )
+    drop = fields.Bool(
+        missing=False,
+        error_messages={
+            'invalid': 'drop must be a boolean'
+        }
+    )
+    workers = fields.Int(
+        missing=4,
+        validate=validate.Range(min=1, max=16),
+        error_messages={
+            'invalid': 'workers must be between 1 and 16'
+        }
+    )
+    collections = fields.List(
+        fields.Str(validate=validate.Regexp(r'^[\w.\-]{1,120}$')),
+        required=False,
+        allow_none=True,
+        error_messages={
+            'invalid': 'collections must be a list of collection names'
+        }
+    )